@@ -4,18 +4,26 @@
 let allChecks = [];
 let filteredChecks = [];
 let currentView = 'cards'; // 'cards' or 'table'
+const checkDetails = new Map(); // check_id -> full detail (loaded on demand)
+let searchIndex = null; // Prebuilt inverted index (tools/search_index.py)
+let fallbackDescriptions = null; // check_id -> description, fetched only without the search index
 
-// Load checks from YAML files or catalog
+// Load the compact card index built by tools/aggregate_checks.py
 async function loadChecks() {
     try {
-        // For now, load from the catalog JSON
-        // In production, this would aggregate all YAML files
-        const response = await fetch('catalog/drive_risk_catalog.json');
-        const checks = await response.json();
+        // Index rows are arrays in the order given by index.fields
+        const response = await fetch('catalog/index.json');
+        const index = await response.json();
+        const checks = index.checks.map(row => {
+            const check = {};
+            index.fields.forEach((field, i) => { check[field] = row[i]; });
+            return check;
+        });
 
         allChecks = checks;
         filteredChecks = checks;
         renderChecks();
+        loadSearchIndex();
     } catch (error) {
         console.error('Error loading checks:', error);
         document.getElementById('checks-list').innerHTML = `
@@ -108,14 +116,39 @@ function getSeverityClass(severity) {
     return severityLower;
 }
 
+// Fetch a check's detail shard (cached after the first request)
+async function loadCheckDetail(checkId) {
+    if (!checkDetails.has(checkId)) {
+        const request = fetch(`catalog/checks/${encodeURIComponent(checkId)}.json`)
+            .then(response => {
+                if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                return response.json();
+            })
+            .catch(error => {
+                checkDetails.delete(checkId);
+                throw error;
+            });
+        checkDetails.set(checkId, request);
+    }
+    return checkDetails.get(checkId);
+}
+
 // Show check detail modal
-function showCheckDetail(checkId) {
-    const check = allChecks.find(c => c.check_id === checkId);
-    if (!check) return;
+async function showCheckDetail(checkId) {
+    const summary = allChecks.find(c => c.check_id === checkId);
+    if (!summary) return;
 
     const modal = document.getElementById('check-modal');
     const modalBody = document.getElementById('modal-body');
 
+    let check;
+    try {
+        check = { ...summary, ...(await loadCheckDetail(checkId)) };
+    } catch (error) {
+        console.error(`Error loading check ${checkId}:`, error);
+        check = summary;
+    }
+
     // Build modal content
     modalBody.innerHTML = `
         <div class="check-detail">
@@ -196,6 +229,102 @@ function getDrivePillarName(pillar) {
     return pillarNames[pillar] || pillar;
 }
 
+// Load the search index; until it arrives (or if it fails) filtering scans the card index
+async function loadSearchIndex() {
+    try {
+        const response = await fetch('catalog/search_index.json');
+        if (response.ok) {
+            const index = await response.json();
+            // Document numbers are rows of the card index, so both must describe the same build
+            if (index.count === allChecks.length) {
+                searchIndex = index;
+                filterChecks();
+                return;
+            }
+        }
+    } catch (error) {
+        console.warn('Search index unavailable, falling back to scanning:', error);
+    }
+    loadFallbackDescriptions();
+}
+
+// Without the search index, scanning needs descriptions the card index leaves out
+async function loadFallbackDescriptions() {
+    try {
+        const response = await fetch('catalog/drive_risk_catalog.json');
+        if (!response.ok) return;
+        const catalog = await response.json();
+        fallbackDescriptions = new Map(catalog.map(check => [check.check_id, check.description || '']));
+        filterChecks();
+    } catch (error) {
+        console.warn('Catalog descriptions unavailable, searching IDs and titles only:', error);
+    }
+}
+
+// Tokenize a query the same way tools/search_index.py tokenizes documents
+function tokenizeQuery(text) {
+    return text.toLowerCase().match(/[a-z0-9]+(?:[.\-][a-z0-9]+)*/g) || [];
+}
+
+// Bitmap of documents containing any token that starts with prefix
+function prefixBits(prefix) {
+    const bits = new Uint32Array((searchIndex.count + 31) >>> 5);
+    const tokens = searchIndex.tokens;
+
+    // Binary search for the first token >= prefix; matches are contiguous from there
+    let lo = 0;
+    let hi = tokens.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >>> 1;
+        if (tokens[mid] < prefix) lo = mid + 1; else hi = mid;
+    }
+
+    for (let t = lo; t < tokens.length && tokens[t].startsWith(prefix); t++) {
+        let doc = 0;
+        for (const delta of searchIndex.postings[t]) {
+            doc += delta;
+            bits[doc >>> 5] |= 1 << (doc & 31);
+        }
+    }
+    return bits;
+}
+
+// Intersect bitmap b into a (a may be null, meaning "everything")
+function intersectBits(a, b) {
+    if (a === null) return Uint32Array.from(b);
+    for (let i = 0; i < a.length; i++) {
+        a[i] &= b[i] || 0;
+    }
+    return a;
+}
+
+// Filter using the inverted index: facet bitmaps AND token postings
+function filterWithIndex(platformFilter, levelFilter, pillarFilter, searchTerm) {
+    const empty = new Uint32Array((searchIndex.count + 31) >>> 5);
+    const facet = (name, value) => searchIndex.facets[name][value] || empty;
+
+    let bits = null;
+    if (platformFilter) bits = intersectBits(bits, facet('platform', platformFilter));
+    if (levelFilter) bits = intersectBits(bits, facet('level', levelFilter));
+    if (pillarFilter) bits = intersectBits(bits, facet('pillar', pillarFilter));
+    for (const token of tokenizeQuery(searchTerm)) {
+        bits = intersectBits(bits, prefixBits(token));
+    }
+
+    if (bits === null) return allChecks;
+
+    const matches = [];
+    for (let word = 0; word < bits.length; word++) {
+        let value = bits[word];
+        while (value !== 0) {
+            const bit = 31 - Math.clz32(value & -value);
+            matches.push(allChecks[(word << 5) + bit]);
+            value &= value - 1;
+        }
+    }
+    return matches;
+}
+
 // Filter checks
 function filterChecks() {
     const platformFilter = document.getElementById('platform-filter').value;
@@ -203,6 +332,12 @@ function filterChecks() {
     const pillarFilter = document.getElementById('pillar-filter').value;
     const searchTerm = document.getElementById('search-input').value.toLowerCase();
 
+    if (searchIndex) {
+        filteredChecks = filterWithIndex(platformFilter, levelFilter, pillarFilter, searchTerm);
+        renderChecks();
+        return;
+    }
+
     filteredChecks = allChecks.filter(check => {
         // Platform filter
         if (platformFilter && check.platform !== platformFilter) {
@@ -219,9 +354,10 @@ function filterChecks() {
             return false;
         }
 
-        // Search filter
+        // Search filter (descriptions come from the full catalog once it has loaded)
         if (searchTerm) {
-            const searchableText = `${check.check_id} ${check.title} ${check.description || ''}`.toLowerCase();
+            const description = fallbackDescriptions ? fallbackDescriptions.get(check.check_id) || '' : '';
+            const searchableText = `${check.check_id} ${check.title} ${description}`.toLowerCase();
             if (!searchableText.includes(searchTerm)) {
                 return false;
             }
@@ -20,6 +20,8 @@ from pathlib import Path
 from typing import Dict, List, Any
 from datetime import datetime
 
+from catalog_cache import load_snapshot
+
 # Default priority assignment logic
 PRIORITY_RULES = {
     # (min_level, max_level, severity) -> priority
@@ -204,13 +206,14 @@ def add_powerpoint_export(check: Dict) -> Dict:
 
     return check
 
-def process_check_file(file_path: str, dry_run: bool = False) -> bool:
-    """Process a single check file"""
+def process_check_file(file_path: str, dry_run: bool = False, check: Dict = None) -> bool:
+    """Process a single check file (check may be pre-loaded from the catalog snapshot)"""
 
     try:
         # Read existing check
-        with open(file_path, 'r') as f:
-            check = yaml.safe_load(f)
+        if check is None:
+            with open(file_path, 'r') as f:
+                check = yaml.safe_load(f)
 
         # Check if already has powerpoint_export
         schema_version = check.get('metadata', {}).get('schema_version', '2.0')
@@ -276,6 +279,7 @@ def main():
             print(f"⚠️  Failed to load custom mapping: {e}")
 
     # Determine which files to process
+    preloaded = {}
     if args.checks:
         # Process specific files
         yaml_files = [Path(f) for f in args.checks]
@@ -286,7 +290,9 @@ def main():
             print(f"❌ Checks directory not found: {checks_dir}")
             sys.exit(1)
 
-        yaml_files = list(checks_dir.glob("*.yaml")) + list(checks_dir.glob("*.yml"))
+        snapshot = load_snapshot(checks_dir)
+        yaml_files = [Path(entry['path']) for entry in snapshot['files'].values()]
+        preloaded = {entry['path']: entry['check'] for entry in snapshot['files'].values() if not entry['error']}
 
     if len(yaml_files) == 0:
         print("⚠️  No YAML files found to process")
@@ -304,7 +310,8 @@ def main():
 
     for yaml_file in sorted(yaml_files):
         try:
-            result = process_check_file(str(yaml_file), dry_run=args.dry_run)
+            result = process_check_file(str(yaml_file), dry_run=args.dry_run,
+                                        check=preloaded.get(str(yaml_file)))
             if result:
                 updated_count += 1
             else:
@@ -4,9 +4,26 @@ Aggregate YAML check files into single JSON for GitHub Pages
 """
 import yaml
 import json
+import os
 import sys
+import hashlib
 from pathlib import Path
 
+from catalog_cache import load_snapshot, default_cache_dir
+from pipeline_trace import enable as enable_tracing, span
+from search_index import build_search_index
+
+# Incremental build manifest (see --incremental)
+MANIFEST_FILE = 'aggregate_manifest.json'
+MANIFEST_FORMAT = 1
+
+# Web catalog: compact card index plus one detail shard per check, fetched on demand
+INDEX_FIELDS = ['check_id', 'title', 'platform', 'severity', 'drive_maturity_min', 'drive_pillar']
+INDEX_FILE = 'docs/catalog/index.json'
+SEARCH_INDEX_FILE = 'docs/catalog/search_index.json'
+SHARDS_DIR = 'docs/catalog/checks'
+COMPACT_JSON = {'separators': (',', ':'), 'ensure_ascii': False}
+
 def load_yaml_check(file_path):
     """Load and parse a YAML check file"""
     with open(file_path, 'r') as f:
@@ -51,36 +68,96 @@ def simplify_check_for_web(check):
         'tags': ', '.join(check.get('framework_mappings', {}).get('mitre_attack', {}).get('techniques', []))
     }
 
-def aggregate_checks(checks_dir):
-    """Aggregate all YAML checks into single JSON"""
+def load_manifest(manifest_path):
+    """Load the incremental build manifest, or an empty one if missing or stale"""
+    empty = {'format': MANIFEST_FORMAT, 'simplifier': _simplifier_fingerprint(), 'files': {}}
+    try:
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return empty
+    if manifest.get('format') != MANIFEST_FORMAT or manifest.get('simplifier') != empty['simplifier']:
+        return empty
+    return manifest
+
+def save_manifest(manifest_path, manifest):
+    """Write the manifest atomically"""
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = manifest_path.with_suffix(f'.{os.getpid()}.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump({k: manifest[k] for k in ('format', 'simplifier', 'files')}, f)
+    os.replace(tmp_path, manifest_path)
+
+def _simplifier_fingerprint():
+    """Hash of this script so cached entries expire when simplification changes"""
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+def aggregate_checks(checks_dir, manifest=None):
+    """Aggregate all YAML checks into single JSON
+
+    With a manifest (incremental build), only files whose content hash
+    changed are re-simplified. The manifest is updated in place and its
+    'changes' list records (old_entry, new_entry) pairs for patching stats.
+    """
     checks_path = Path(checks_dir)
 
     if not checks_path.exists():
         print(f"Error: Checks directory not found: {checks_dir}")
         return []
 
-    yaml_files = list(checks_path.glob("*.yaml")) + list(checks_path.glob("*.yml"))
+    snapshot = load_snapshot(checks_path)
+    yaml_files = list(snapshot['files'].values())
 
     if len(yaml_files) == 0:
         print(f"Warning: No YAML files found in {checks_dir}")
         # Fall back to loading from CSV if it exists
         return []
 
+    previous = manifest['files'] if manifest is not None else {}
+    files = {}
+    changes = []
+    reused = 0
     aggregated = []
     errors = []
 
-    for yaml_file in sorted(yaml_files):
+    for entry in yaml_files:
+        name = Path(entry['path']).name
+        cached = previous.get(name)
+        if cached and cached['sha256'] == entry['sha256']:
+            aggregated.append(cached['entry'])
+            files[name] = cached
+            reused += 1
+            continue
+
         try:
-            check = load_yaml_check(yaml_file)
-            simplified = simplify_check_for_web(check)
+            if entry['error']:
+                raise ValueError(entry['error'])
+            check = entry['check']
+            with span('simplify', 'file', file=name):
+                simplified = simplify_check_for_web(check)
             aggregated.append(simplified)
+            files[name] = {'sha256': entry['sha256'], 'entry': simplified}
+            changes.append((cached['entry'] if cached else None, simplified))
             print(f"✓ Loaded {check['check_id']}")
         except Exception as e:
-            errors.append(f"✗ Error loading {yaml_file.name}: {e}")
+            if cached:
+                changes.append((cached['entry'], None))
+            errors.append(f"✗ Error loading {name}: {e}")
+
+    # Files removed since the last build
+    for name, cached in previous.items():
+        if name not in snapshot['files']:
+            changes.append((cached['entry'], None))
+
+    if manifest is not None:
+        manifest['files'] = files
+        manifest['changes'] = changes
 
     # Print summary
     print(f"\n{'='*60}")
     print(f"Aggregated {len(aggregated)} checks from {len(yaml_files)} YAML files")
+    if manifest is not None and previous:
+        print(f"Incremental: {len(changes)} changed, {reused} reused")
     if errors:
         print(f"\nErrors ({len(errors)}):")
         for error in errors:
@@ -89,15 +166,126 @@ def aggregate_checks(checks_dir):
 
     return aggregated
 
+def new_stats():
+    """Empty summary statistics"""
+    return {
+        'total_checks': 0,
+        'by_platform': {},
+        'by_severity': {},
+        'by_level': {},
+        'by_pillar': {},
+        'last_updated': ''
+    }
+
+def count_check(stats, check, delta=1):
+    """Add (delta=1) or remove (delta=-1) one check from the stats counters"""
+    buckets = [
+        ('by_platform', check.get('platform', 'Unknown')),
+        ('by_severity', check.get('severity', 'Unknown')),
+        ('by_level', f"Level {check.get('drive_maturity_min', 0)}"),
+        ('by_pillar', check.get('drive_pillar', 'Unknown')),
+    ]
+    for key, value in buckets:
+        counter = stats[key]
+        counter[value] = counter.get(value, 0) + delta
+        if counter[value] == 0:
+            del counter[value]
+    stats['total_checks'] += delta
+
+def compute_stats(aggregated):
+    """Recount summary statistics from scratch"""
+    stats = new_stats()
+    for check in aggregated:
+        count_check(stats, check)
+    stats['last_updated'] = aggregated[0].get('last_updated', '') if aggregated else ''
+    return stats
+
+def patch_stats(stats, changes, aggregated):
+    """Apply (old_entry, new_entry) changes to previously written stats"""
+    for old, new in changes:
+        if old is not None:
+            count_check(stats, old, -1)
+        if new is not None:
+            count_check(stats, new, 1)
+    stats['last_updated'] = aggregated[0].get('last_updated', '') if aggregated else ''
+    return stats
+
+def build_web_index(aggregated):
+    """Compact index with just the fields needed to render and filter cards"""
+    return {
+        'fields': INDEX_FIELDS,
+        'checks': [[check.get(field) for field in INDEX_FIELDS] for check in aggregated]
+    }
+
+def shard_path(check_id):
+    """Detail shard file for a check"""
+    return Path(SHARDS_DIR) / f"{str(check_id).replace('/', '_')}.json"
+
+def write_detail_shards(aggregated, changes=None):
+    """Write one detail JSON per check; with changes, only touch changed checks"""
+    shards_dir = Path(SHARDS_DIR)
+    shards_dir.mkdir(parents=True, exist_ok=True)
+    current = {check['check_id'] for check in aggregated}
+
+    if changes is None:
+        targets = aggregated
+        keep = {shard_path(check_id).name for check_id in current}
+        for shard in shards_dir.glob('*.json'):
+            if shard.name not in keep:
+                shard.unlink()
+    else:
+        targets = [new for old, new in changes if new is not None]
+        for old, new in changes:
+            if old is not None and old['check_id'] not in current:
+                shard_path(old['check_id']).unlink(missing_ok=True)
+
+    for check in targets:
+        with open(shard_path(check['check_id']), 'w', encoding='utf-8') as f:
+            json.dump(check, f, **COMPACT_JSON)
+
+    return len(targets)
+
 def main():
-    # Get checks directory
-    checks_dir = sys.argv[1] if len(sys.argv) > 1 else 'checks'
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Aggregate YAML check files into JSON for GitHub Pages')
+    parser.add_argument('checks_dir', nargs='?', default='checks', help='Checks directory (default: checks)')
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Only re-simplify checks whose content changed since the last build'
+    )
+    parser.add_argument(
+        '--trace',
+        metavar='FILE',
+        help='Write a Chrome trace of per-stage and per-file timings (plus a .summary.json)'
+    )
+    args = parser.parse_args()
+
+    if args.trace:
+        enable_tracing(args.trace)
+
+    checks_dir = args.checks_dir
+    output_file = 'docs/catalog/drive_risk_catalog.json'
+    stats_file = 'docs/catalog/stats.json'
+
+    # The manifest is always refreshed so the next incremental build can use it
+    manifest_path = default_cache_dir(checks_dir) / MANIFEST_FILE
+    manifest = load_manifest(manifest_path)
+    outputs_present = all(Path(path).exists() for path in (output_file, stats_file, INDEX_FILE, SHARDS_DIR))
+    if not args.incremental or not outputs_present:
+        manifest['files'] = {}
+    # Outputs can only be patched against the build the manifest describes;
+    # a missing or stale manifest would count every check as new
+    have_previous_build = bool(manifest['files'])
 
     # Aggregate checks
-    aggregated = aggregate_checks(checks_dir)
+    with span('simplify'):
+        aggregated = aggregate_checks(checks_dir, manifest)
 
     if len(aggregated) == 0:
         print("Warning: No checks were aggregated. Falling back to existing catalog.")
+        manifest = None
         # Try to use existing catalog as fallback
         try:
             with open('catalog/drive_risk_catalog.json', 'r') as f:
@@ -111,44 +299,49 @@ def main():
     Path('docs/catalog').mkdir(parents=True, exist_ok=True)
 
     # Write aggregated JSON
-    output_file = 'docs/catalog/drive_risk_catalog.json'
-    with open(output_file, 'w') as f:
+    with span('write', output=output_file), open(output_file, 'w') as f:
         json.dump(aggregated, f, indent=2)
 
     print(f"✅ Wrote {len(aggregated)} checks to {output_file}")
 
-    # Also write summary statistics
-    stats = {
-        'total_checks': len(aggregated),
-        'by_platform': {},
-        'by_severity': {},
-        'by_level': {},
-        'by_pillar': {},
-        'last_updated': aggregated[0].get('last_updated', '') if aggregated else ''
-    }
+    # Sharded web catalog: small index for first paint, details loaded per check
+    with span('write', output=INDEX_FILE), open(INDEX_FILE, 'w', encoding='utf-8') as f:
+        json.dump(build_web_index(aggregated), f, **COMPACT_JSON)
 
-    for check in aggregated:
-        # Count by platform
-        platform = check.get('platform', 'Unknown')
-        stats['by_platform'][platform] = stats['by_platform'].get(platform, 0) + 1
+    incremental_build = args.incremental and manifest is not None and outputs_present and have_previous_build
+    with span('write', output=SHARDS_DIR):
+        shard_count = write_detail_shards(aggregated, manifest['changes'] if incremental_build else None)
 
-        # Count by severity
-        severity = check.get('severity', 'Unknown')
-        stats['by_severity'][severity] = stats['by_severity'].get(severity, 0) + 1
+    print(f"✅ Wrote index to {INDEX_FILE} and {shard_count} detail shards to {SHARDS_DIR}/")
 
-        # Count by level
-        level = check.get('drive_maturity_min', 0)
-        stats['by_level'][f'Level {level}'] = stats['by_level'].get(f'Level {level}', 0) + 1
+    # Prebuilt inverted index so the site filters with set intersections
+    with span('write', output=SEARCH_INDEX_FILE), open(SEARCH_INDEX_FILE, 'w', encoding='utf-8') as f:
+        json.dump(build_search_index(aggregated), f, **COMPACT_JSON)
 
-        # Count by pillar
-        pillar = check.get('drive_pillar', 'Unknown')
-        stats['by_pillar'][pillar] = stats['by_pillar'].get(pillar, 0) + 1
+    print(f"✅ Wrote search index to {SEARCH_INDEX_FILE}")
 
-    stats_file = 'docs/catalog/stats.json'
-    with open(stats_file, 'w') as f:
-        json.dump(stats, f, indent=2)
+    # Also write summary statistics, patched by delta when building incrementally
+    with span('stats', incremental=incremental_build):
+        stats = None
+        if incremental_build:
+            try:
+                with open(stats_file, 'r') as f:
+                    stats = patch_stats(json.load(f), manifest['changes'], aggregated)
+            except (OSError, ValueError, KeyError):
+                stats = None
+        if stats is None:
+            stats = compute_stats(aggregated)
+
+        with open(stats_file, 'w') as f:
+            json.dump(stats, f, indent=2)
 
     print(f"✅ Wrote statistics to {stats_file}")
 
+    if manifest is not None:
+        try:
+            save_manifest(manifest_path, manifest)
+        except OSError as e:
+            print(f"Warning: Could not write build manifest {manifest_path}: {e}")
+
 if __name__ == "__main__":
     main()
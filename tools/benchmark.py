@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+DRIVE Benchmarks
+Times the catalog and scoring pipeline on synthetic catalogs and tenants,
+and flags regressions against a saved JSON baseline (requires numpy)
+
+Synthetic catalogs clone the real checks/ files under new IDs (the first
+ones, as many as checks/ holds, are the originals), so every file keeps
+the real schema. Synthetic tenants draw 1Secure results for every risk in
+the maturity mapping, as a severity name or a raw {"value": ...}
+measurement, plus pass/fail results for catalog checks. Both are seeded
+and reproducible.
+
+Benchmarks (each runs in a fresh process so peak RSS is its own):
+    catalog_load    cold snapshot build, then warm snapshot load
+    validate        validate_checks.validate_all_checks
+    aggregate       aggregate_checks.aggregate_checks
+    classify        1Secure band classification of raw measurements
+    score           drive.py score_stream over tenant JSONL
+
+Results record items, best-of-repeat seconds, throughput (items/s) and
+peak RSS. With --baseline, a benchmark whose throughput drops, or whose
+peak RSS grows, by more than --tolerance is reported as a regression and
+the exit status is 1.
+
+Usage:
+    python3 tools/benchmark.py                                   # Real catalog size, 10 and 10000 tenants
+    python3 tools/benchmark.py --checks 170,10000 --tenants 10,1000000 -o results.json
+    python3 tools/benchmark.py --save-baseline benchmarks/baseline.json
+    python3 tools/benchmark.py --baseline benchmarks/baseline.json --tolerance 0.2
+"""
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+CHECKS_DIR = REPO_ROOT / 'checks'
+MATURITY_MAPPING_FILE = REPO_ROOT / 'config' / '1secure_maturity_mapping.yaml'
+BASELINE_FORMAT = 1
+DEFAULT_TENANT_COUNTS = [10, 10000]
+DEFAULT_TOLERANCE = 0.2
+SEVERITIES = ['Low', 'Medium', 'High']
+
+
+# -- synthetic data -----------------------------------------------------------
+
+def generate_catalog(target_dir, count: int, source_dir=CHECKS_DIR) -> Path:
+    """Write count check files to target_dir/checks, cloning source_dir's files
+
+    Clones replace the source check ID everywhere in the file (threshold IDs
+    included) with '<check_id>-SYN<n>', so IDs stay unique catalog-wide.
+    """
+    from catalog_cache import list_check_files
+
+    sources = []
+    for path in list_check_files(source_dir):
+        text = path.read_text(encoding='utf-8')
+        check_id = next((line.split(':', 1)[1].strip().strip('\'"') for line in text.splitlines()
+                         if line.startswith('check_id:')), path.stem)
+        sources.append((path, check_id, text))
+    if not sources:
+        raise ValueError(f"No check files in {source_dir}")
+
+    checks_dir = Path(target_dir) / 'checks'
+    checks_dir.mkdir(parents=True, exist_ok=True)
+    for n in range(count):
+        path, check_id, text = sources[n % len(sources)]
+        clone = n // len(sources)
+        if clone == 0:
+            (checks_dir / path.name).write_text(text, encoding='utf-8')
+        else:
+            new_id = f"{check_id}-SYN{clone}"
+            (checks_dir / f"{new_id}.yaml").write_text(text.replace(check_id, new_id), encoding='utf-8')
+    return checks_dir
+
+
+def _synthetic_value(rng: random.Random, measure_type: str):
+    kind = str(measure_type).strip().lower()
+    if kind == 'binary':
+        return rng.randint(0, 1)
+    if kind.startswith('perc') or kind == '%':
+        return round(rng.uniform(0, 40), 2)
+    return rng.randint(0, 50)
+
+
+def generate_tenants(count: int, config: Dict, check_ids: List[str], seed: int = 0) -> Iterator[Dict]:
+    """Yield count synthetic tenant records shaped like drive.py score input"""
+    from threshold_bands import RISK_SECTIONS
+
+    risks = [(risk['risk_id'], risk.get('measure_type', 'Numeric'))
+             for section in RISK_SECTIONS for risk in config.get(section) or []]
+    rng = random.Random(seed)
+    for n in range(count):
+        results = {}
+        for risk_id, measure_type in risks:
+            draw = rng.random()
+            if draw < 0.5:
+                results[risk_id] = {'value': _synthetic_value(rng, measure_type)}
+            elif draw < 0.9:
+                results[risk_id] = rng.choice(SEVERITIES)
+        checks = {check_id: 'fail' if rng.random() < 0.2 else 'pass' for check_id in check_ids}
+        yield {'tenant_id': f"bench-{n:07d}", 'risks': results, 'checks': checks}
+
+
+def write_tenants(path, count: int, config: Dict, check_ids: List[str], seed: int = 0) -> Path:
+    with open(path, 'w') as f:
+        for record in generate_tenants(count, config, check_ids, seed):
+            f.write(json.dumps(record, separators=(',', ':')) + '\n')
+    return Path(path)
+
+
+# -- benchmarks ---------------------------------------------------------------
+# Each returns (items processed, seconds); setup stays outside the timing.
+
+def bench_catalog_load(checks_dir, cold: bool):
+    from catalog_cache import load_snapshot
+
+    cache_dir = Path(tempfile.mkdtemp(prefix='drive-bench-cache-'))
+    try:
+        if not cold:
+            load_snapshot(checks_dir, cache_dir)
+        start = time.perf_counter()
+        snapshot = load_snapshot(checks_dir, cache_dir)
+        return len(snapshot['files']), time.perf_counter() - start
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def bench_validate(checks_dir):
+    from catalog_cache import load_snapshot
+    from validate_checks import validate_all_checks
+
+    load_snapshot(checks_dir)
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        passed, warnings, failed = validate_all_checks(str(checks_dir))
+        elapsed = time.perf_counter() - start
+    return passed + warnings + failed, elapsed
+
+
+def bench_aggregate(checks_dir):
+    from aggregate_checks import aggregate_checks
+    from catalog_cache import load_snapshot
+
+    load_snapshot(checks_dir)
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        aggregated = aggregate_checks(checks_dir)
+        elapsed = time.perf_counter() - start
+    return len(aggregated), elapsed
+
+
+def bench_classify(tenants: int, chunk_size: int = 100000):
+    from maturity_engine import load_maturity_config
+    from threshold_bands import RISK_SECTIONS, compile_config_classifiers
+
+    config = load_maturity_config(MATURITY_MAPPING_FILE)
+    classifiers = compile_config_classifiers(config)
+    risks = [(classifiers[risk['risk_id']], risk.get('measure_type', 'Numeric'))
+             for section in RISK_SECTIONS for risk in config.get(section) or []]
+    rng = random.Random(0)
+    total = tenants * len(risks)
+    items, elapsed = 0, 0.0
+    while items < total:
+        chunk = [risks[(items + i) % len(risks)] for i in range(min(chunk_size, total - items))]
+        values = [_synthetic_value(rng, measure_type) for _, measure_type in chunk]
+        start = time.perf_counter()
+        for (classifier, _), value in zip(chunk, values):
+            classifier.classify(value)
+        elapsed += time.perf_counter() - start
+        items += len(chunk)
+    return items, elapsed
+
+
+def bench_score(tenants_file, batch_size: int):
+    from drive import load_scorer, score_stream
+
+    scorer = load_scorer(REPO_ROOT)
+    with open(tenants_file, 'r') as source, open(os.devnull, 'w') as out:
+        start = time.perf_counter()
+        stats = score_stream(scorer, source, out, batch_size)
+        elapsed = time.perf_counter() - start
+    return stats['scored'] + stats['errors'], elapsed
+
+
+BENCHMARKS: Dict[str, Callable] = {
+    'catalog_load_cold': lambda checks_dir: bench_catalog_load(checks_dir, cold=True),
+    'catalog_load_warm': lambda checks_dir: bench_catalog_load(checks_dir, cold=False),
+    'validate': bench_validate,
+    'aggregate': bench_aggregate,
+    'classify': bench_classify,
+    'score': bench_score,
+}
+CATALOG_BENCHMARKS = ['catalog_load_cold', 'catalog_load_warm', 'validate', 'aggregate']
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process (ru_maxrss is KiB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def _run_benchmark(name: str, args: tuple, repeat: int) -> Dict:
+    """Worker entry point: best of repeat runs plus this process's peak RSS"""
+    runs = [BENCHMARKS[name](*args) for _ in range(repeat)]
+    items = runs[0][0]
+    seconds = min(elapsed for _, elapsed in runs)
+    return {
+        'items': items,
+        'seconds': round(seconds, 6),
+        'throughput': round(items / seconds, 1) if seconds > 0 else None,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def run_isolated(name: str, args: tuple, repeat: int = 1) -> Dict:
+    """Run one benchmark in a fresh spawned process"""
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(_run_benchmark, name, args, repeat).result()
+
+
+def run_suite(check_counts: List[int], tenant_counts: List[int], work_dir: Path,
+              repeat: int = 1, batch_size: int = 1000, only: Optional[List[str]] = None) -> Dict[str, Dict]:
+    """Generate synthetic inputs under work_dir and run every benchmark"""
+    from catalog_cache import load_checks
+    from maturity_engine import load_maturity_config
+
+    selected = set(only or BENCHMARKS)
+    catalog_benchmarks = [name for name in CATALOG_BENCHMARKS if name in selected]
+    plan = []
+    for count in check_counts if catalog_benchmarks else []:
+        checks_dir = generate_catalog(work_dir / f"catalog-{count}", count)
+        for name in catalog_benchmarks:
+            plan.append((f"{name}[checks={count}]", name, (str(checks_dir),)))
+
+    config = load_maturity_config(MATURITY_MAPPING_FILE)
+    check_ids = [check_id for check_id in load_checks(CHECKS_DIR) if not check_id.startswith('1S-')]
+    for count in tenant_counts:
+        if 'classify' in selected:
+            plan.append((f"classify[tenants={count}]", 'classify', (count,)))
+        if 'score' in selected:
+            tenants_file = write_tenants(work_dir / f"tenants-{count}.jsonl", count, config, check_ids)
+            plan.append((f"score[tenants={count}]", 'score', (str(tenants_file), batch_size)))
+
+    results = {}
+    for key, name, args in plan:
+        results[key] = run_isolated(name, args, repeat)
+        result = results[key]
+        print(f"  {key:<36} {result['items']:>10} items  {result['seconds']:>9.4f}s  "
+              f"{result['throughput'] or 0:>12.1f}/s  {result['peak_rss_mb']:>8.1f} MB", file=sys.stderr)
+    return results
+
+
+# -- baselines ----------------------------------------------------------------
+
+def environment() -> Dict:
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def save_baseline(path, results: Dict[str, Dict]):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({'format': BASELINE_FORMAT, 'environment': environment(), 'results': results}, f, indent=2)
+
+
+def load_baseline(path) -> Dict:
+    with open(path, 'r') as f:
+        baseline = json.load(f)
+    if baseline.get('format') != BASELINE_FORMAT:
+        raise ValueError(f"Unsupported baseline format: {baseline.get('format')}")
+    return baseline
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float = DEFAULT_TOLERANCE) -> List[Dict]:
+    """Benchmarks slower or larger than the baseline by more than tolerance"""
+    regressions = []
+    for key, result in results.items():
+        previous = baseline.get(key)
+        if not previous:
+            continue
+        if previous.get('throughput') and result.get('throughput') is not None \
+                and result['throughput'] < previous['throughput'] * (1 - tolerance):
+            regressions.append({'benchmark': key, 'metric': 'throughput',
+                                'baseline': previous['throughput'], 'current': result['throughput']})
+        if previous.get('peak_rss_mb') and result['peak_rss_mb'] > previous['peak_rss_mb'] * (1 + tolerance):
+            regressions.append({'benchmark': key, 'metric': 'peak_rss_mb',
+                                'baseline': previous['peak_rss_mb'], 'current': result['peak_rss_mb']})
+    return regressions
+
+
+def _counts(text: str) -> List[int]:
+    return [int(value) for value in text.split(',') if value.strip()]
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark catalog and scoring tools on synthetic data')
+    parser.add_argument('--checks', type=_counts,
+                        help='Comma-separated synthetic catalog sizes (default: the files in checks/)')
+    parser.add_argument('--tenants', type=_counts, default=DEFAULT_TENANT_COUNTS,
+                        help='Comma-separated synthetic tenant counts (default: 10,10000)')
+    parser.add_argument('--only', help=f"Comma-separated benchmarks to run ({', '.join(BENCHMARKS)})")
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per benchmark; the fastest is kept')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Scoring batch size (default: 1000)')
+    parser.add_argument('-o', '--output', help='Write results JSON to this file')
+    parser.add_argument('--baseline', help='Compare against this baseline JSON')
+    parser.add_argument('--save-baseline', metavar='FILE', help='Write results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f'Allowed slowdown/growth before flagging (default: {DEFAULT_TOLERANCE})')
+    parser.add_argument('--keep', action='store_true', help='Keep the generated synthetic data')
+    args = parser.parse_args()
+
+    only = [name.strip() for name in args.only.split(',')] if args.only else None
+    if not args.checks:
+        from catalog_cache import list_check_files
+        args.checks = [len(list_check_files(CHECKS_DIR))]
+    unknown = set(only or []) - set(BENCHMARKS)
+    if unknown:
+        print(f"❌ Unknown benchmark(s): {', '.join(sorted(unknown))}", file=sys.stderr)
+        sys.exit(2)
+
+    baseline = None
+    if args.baseline:
+        try:
+            baseline = load_baseline(args.baseline)
+        except (OSError, ValueError) as e:
+            print(f"❌ Cannot load baseline {args.baseline}: {e}", file=sys.stderr)
+            sys.exit(2)
+
+    work_dir = Path(tempfile.mkdtemp(prefix='drive-bench-'))
+    print(f"⏱️  Benchmarking (synthetic data in {work_dir})", file=sys.stderr)
+    try:
+        # Synthetic catalogs get their own snapshot caches next to them
+        os.environ.pop('DRIVE_CACHE_DIR', None)
+        results = run_suite(args.checks, args.tenants, work_dir, args.repeat, args.batch_size, only)
+    finally:
+        if not args.keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {'format': BASELINE_FORMAT, 'environment': environment(), 'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Wrote results to {args.output}", file=sys.stderr)
+    if args.save_baseline:
+        save_baseline(args.save_baseline, results)
+        print(f"💾 Saved baseline to {args.save_baseline}", file=sys.stderr)
+
+    if baseline is not None:
+        regressions = compare(results, baseline['results'], args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) beyond {args.tolerance:.0%}:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  {regression['benchmark']}: {regression['metric']} "
+                      f"{regression['baseline']} -> {regression['current']}", file=sys.stderr)
+            sys.exit(1)
+        print(f"\n✅ No regressions beyond {args.tolerance:.0%} against {args.baseline}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
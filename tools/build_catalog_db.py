@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Build the DRIVE catalog SQLite database
+
+Compiles checks/*.yaml, frameworks/*.csv and config/1secure_maturity_mapping.yaml
+into one read-only SQLite file for services that query the catalog by ID
+and facet. Tables:
+
+    checks                one row per check (rowid is the FTS5 content rowid)
+    check_pillars         check_id x DRIVE pillar
+    thresholds            level_thresholds of every check
+    framework_mappings    framework references from check YAML and frameworks/*.csv
+    onesecure_risks       1Secure risks with bands and maturity_blocks
+    onesecure_risk_links  1Secure risk -> DRIVE check links
+    checks_fts            FTS5 index over IDs, titles, descriptions and MITRE tags
+    catalog_meta          build inputs hash and schema version
+
+The database is rebuilt only when an input changes.
+
+Usage:
+    python3 tools/build_catalog_db.py                       # -> build/drive_catalog.db
+    python3 tools/build_catalog_db.py --output /tmp/drive.db --force
+
+Example queries:
+    SELECT check_id, title FROM checks WHERE platform = 'SharePoint' AND min_level = 1;
+    SELECT c.check_id FROM checks_fts f JOIN checks c ON c.rowid = f.rowid
+     WHERE checks_fts MATCH 'kerberoast*' ORDER BY rank;
+"""
+import csv
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+import yaml
+
+from catalog_cache import load_snapshot
+from map_1secure_to_drive import MAPPINGS
+
+DB_SCHEMA_VERSION = 1
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_OUTPUT = REPO_ROOT / 'build' / 'drive_catalog.db'
+MATURITY_MAPPING_FILE = REPO_ROOT / 'config' / '1secure_maturity_mapping.yaml'
+FRAMEWORKS_DIR = REPO_ROOT / 'frameworks'
+RISK_SECTIONS = ['data_risks', 'identity_risks', 'infrastructure_risks']
+
+# List fields of framework_mappings entries that hold references
+FRAMEWORK_REFERENCE_FIELDS = ['controls', 'recommendations', 'techniques']
+
+SCHEMA = """
+CREATE TABLE catalog_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE checks (
+    rowid INTEGER PRIMARY KEY,
+    check_id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    short_description TEXT,
+    detailed_description TEXT,
+    category TEXT,
+    platform TEXT,
+    drive_pillar TEXT,
+    min_level INTEGER,
+    severity TEXT,
+    status TEXT,
+    automatable INTEGER,
+    owner TEXT,
+    fix_complexity TEXT,
+    estimated_time_minutes INTEGER,
+    mitre_techniques TEXT,
+    schema_version TEXT,
+    last_reviewed TEXT,
+    source_file TEXT,
+    source_sha256 TEXT
+);
+
+CREATE TABLE check_pillars (
+    check_id TEXT NOT NULL REFERENCES checks(check_id),
+    pillar TEXT NOT NULL,
+    PRIMARY KEY (check_id, pillar)
+) WITHOUT ROWID;
+
+CREATE TABLE thresholds (
+    threshold_id TEXT PRIMARY KEY,
+    check_id TEXT NOT NULL REFERENCES checks(check_id),
+    level INTEGER,
+    severity TEXT,
+    threshold_condition TEXT,
+    threshold_description TEXT,
+    cvss_score REAL,
+    remediation_priority INTEGER
+);
+
+CREATE TABLE framework_mappings (
+    check_id TEXT NOT NULL,
+    framework TEXT NOT NULL,
+    reference TEXT NOT NULL,
+    source TEXT NOT NULL,
+    notes TEXT,
+    PRIMARY KEY (check_id, framework, reference, source)
+) WITHOUT ROWID;
+
+CREATE TABLE onesecure_risks (
+    risk_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    category TEXT,
+    domain TEXT,
+    measure_type TEXT,
+    low_band TEXT,
+    medium_band TEXT,
+    high_band TEXT,
+    blocks_low INTEGER,
+    blocks_medium INTEGER,
+    blocks_high INTEGER,
+    description TEXT
+) WITHOUT ROWID;
+
+CREATE TABLE onesecure_risk_links (
+    risk_id TEXT NOT NULL REFERENCES onesecure_risks(risk_id),
+    check_id TEXT NOT NULL REFERENCES checks(check_id),
+    link_type TEXT NOT NULL,
+    PRIMARY KEY (risk_id, check_id)
+) WITHOUT ROWID;
+
+CREATE VIRTUAL TABLE checks_fts USING fts5(
+    check_id, title, short_description, detailed_description, mitre_techniques,
+    content='checks', content_rowid='rowid'
+);
+
+-- Covering indexes for facet queries
+CREATE INDEX idx_checks_platform ON checks(platform, min_level, drive_pillar, check_id, title, severity);
+CREATE INDEX idx_checks_level ON checks(min_level, platform, drive_pillar, check_id, title, severity);
+CREATE INDEX idx_checks_pillar ON checks(drive_pillar, min_level, platform, check_id, title, severity);
+CREATE INDEX idx_check_pillars_pillar ON check_pillars(pillar, check_id);
+CREATE INDEX idx_thresholds_check ON thresholds(check_id, level, severity);
+CREATE INDEX idx_thresholds_level ON thresholds(level, check_id);
+CREATE INDEX idx_framework_reference ON framework_mappings(framework, reference, check_id);
+CREATE INDEX idx_risk_links_check ON onesecure_risk_links(check_id, risk_id);
+"""
+
+
+def inputs_digest(snapshot: Dict) -> str:
+    """Hash of every build input so an unchanged catalog skips the rebuild"""
+    digest = hashlib.sha256()
+    digest.update(f"schema:{DB_SCHEMA_VERSION}\n".encode())
+    digest.update(snapshot['digest'].encode())
+    for path in [MATURITY_MAPPING_FILE, Path(__file__), *sorted(FRAMEWORKS_DIR.glob('*.csv'))]:
+        if path.exists():
+            digest.update(path.name.encode())
+            digest.update(hashlib.sha256(path.read_bytes()).digest())
+    digest.update(json.dumps(MAPPINGS, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def existing_digest(db_path: Path):
+    """inputs_digest recorded in an existing database, if any"""
+    if not db_path.exists():
+        return None
+    try:
+        with sqlite3.connect(f"file:{db_path}?mode=ro", uri=True) as conn:
+            row = conn.execute("SELECT value FROM catalog_meta WHERE key = 'inputs_digest'").fetchone()
+            return row[0] if row else None
+    except sqlite3.Error:
+        return None
+
+
+def check_rows(snapshot: Dict):
+    """Yield (check, entry) for every parseable check in the snapshot"""
+    for entry in snapshot['files'].values():
+        check = entry['check']
+        if isinstance(check, dict) and check.get('check_id'):
+            yield check, entry
+
+
+def insert_checks(conn: sqlite3.Connection, snapshot: Dict) -> int:
+    """Insert checks, pillars, thresholds and YAML framework mappings
+
+    Raises ValueError naming both files when two checks share a check_id
+    or two thresholds share a threshold_id.
+    """
+    count = 0
+    sources: Dict[str, str] = {}
+    threshold_sources: Dict[str, str] = {}
+    for check, entry in check_rows(snapshot):
+        check_id = check['check_id']
+        source = Path(entry.get('path', '')).name
+        if check_id in sources:
+            raise ValueError(f"Duplicate check_id {check_id} in {sources[check_id]} and {source}")
+        sources[check_id] = source
+        thresholds = [t for t in check.get('level_thresholds') or [] if isinstance(t, dict)]
+        for t in thresholds:
+            threshold_id = t.get('threshold_id')
+            if not threshold_id:
+                continue
+            if threshold_id in threshold_sources:
+                raise ValueError(f"Duplicate threshold_id {threshold_id} in "
+                                 f"{threshold_sources[threshold_id]} and {source}")
+            threshold_sources[threshold_id] = source
+        first = thresholds[0] if thresholds else {}
+        pillars = check.get('drive_pillars') or []
+        remediation = check.get('remediation') or {}
+        mappings = check.get('framework_mappings') or {}
+        techniques = (mappings.get('mitre_attack') or {}).get('techniques') or []
+
+        conn.execute(
+            "INSERT INTO checks (check_id, title, short_description, detailed_description, category, "
+            "platform, drive_pillar, min_level, severity, status, automatable, owner, fix_complexity, "
+            "estimated_time_minutes, mitre_techniques, schema_version, last_reviewed, source_file, source_sha256) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                check_id, check.get('title', ''), check.get('short_description'),
+                check.get('detailed_description'), check.get('category'), check.get('platform'),
+                pillars[0] if pillars else None,
+                min((t.get('level') for t in thresholds if isinstance(t.get('level'), int)), default=None),
+                first.get('severity'), check.get('status'), int(bool(check.get('automatable', True))),
+                check.get('owner'), remediation.get('fix_complexity'),
+                remediation.get('estimated_time_minutes'), ' '.join(techniques),
+                str((check.get('metadata') or {}).get('schema_version', '')),
+                str((check.get('metadata') or {}).get('last_reviewed', '')),
+                Path(entry['path']).name, entry['sha256'],
+            )
+        )
+
+        conn.executemany(
+            "INSERT OR IGNORE INTO check_pillars (check_id, pillar) VALUES (?, ?)",
+            [(check_id, pillar) for pillar in pillars]
+        )
+        conn.executemany(
+            "INSERT INTO thresholds (threshold_id, check_id, level, severity, threshold_condition, "
+            "threshold_description, cvss_score, remediation_priority) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (t.get('threshold_id'), check_id, t.get('level'), t.get('severity'),
+                 t.get('threshold_condition'), t.get('threshold_description'),
+                 t.get('cvss_score'), t.get('remediation_priority'))
+                for t in thresholds if t.get('threshold_id')
+            ]
+        )
+
+        framework_rows = []
+        for framework, mapping in mappings.items():
+            if not isinstance(mapping, dict):
+                continue
+            for field in FRAMEWORK_REFERENCE_FIELDS:
+                for reference in mapping.get(field) or []:
+                    framework_rows.append((check_id, framework, str(reference), 'check', None))
+        conn.executemany(
+            "INSERT OR IGNORE INTO framework_mappings (check_id, framework, reference, source, notes) "
+            "VALUES (?, ?, ?, ?, ?)",
+            framework_rows
+        )
+        count += 1
+    return count
+
+
+def insert_framework_csvs(conn: sqlite3.Connection) -> int:
+    """Insert rows from frameworks/*.csv (framework name is the file stem)"""
+    count = 0
+    for csv_path in sorted(FRAMEWORKS_DIR.glob('*.csv')):
+        with open(csv_path, 'r', newline='') as f:
+            rows = [
+                (row['check_id'], csv_path.stem, row['reference'], 'frameworks_csv', row.get('notes'))
+                for row in csv.DictReader(f)
+                if row.get('check_id') and row.get('reference')
+            ]
+        conn.executemany(
+            "INSERT OR IGNORE INTO framework_mappings (check_id, framework, reference, source, notes) "
+            "VALUES (?, ?, ?, ?, ?)",
+            rows
+        )
+        count += len(rows)
+    return count
+
+
+def insert_onesecure(conn: sqlite3.Connection, check_ids: set) -> Dict[str, int]:
+    """Insert 1Secure risks and their links to DRIVE checks"""
+    with open(MATURITY_MAPPING_FILE, 'r') as f:
+        config = yaml.safe_load(f) or {}
+
+    domain_by_category = {}
+    for domain, definition in ((config.get('scoring') or {}).get('domains') or {}).items():
+        for category in definition.get('categories') or []:
+            domain_by_category[category] = domain
+
+    risks_by_name = {}
+    risk_count = 0
+    for section in RISK_SECTIONS:
+        for risk in config.get(section) or []:
+            bands = risk.get('1secure_thresholds') or {}
+            blocks = risk.get('maturity_blocks') or {}
+            conn.execute(
+                "INSERT OR REPLACE INTO onesecure_risks (risk_id, name, category, domain, measure_type, "
+                "low_band, medium_band, high_band, blocks_low, blocks_medium, blocks_high, description) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    risk['risk_id'], risk.get('name', ''), risk.get('category'),
+                    domain_by_category.get(risk.get('category')), risk.get('measure_type'),
+                    bands.get('low'), bands.get('medium'), bands.get('high'),
+                    blocks.get('low'), blocks.get('medium'), blocks.get('high'),
+                    risk.get('description'),
+                )
+            )
+            risks_by_name[risk.get('name')] = risk['risk_id']
+            risk_count += 1
+
+    links = set()
+    dangling = 0
+    # Each 1Secure risk has a generated check with the same ID
+    for risk_id in risks_by_name.values():
+        if risk_id in check_ids:
+            links.add((risk_id, risk_id, 'generated_check'))
+    # Hand-maintained metric -> check mappings
+    for metric, mapped_ids in MAPPINGS.items():
+        risk_id = risks_by_name.get(metric)
+        if risk_id is None:
+            continue
+        for check_id in mapped_ids:
+            if check_id in check_ids:
+                links.add((risk_id, check_id, 'metric_mapping'))
+            else:
+                dangling += 1
+
+    conn.executemany(
+        "INSERT OR IGNORE INTO onesecure_risk_links (risk_id, check_id, link_type) VALUES (?, ?, ?)",
+        sorted(links)
+    )
+    return {'risks': risk_count, 'links': len(links), 'dangling': dangling}
+
+
+def build_database(checks_dir, output: Path, force: bool = False) -> bool:
+    """Build the database; returns False if it was already up to date"""
+    snapshot = load_snapshot(checks_dir)
+    digest = inputs_digest(snapshot)
+    if not force and existing_digest(output) == digest:
+        print(f"✅ {output} is up to date ({digest[:12]})")
+        return False
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_suffix(f'.{os.getpid()}.tmp')
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    conn = sqlite3.connect(tmp_path)
+    replaced = False
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.executescript(SCHEMA)
+
+        with conn:
+            check_count = insert_checks(conn, snapshot)
+            csv_count = insert_framework_csvs(conn)
+            check_ids = {row[0] for row in conn.execute("SELECT check_id FROM checks")}
+            onesecure = insert_onesecure(conn, check_ids)
+            conn.execute("INSERT INTO checks_fts(checks_fts) VALUES ('rebuild')")
+            conn.executemany(
+                "INSERT INTO catalog_meta (key, value) VALUES (?, ?)",
+                [
+                    ('schema_version', str(DB_SCHEMA_VERSION)),
+                    ('inputs_digest', digest),
+                    ('catalog_digest', snapshot['digest']),
+                    ('check_count', str(check_count)),
+                ]
+            )
+
+        conn.execute("INSERT INTO checks_fts(checks_fts) VALUES ('optimize')")
+        conn.execute("ANALYZE")
+        conn.commit()
+        conn.close()
+        os.replace(tmp_path, output)
+        replaced = True
+    finally:
+        conn.close()
+        if not replaced:
+            tmp_path.unlink(missing_ok=True)
+
+    print(f"✅ Wrote {output}")
+    print(f"   📋 Checks: {check_count}")
+    print(f"   🧭 Framework CSV rows: {csv_count}")
+    print(f"   🔗 1Secure risks: {onesecure['risks']} ({onesecure['links']} links, "
+          f"{onesecure['dangling']} dangling mapping targets skipped)")
+    return True
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Compile the DRIVE catalog into a SQLite database')
+    parser.add_argument('checks_dir', nargs='?', default=str(REPO_ROOT / 'checks'),
+                        help='Checks directory (default: checks/)')
+    parser.add_argument('--output', '-o', default=str(DEFAULT_OUTPUT),
+                        help=f'Database path (default: {DEFAULT_OUTPUT.relative_to(REPO_ROOT)})')
+    parser.add_argument('--force', action='store_true', help='Rebuild even if inputs are unchanged')
+    args = parser.parse_args()
+
+    if not Path(args.checks_dir).exists():
+        print(f"❌ Checks directory not found: {args.checks_dir}")
+        sys.exit(1)
+
+    try:
+        build_database(args.checks_dir, Path(args.output), force=args.force)
+    except (ValueError, sqlite3.IntegrityError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
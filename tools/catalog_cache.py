@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+DRIVE Catalog Snapshot Cache
+Compiles every check YAML into one binary snapshot shared by all tools
+
+The snapshot is keyed by a content hash of the checks directory and stored
+in .drive_cache/ next to it. Tools load the snapshot instead of re-parsing
+each YAML file; it is rebuilt only when a source file is added, removed or
+modified, and unchanged files are carried over from the previous snapshot.
+
+Usage:
+    python3 tools/catalog_cache.py            # Build/refresh snapshot for checks/
+    python3 tools/catalog_cache.py checks/    # Specific checks directory
+"""
+import hashlib
+import os
+import pickle
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import yaml
+
+from pipeline_trace import span
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+# Bump when the snapshot layout changes so stale pickles are ignored
+SNAPSHOT_FORMAT = 1
+SNAPSHOTS_TO_KEEP = 3
+CACHE_DIR_NAME = '.drive_cache'
+
+
+def default_cache_dir(checks_dir) -> Path:
+    """Cache directory for a checks directory (DRIVE_CACHE_DIR overrides)"""
+    override = os.environ.get('DRIVE_CACHE_DIR')
+    if override:
+        return Path(override)
+    return Path(checks_dir).resolve().parent / CACHE_DIR_NAME
+
+
+def list_check_files(checks_dir) -> List[Path]:
+    """List check YAML files in a stable order"""
+    checks_path = Path(checks_dir)
+    yaml_files = list(checks_path.glob("*.yaml")) + list(checks_path.glob("*.yml"))
+    return sorted(yaml_files)
+
+
+def hash_files(yaml_files: List[Path]) -> Dict[str, str]:
+    """Map file name -> sha256 of its bytes"""
+    hashes = {}
+    for yaml_file in yaml_files:
+        with open(yaml_file, 'rb') as f:
+            hashes[yaml_file.name] = hashlib.sha256(f.read()).hexdigest()
+    return hashes
+
+
+def catalog_digest(file_hashes: Dict[str, str]) -> str:
+    """Content hash of the whole catalog (names and bytes of every file)"""
+    digest = hashlib.sha256()
+    for name in sorted(file_hashes):
+        digest.update(name.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(file_hashes[name].encode('ascii'))
+        digest.update(b'\n')
+    return digest.hexdigest()
+
+
+def parse_check_file(file_path) -> Dict:
+    """Parse one check file into a snapshot entry"""
+    entry = {'check': None, 'error': None}
+    try:
+        with open(file_path, 'r') as f:
+            entry['check'] = yaml.load(f, Loader=SafeLoader)
+    except yaml.YAMLError as e:
+        entry['error'] = f"YAML parsing error: {e}"
+    return entry
+
+
+def _snapshot_path(cache_dir: Path, digest: str) -> Path:
+    return cache_dir / f"catalog-{digest[:32]}.pickle"
+
+
+def _read_snapshot(path: Path) -> Optional[Dict]:
+    try:
+        with open(path, 'rb') as f:
+            snapshot = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get('format') != SNAPSHOT_FORMAT:
+        return None
+    return snapshot
+
+
+def _previous_entries(cache_dir: Path) -> Dict[str, Dict]:
+    """Entries of the most recent snapshot, keyed by file sha256"""
+    candidates = sorted(cache_dir.glob('catalog-*.pickle'), key=lambda p: p.stat().st_mtime, reverse=True)
+    for candidate in candidates:
+        snapshot = _read_snapshot(candidate)
+        if snapshot is not None:
+            return {entry['sha256']: entry for entry in snapshot['files'].values()}
+    return {}
+
+
+def _write_snapshot(cache_dir: Path, snapshot: Dict):
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = _snapshot_path(cache_dir, snapshot['digest'])
+    tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+    # Prune old snapshots, keeping the most recent few
+    snapshots = sorted(cache_dir.glob('catalog-*.pickle'), key=lambda p: p.stat().st_mtime, reverse=True)
+    for stale in snapshots[SNAPSHOTS_TO_KEEP:]:
+        try:
+            stale.unlink()
+        except OSError:
+            pass
+
+
+def load_snapshot(checks_dir, cache_dir=None, jobs: int = 1) -> Dict:
+    """
+    Load the compiled snapshot for a checks directory, rebuilding if needed
+
+    jobs > 1 parses changed files in a process pool.
+
+    Returns a dict with:
+        digest: content hash of the checks directory
+        files:  {file name: {'path', 'sha256', 'check', 'error'}} in name order
+        rebuilt: list of file names parsed during this call
+    """
+    with span('load', checks_dir=str(checks_dir)):
+        return _load_snapshot(Path(checks_dir), Path(cache_dir) if cache_dir else None, jobs)
+
+
+def _load_snapshot(checks_path: Path, cache_dir: Optional[Path], jobs: int) -> Dict:
+    cache_dir = cache_dir or default_cache_dir(checks_path)
+
+    with span('hash'):
+        yaml_files = list_check_files(checks_path)
+        file_hashes = hash_files(yaml_files)
+        digest = catalog_digest(file_hashes)
+
+    snapshot = _read_snapshot(_snapshot_path(cache_dir, digest))
+    if snapshot is not None and snapshot['digest'] == digest:
+        for yaml_file in yaml_files:
+            snapshot['files'][yaml_file.name]['path'] = str(yaml_file)
+        snapshot['rebuilt'] = []
+        return snapshot
+
+    # Rebuild, reusing entries whose bytes did not change
+    previous = _previous_entries(cache_dir) if cache_dir.exists() else {}
+    to_parse = [f for f in yaml_files if file_hashes[f.name] not in previous]
+    rebuilt = [f.name for f in to_parse]
+    with span('parse', files=len(to_parse), jobs=jobs):
+        if jobs > 1 and len(to_parse) > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                parsed = dict(zip(rebuilt, pool.map(parse_check_file, to_parse,
+                                                    chunksize=max(1, len(to_parse) // (jobs * 4)))))
+        else:
+            parsed = {}
+            for f in to_parse:
+                with span('parse', 'file', file=f.name):
+                    parsed[f.name] = parse_check_file(f)
+
+    files = {}
+    for yaml_file in yaml_files:
+        sha = file_hashes[yaml_file.name]
+        if yaml_file.name in parsed:
+            entry = parsed[yaml_file.name]
+        else:
+            entry = dict(previous[sha])
+        entry['sha256'] = sha
+        entry['path'] = str(yaml_file)
+        files[yaml_file.name] = entry
+
+    snapshot = {
+        'format': SNAPSHOT_FORMAT,
+        'digest': digest,
+        'files': files,
+    }
+    try:
+        _write_snapshot(cache_dir, snapshot)
+    except OSError as e:
+        # A read-only checkout still works, just without reuse
+        print(f"⚠️  Could not write catalog snapshot to {cache_dir}: {e}", file=sys.stderr)
+
+    snapshot['rebuilt'] = rebuilt
+    return snapshot
+
+
+def load_checks(checks_dir, cache_dir=None) -> Dict[str, Dict]:
+    """Load all parseable checks keyed by check_id"""
+    snapshot = load_snapshot(checks_dir, cache_dir)
+    checks = {}
+    for entry in snapshot['files'].values():
+        check = entry['check']
+        if isinstance(check, dict) and 'check_id' in check:
+            checks[check['check_id']] = check
+    return checks
+
+
+def main():
+    checks_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(__file__), '..', 'checks')
+
+    if not Path(checks_dir).exists():
+        print(f"❌ Checks directory not found: {checks_dir}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    snapshot = load_snapshot(checks_dir)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    errors = [name for name, entry in snapshot['files'].items() if entry['error']]
+    print(f"📦 Catalog snapshot {snapshot['digest'][:12]}: {len(snapshot['files'])} files "
+          f"({len(snapshot['rebuilt'])} parsed, {len(errors)} with errors) in {elapsed_ms:.1f} ms")
+    for name in errors:
+        print(f"   ERROR: {name}: {snapshot['files'][name]['error']}")
+
+    sys.exit(0 if not errors else 1)
+
+
+if __name__ == "__main__":
+    main()
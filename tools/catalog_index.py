@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+DRIVE Catalog Reference Index
+Builds a catalog-wide index of check and threshold IDs and reports
+duplicate definitions and dangling references in a single pass
+
+External references come from:
+- MAPPINGS in tools/map_1secure_to_drive.py (1Secure metric -> check IDs)
+- config/1secure_maturity_mapping.yaml (risk_id of every mapped 1Secure risk)
+
+Usage:
+    python3 tools/catalog_index.py             # Report for checks/
+    python3 tools/catalog_index.py --strict    # Also fail on dangling references
+"""
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+import yaml
+
+from catalog_cache import load_snapshot
+
+MATURITY_MAPPING_FILE = Path('config') / '1secure_maturity_mapping.yaml'
+RISK_SECTIONS = ['data_risks', 'identity_risks', 'infrastructure_risks']
+
+
+def load_external_references(repo_root) -> List[Dict]:
+    """Collect every check ID referenced from outside checks/"""
+    from map_1secure_to_drive import MAPPINGS
+
+    references = []
+    for metric, check_ids in MAPPINGS.items():
+        for check_id in check_ids:
+            references.append({
+                'source': 'tools/map_1secure_to_drive.py',
+                'ref': check_id,
+                'context': f"MAPPINGS[{metric!r}]",
+            })
+
+    config_path = Path(repo_root) / MATURITY_MAPPING_FILE
+    if config_path.exists():
+        with open(config_path, 'r') as f:
+            config = yaml.safe_load(f) or {}
+        for section in RISK_SECTIONS:
+            for risk in config.get(section) or []:
+                references.append({
+                    'source': str(MATURITY_MAPPING_FILE),
+                    'ref': risk.get('risk_id'),
+                    'context': f"{section}: {risk.get('name', '')}",
+                })
+
+    return references
+
+
+def build_reference_index(entries: List[Dict], references: List[Dict]) -> Dict:
+    """
+    Index check/threshold IDs and resolve references in O(total references)
+
+    entries are catalog snapshot entries; references are dicts with
+    'source', 'ref' and 'context'. Returns:
+        check_ids / threshold_ids: sets of defined IDs
+        duplicate_check_ids / duplicate_threshold_ids: {id: [files]}
+        duplicate_references: {(source, ref): [contexts]} defined more than once
+        dangling: references whose target check_id does not exist
+    """
+    check_files = {}
+    threshold_files = {}
+
+    for entry in entries:
+        check = entry['check']
+        if not isinstance(check, dict):
+            continue
+        name = Path(entry['path']).name
+
+        check_id = check.get('check_id')
+        if check_id:
+            check_files.setdefault(check_id, []).append(name)
+
+        thresholds = check.get('level_thresholds')
+        if isinstance(thresholds, list):
+            for threshold in thresholds:
+                if isinstance(threshold, dict) and threshold.get('threshold_id'):
+                    files = threshold_files.setdefault(threshold['threshold_id'], [])
+                    if name not in files:
+                        files.append(name)
+
+    check_ids = set(check_files)
+    dangling = []
+    reference_contexts = {}
+    for reference in references:
+        if reference['ref'] not in check_ids:
+            dangling.append(reference)
+        reference_contexts.setdefault((reference['source'], reference['ref']), []).append(reference['context'])
+
+    return {
+        'check_ids': check_ids,
+        'threshold_ids': set(threshold_files),
+        'duplicate_check_ids': {k: v for k, v in check_files.items() if len(v) > 1},
+        'duplicate_threshold_ids': {k: v for k, v in threshold_files.items() if len(v) > 1},
+        'duplicate_references': {k: v for k, v in reference_contexts.items() if len(v) > 1},
+        'dangling': dangling,
+    }
+
+
+def index_findings(index: Dict):
+    """Turn an index into (errors, warnings) message lists"""
+    errors = []
+    warnings = []
+
+    for check_id, files in sorted(index['duplicate_check_ids'].items()):
+        errors.append(f"Duplicate check_id {check_id} in {', '.join(files)}")
+    for threshold_id, files in sorted(index['duplicate_threshold_ids'].items()):
+        errors.append(f"Duplicate threshold_id {threshold_id} in {', '.join(files)}")
+
+    for reference in index['dangling']:
+        warnings.append(f"Dangling reference {reference['ref']} from {reference['source']} ({reference['context']})")
+    for (source, ref), contexts in sorted(index['duplicate_references'].items()):
+        if source == str(MATURITY_MAPPING_FILE):
+            warnings.append(f"{ref} is mapped {len(contexts)} times in {source}")
+
+    return errors, warnings
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Report duplicate IDs and dangling references across the catalog')
+    parser.add_argument('checks_dir', nargs='?', help='Checks directory (default: checks/)')
+    parser.add_argument('--strict', action='store_true', help='Exit non-zero on dangling references too')
+    args = parser.parse_args()
+
+    checks_dir = Path(args.checks_dir or os.path.join(os.path.dirname(__file__), '..', 'checks'))
+    if not checks_dir.exists():
+        print(f"❌ Checks directory not found: {checks_dir}")
+        sys.exit(1)
+
+    snapshot = load_snapshot(checks_dir)
+    references = load_external_references(checks_dir.resolve().parent)
+    index = build_reference_index(list(snapshot['files'].values()), references)
+    errors, warnings = index_findings(index)
+
+    print(f"\n🔗 Indexed {len(index['check_ids'])} check IDs, {len(index['threshold_ids'])} threshold IDs, "
+          f"{len(references)} external references\n")
+    for error in errors:
+        print(f"   ERROR: {error}")
+    for warning in warnings:
+        print(f"   WARNING: {warning}")
+
+    print("\n" + "=" * 70)
+    print(f"   ❌ Duplicate IDs: {len(errors)}")
+    print(f"   ⚠️  Dangling references: {len(index['dangling'])}")
+    print("=" * 70)
+
+    failed = bool(errors) or (args.strict and bool(index['dangling']))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,669 @@
+#!/usr/bin/env python3
+"""
+DRIVE Command Line
+Scores 1Secure tenant results against the DRIVE maturity model
+
+Input is JSON Lines, one tenant per line:
+    {"tenant_id": "t-001",
+     "risks": {"1S-DATA-002": "High", "1S-IDENTITY-001": {"value": 3}},
+     "checks": {"AD-001": "fail"}}
+
+"risks" may also be a list of {"risk_id", "severity"} or {"risk_id", "value"}
+objects; raw values are classified with the risk's 1secure_thresholds bands.
+"checks" (optional) holds pass/fail results for catalog checks, and
+"exposure" (optional) maps check IDs to the fraction of objects affected
+(0-1) for the scoring.yaml exposure score. Output is one scored record per
+line:
+    {"tenant_id": "t-001", "overall_level": 0, "data_level": 0,
+     "identity_level": 2, "blocked_by": {"data_security": [...],
+     "identity_security": [...]}, "failing": [...], "level_bits": 34}
+("blocked_by" holds the IDs keeping each domain from its next level,
+"failing" every failing risk and check ID, and "level_bits" packs the
+levels blocked per domain, see maturity_engine)
+plus "exposure_score" and "exposure_deductions" when "exposure" is given.
+
+Usage:
+    python3 tools/drive.py score < tenants.jsonl > scores.jsonl
+    python3 tools/drive.py score tenants.jsonl -o scores.jsonl --batch-size 5000
+    python3 tools/drive.py score tenants.jsonl -o scores.jsonl --save-bits levels.npz
+    python3 tools/drive.py ingest export.csv -o scores.jsonl    # Long-format 1Secure export, one result per row
+    python3 tools/drive.py query levels.npz --domain identity --level 2    # Tenants blocked at Level 2
+    python3 tools/drive.py score tenants.jsonl --history history/ > scores.jsonl   # Append scan to history
+    python3 tools/drive.py history history/ --tenant t-001 --check AD-001
+    python3 tools/drive.py fleet scores.jsonl --save-rollup shard-1.json   # Fleet percentiles/breakdowns
+    python3 tools/drive.py fleet --merge shard-1.json --merge shard-2.json
+    python3 tools/drive.py rescore deltas.jsonl --verify    # First line per tenant is a full scan
+    python3 tools/drive.py whatif tenant.json --target 3 --fix 1S-DATA-002,AD-001
+    python3 tools/drive.py plan tenants.jsonl --target 3 > plans.jsonl
+    python3 tools/drive.py serve --port 8765    # HTTP scoring service, hot-reloads config
+"""
+import json
+import math
+import sys
+import time
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from catalog_cache import load_checks
+from exposure_score import compile_exposure_model, load_scoring_config, score_exposure
+from maturity_engine import (
+    DOMAINS, blocked_at, check_results, compile_check_model, compile_risk_model, has_blocker, is_failing,
+    levels_from_bits, load_level_bits, load_maturity_config, pack_level_bits, risk_results, save_level_bits,
+    severity_code,
+)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_EXACT_LIMIT = 24
+
+
+class TenantScorer:
+    """Risk and check models compiled once, scoring batches of tenant records"""
+
+    def __init__(self, config: Dict, checks: Iterable[Dict], scoring_config: Optional[Dict] = None):
+        checks = list(checks)
+        self._set_models(compile_risk_model(config), compile_check_model(checks, config),
+                         compile_exposure_model(checks, scoring_config) if scoring_config else None)
+
+    @classmethod
+    def from_models(cls, risk_model, check_model, exposure_model=None) -> 'TenantScorer':
+        """Scorer over already compiled models (e.g. from predicate_cache)"""
+        scorer = cls.__new__(cls)
+        scorer._set_models(risk_model, check_model, exposure_model)
+        return scorer
+
+    def _set_models(self, risk_model, check_model, exposure_model):
+        self.risk_model = risk_model
+        self.check_model = check_model
+        self.exposure_model = exposure_model
+        self.ids = self.risk_model.ids + self.check_model.ids
+        self.domain_masks = {
+            domain: np.concatenate([self.risk_model.domain_masks[domain], self.check_model.domain_masks[domain]])
+            for domain in DOMAINS
+        }
+
+    def encode(self, records: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+        """Records -> (N, risks) severity codes and (N, checks) failing flags"""
+        codes = np.zeros((len(records), self.risk_model.size), dtype=np.uint8)
+        failing = np.zeros((len(records), self.check_model.size), dtype=bool)
+        for n, record in enumerate(records):
+            for risk_id, result in risk_results(record.get('risks')):
+                m = self.risk_model.index.get(risk_id)
+                if m is not None:
+                    codes[n, m] = self.risk_code(risk_id, result)
+            for check_id, status in check_results(record.get('checks')):
+                m = self.check_model.index.get(check_id)
+                if m is not None:
+                    failing[n, m] = is_failing(status)
+        return codes, failing
+
+    def risk_code(self, risk_id: str, result) -> int:
+        """Severity code for a severity name or a {"value": ...} measurement"""
+        if isinstance(result, dict):
+            if 'value' in result:
+                classifier = self.risk_model.classifiers.get(risk_id)
+                return severity_code(classifier.classify(result['value']) if classifier else None)
+            result = result.get('severity')
+        return severity_code(result)
+
+    def blocked_levels(self, records: List[Dict]) -> np.ndarray:
+        """(N, risks + checks) blocked-level array for a batch of records"""
+        codes, failing = self.encode(records)
+        return np.hstack([self.risk_model.blocked_levels(codes), self.check_model.blocked_levels(failing)])
+
+    def score(self, records: List[Dict], history=None) -> List[Dict]:
+        """Score a batch of tenant records (appending them to a history ScanWriter if given)"""
+        codes, failing = self.encode(records)
+        return self.score_encoded(records, codes, failing, history)
+
+    def score_encoded(self, records: List[Dict], codes: np.ndarray, failing: np.ndarray,
+                      history=None) -> List[Dict]:
+        """Score records already encoded as severity codes and failing flags (see encode)"""
+        risk_blocked = self.risk_model.blocked_levels(codes)
+        blocked = np.hstack([risk_blocked, self.check_model.blocked_levels(failing)])
+        packed = pack_level_bits(blocked, self.domain_masks)
+        levels = levels_from_bits(packed)
+
+        # Every failing column: risks whose severity blocks a level, checks reported failing
+        failing_ids = [[] for _ in records]
+        for n, m in zip(*np.nonzero(np.hstack([risk_blocked > 0, failing]))):
+            failing_ids[n].append(self.ids[m])
+
+        # Columns sitting at the level right above each domain's score
+        blocked_by = [{domain: [] for domain in DOMAINS} for _ in records]
+        for domain, level_key in zip(DOMAINS, ('data_level', 'identity_level')):
+            next_level = levels[level_key].astype(np.int16) + 1
+            hits = (blocked == next_level[:, None]) & self.domain_masks[domain]
+            for n, m in zip(*np.nonzero(hits)):
+                column_id = self.ids[m]
+                if column_id not in blocked_by[n][domain]:
+                    blocked_by[n][domain].append(column_id)
+
+        results = [
+            {
+                'tenant_id': record.get('tenant_id'),
+                'overall_level': int(levels['overall_level'][n]),
+                'data_level': int(levels['data_level'][n]),
+                'identity_level': int(levels['identity_level'][n]),
+                'blocked_by': blocked_by[n],
+                'failing': list(dict.fromkeys(failing_ids[n])),
+                'level_bits': int(packed[n]),
+            }
+            for n, record in enumerate(records)
+        ]
+        if self.exposure_model is not None:
+            self._add_exposure(records, results)
+        if history is not None:
+            history.add(records, blocked, levels)
+        return results
+
+    def _add_exposure(self, records: List[Dict], results: List[Dict]):
+        """Exposure score for records carrying "exposure" fractions"""
+        model = self.exposure_model
+        tenants, columns, fractions = [], [], []
+        for n, record in enumerate(records):
+            exposure = record.get('exposure') or {}
+            if not isinstance(exposure, dict):
+                raise ValueError(f"\"exposure\" must map check IDs to fractions, not {type(exposure).__name__}")
+            for check_id, fraction in exposure.items():
+                m = model.index.get(check_id)
+                if m is not None:
+                    try:
+                        value = float(fraction)
+                    except (TypeError, ValueError):
+                        value = math.nan
+                    if not math.isfinite(value):
+                        raise ValueError(f"Exposure fraction for {check_id} must be a number, not {fraction!r}")
+                    tenants.append(n)
+                    columns.append(m)
+                    fractions.append(value)
+
+        exposure = score_exposure(model, np.array(tenants, dtype=np.intp), np.array(columns, dtype=np.intp),
+                                  np.array(fractions, dtype=np.float64), len(records))
+        for n, record in enumerate(records):
+            if 'exposure' in record:
+                results[n]['exposure_score'] = round(float(exposure['score'][n]), 1)
+                results[n]['exposure_deductions'] = {
+                    key: round(float(value), 2)
+                    for key, value in zip(model.category_keys, exposure['deductions'][n])
+                }
+
+
+def load_scorer(repo_root=REPO_ROOT, cache: bool = True) -> TenantScorer:
+    """Compile the scorer from config/1secure_maturity_mapping.yaml, scoring/scoring.yaml and checks/
+
+    With cache, compiled tables are reused from (or stored in) the
+    predicate cache for this exact set of inputs.
+    """
+    import predicate_cache
+
+    digest = predicate_cache.inputs_digest(repo_root) if cache else None
+    if cache:
+        models = predicate_cache.load_models(repo_root, digest)
+        if models is not None:
+            return TenantScorer.from_models(*models)
+
+    config = load_maturity_config(Path(repo_root) / 'config' / '1secure_maturity_mapping.yaml')
+    scoring_path = Path(repo_root) / 'scoring' / 'scoring.yaml'
+    scoring_config = load_scoring_config(scoring_path) if scoring_path.exists() else None
+    scorer = TenantScorer(config, load_checks(Path(repo_root) / 'checks').values(), scoring_config)
+    if cache:
+        try:
+            predicate_cache.save_models(repo_root, digest, scorer.risk_model, scorer.check_model,
+                                        scorer.exposure_model)
+        except OSError as e:
+            # A read-only checkout still scores, just without reuse
+            print(f"⚠️  Could not write predicate cache: {e}", file=sys.stderr)
+    return scorer
+
+
+def read_records(lines: Iterable[str]) -> Iterator[Tuple[Dict, str]]:
+    """Parse JSON Lines, yielding (record, None) or (None, error message)"""
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("expected a JSON object")
+        except ValueError as e:
+            yield None, f"line {line_number}: {e}"
+            continue
+        yield record, None
+
+
+def score_stream(scorer: TenantScorer, lines: Iterable[str], out, batch_size=DEFAULT_BATCH_SIZE,
+                 level_bits: Optional[List[Tuple]] = None, history=None) -> Dict:
+    """Score JSON Lines from lines to out, holding at most batch_size records
+
+    When level_bits is a list, (tenant_id, level_bits) pairs are appended to
+    it; scored tenants are also added to a history ScanWriter if given.
+    """
+    stats = {'scored': 0, 'errors': 0}
+    records = read_records(lines)
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            break
+        for result in _score_batch(scorer, batch, history):
+            if 'error' in result:
+                stats['errors'] += 1
+            else:
+                stats['scored'] += 1
+                if level_bits is not None:
+                    level_bits.append((result['tenant_id'], result['level_bits']))
+            out.write(json.dumps(result, separators=(',', ':')) + '\n')
+    return stats
+
+
+def _score_batch(scorer: TenantScorer, batch: List[Tuple[Dict, str]], history=None) -> List[Dict]:
+    valid = [record for record, error in batch if error is None]
+    try:
+        scored = iter(scorer.score(valid, history))
+    except ValueError:
+        # Isolate the offending records instead of failing the whole batch
+        scored = iter(_score_one(scorer, record, history) for record in valid)
+    return [next(scored) if error is None else {'error': error} for _, error in batch]
+
+
+def _score_one(scorer: TenantScorer, record: Dict, history=None) -> Dict:
+    try:
+        return scorer.score([record], history)[0]
+    except ValueError as e:
+        return {'tenant_id': record.get('tenant_id'), 'error': str(e)}
+
+
+@contextmanager
+def open_streams(args):
+    """Input/output streams for an input path and --output ('-' = stdin/stdout)"""
+    source = sys.stdin if args.input == '-' else open(args.input, 'r')
+    out = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        yield source, out
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+
+
+def cmd_score(args):
+    if args.batch_size < 1:
+        print("❌ --batch-size must be at least 1", file=sys.stderr)
+        sys.exit(2)
+
+    start = time.perf_counter()
+    scorer = load_scorer(args.repo_root, args.cache)
+    level_bits = [] if args.save_bits else None
+    history = None
+    if args.history:
+        from history_store import HistoryStore
+        try:
+            history = HistoryStore(args.history).writer(scorer.ids, args.scanned_at)
+        except FileExistsError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            sys.exit(1)
+    with open_streams(args) as (source, out):
+        stats = score_stream(scorer, source, out, args.batch_size, level_bits, history)
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ Scored {stats['scored']} tenants in {elapsed:.2f}s"
+          + (f" ({stats['errors']} errors)" if stats['errors'] else ""), file=sys.stderr)
+    if args.save_bits:
+        tenant_ids = [tenant_id for tenant_id, _ in level_bits]
+        save_level_bits(args.save_bits, tenant_ids, np.array([bits for _, bits in level_bits], dtype=np.uint16))
+        print(f"💾 Saved level bits for {len(tenant_ids)} tenants to {args.save_bits}", file=sys.stderr)
+    if history is not None:
+        segment = history.close()
+        print(f"🗂️  Appended scan {history.scanned_at} to {segment}", file=sys.stderr)
+    sys.exit(1 if stats['errors'] else 0)
+
+
+def cmd_ingest(args):
+    from result_ingest import ExportReader, detect_format
+
+    if args.batch_size < 1 or args.chunk_rows < 1:
+        print("❌ --batch-size and --chunk-rows must be at least 1", file=sys.stderr)
+        sys.exit(2)
+
+    start = time.perf_counter()
+    scorer = load_scorer(args.repo_root, args.cache)
+    reader = ExportReader(scorer, args.format or detect_format(args.input), args.chunk_rows)
+    try:
+        source = sys.stdin if args.input == '-' else open(args.input, 'r', newline='')
+    except OSError as e:
+        print(f"❌ Cannot read export {args.input}: {e.strerror}", file=sys.stderr)
+        sys.exit(1)
+    history = None
+    if args.history:
+        from history_store import HistoryStore
+        try:
+            history = HistoryStore(args.history).writer(scorer.ids, args.scanned_at)
+        except FileExistsError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            sys.exit(1)
+
+    out = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        for batch in reader.batches(source, args.batch_size, args.prefetch):
+            records = [{'tenant_id': tenant_id} for tenant_id in batch.tenant_ids]
+            for result in scorer.score_encoded(records, batch.codes, batch.failing, history):
+                out.write(json.dumps(result, separators=(',', ':')) + '\n')
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+
+    stats = reader.stats
+    elapsed = time.perf_counter() - start
+    print(f"✅ Scored {stats['tenants']} tenants from {stats['rows']} rows in {elapsed:.2f}s"
+          + (f" ({stats['errors']} bad rows)" if stats['errors'] else ""), file=sys.stderr)
+    for message in reader.error_messages:
+        print(f"   ERROR: {message}", file=sys.stderr)
+    if stats['unknown']:
+        print(f"⚠️  Skipped {stats['unknown']} rows for unknown risks/checks: "
+              f"{', '.join(reader.unknown_subjects)}", file=sys.stderr)
+    if history is not None:
+        segment = history.close()
+        print(f"🗂️  Appended scan {history.scanned_at} to {segment}", file=sys.stderr)
+    sys.exit(1 if stats['errors'] else 0)
+
+
+def cmd_query(args):
+    tenant_ids, packed = load_level_bits(args.bits)
+    domain = f"{args.domain}_security"
+    if args.has_blocker:
+        selected = has_blocker(packed, domain, args.level)
+    else:
+        selected = blocked_at(packed, domain, args.level)
+    for tenant_id in tenant_ids[selected]:
+        print(tenant_id)
+    print(f"✅ {int(selected.sum())} of {len(packed)} tenants", file=sys.stderr)
+
+
+def cmd_rescore(args):
+    from incremental_scoring import IncrementalScorer, ScoringMismatch
+
+    start = time.perf_counter()
+    incremental = IncrementalScorer(load_scorer(args.repo_root, args.cache), verify=args.verify)
+    states = {}
+    stats = {'scored': 0, 'errors': 0}
+    with open_streams(args) as (source, out):
+        for record, error in read_records(source):
+            if error is None:
+                tenant_id = record.get('tenant_id')
+                try:
+                    state = states.get(tenant_id)
+                    if state is None:
+                        state = states[tenant_id] = incremental.new_state(record)
+                        previous, levels = None, state.levels()
+                    else:
+                        previous = state.levels()
+                        levels = incremental.apply_delta(state, record)
+                except ScoringMismatch as e:
+                    print(f"❌ Verification failed: {e}", file=sys.stderr)
+                    sys.exit(1)
+                except ValueError as e:
+                    error = str(e)
+            if error is None:
+                result = {'tenant_id': tenant_id, **levels, 'changed': levels != previous}
+            else:
+                result = {'error': error}
+            stats['errors' if error else 'scored'] += 1
+            out.write(json.dumps(result, separators=(',', ':')) + '\n')
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ Rescored {stats['scored']} updates for {len(states)} tenants in {elapsed:.2f}s"
+          + (" (verified)" if args.verify else "")
+          + (f" ({stats['errors']} errors)" if stats['errors'] else ""), file=sys.stderr)
+    sys.exit(1 if stats['errors'] else 0)
+
+
+def cmd_whatif(args):
+    from what_if import WhatIfSimulator
+
+    source = sys.stdin if args.input == '-' else open(args.input, 'r')
+    with source:
+        record = json.load(source)
+    try:
+        simulator = WhatIfSimulator(load_scorer(args.repo_root, args.cache), record)
+    except ValueError as e:
+        print(f"❌ Invalid tenant record: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    fix_sets = []
+    if args.fix:
+        fix_sets.append([fix.strip() for value in args.fix for fix in value.split(',') if fix.strip()])
+    if args.fix_sets:
+        with open(args.fix_sets, 'r') as f:
+            fix_sets.extend(json.loads(line) for line in f if line.strip())
+
+    result = {'tenant_id': record.get('tenant_id'), 'baseline': simulator.baseline}
+    if args.target is not None:
+        result['required'] = simulator.blockers(args.target)
+    if fix_sets:
+        result['scenarios'] = [
+            {'fixes': fixes, **simulator.simulate(fixes), 'unknown': simulator.unknown(fixes)}
+            for fixes in fix_sets
+        ]
+    if args.rank:
+        result['single_fixes'] = simulator.rank_single_fixes()
+    print(json.dumps(result, indent=2))
+
+
+def _plan_one(planner, record: Dict, target: int) -> Dict:
+    try:
+        return planner.plan(record, target)
+    except ValueError as e:
+        return {'tenant_id': record.get('tenant_id'), 'error': str(e)}
+
+
+def cmd_plan(args):
+    from remediation_planner import RemediationPlanner
+
+    start = time.perf_counter()
+    checks = load_checks(Path(args.repo_root) / 'checks').values()
+    planner = RemediationPlanner(load_scorer(args.repo_root, args.cache), checks, args.exact_limit)
+    stats = {'planned': 0, 'unreachable': 0, 'errors': 0}
+    with open_streams(args) as (source, out):
+        records = read_records(source)
+        while True:
+            batch = list(islice(records, args.batch_size))
+            if not batch:
+                break
+            valid = [record for record, error in batch if error is None]
+            try:
+                planned = iter(planner.plan_batch(valid, args.target))
+            except ValueError:
+                # Isolate the offending records instead of failing the whole batch
+                planned = iter(_plan_one(planner, record, args.target) for record in valid)
+            for _, error in batch:
+                result = next(planned) if error is None else {'error': error}
+                if 'error' in result:
+                    stats['errors'] += 1
+                else:
+                    stats['planned' if result['reachable'] else 'unreachable'] += 1
+                out.write(json.dumps(result, separators=(',', ':')) + '\n')
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ Planned Level {args.target} for {stats['planned']} tenants in {elapsed:.2f}s"
+          + (f" ({stats['unreachable']} unreachable)" if stats['unreachable'] else "")
+          + (f" ({stats['errors']} errors)" if stats['errors'] else ""), file=sys.stderr)
+    sys.exit(1 if stats['errors'] else 0)
+
+
+def cmd_history(args):
+    from history_store import LEVEL_COLUMNS, MISSING_LEVEL, HistoryStore, first_failure
+
+    store = HistoryStore(args.store)
+    if args.check:
+        outcomes = store.outcome_history(args.tenant, args.check, args.start, args.end)
+        result = {
+            'tenant_id': args.tenant,
+            'check_id': args.check,
+            'first_failure': first_failure(outcomes, current_streak=False),
+            'failing_since': first_failure(outcomes),
+            'outcomes': outcomes,
+        }
+    else:
+        history = store.level_history([args.tenant], args.start, args.end)
+        result = {
+            'tenant_id': args.tenant,
+            'levels': [
+                {'scanned_at': scanned_at, **{f'{column}_level': int(history[column][0, s])
+                                              for column in LEVEL_COLUMNS}}
+                for s, scanned_at in enumerate(history['scanned_at'])
+                if history['overall'][0, s] != MISSING_LEVEL
+            ],
+        }
+    print(json.dumps(result, indent=2))
+
+
+def cmd_fleet(args):
+    from fleet_analytics import FleetRollup, catalog_platforms, load_rollup, rollup_stream, save_rollup
+
+    try:
+        percentiles = [float(p) for p in args.percentiles.split(',')]
+    except ValueError:
+        print(f"❌ Invalid --percentiles: {args.percentiles}", file=sys.stderr)
+        sys.exit(2)
+    if not args.input and not args.merge:
+        args.input = ['-']
+
+    platforms = catalog_platforms(load_checks(Path(args.repo_root) / 'checks').values())
+    rollup = FleetRollup(platforms)
+    for path in args.merge or []:
+        try:
+            rollup.merge(load_rollup(path, platforms))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"❌ Cannot merge {path}: {e}", file=sys.stderr)
+            sys.exit(1)
+    for path in args.input or []:
+        source = sys.stdin if path == '-' else open(path, 'r')
+        try:
+            records = (record if error is None else {'error': error} for record, error in read_records(source))
+            rollup.merge(rollup_stream(records, platforms, args.batch_size))
+        except ValueError as e:
+            print(f"❌ Cannot roll up {path}: {e}", file=sys.stderr)
+            sys.exit(1)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+
+    if args.save_rollup:
+        save_rollup(args.save_rollup, rollup)
+        print(f"💾 Saved rollup of {rollup.tenants} tenants to {args.save_rollup}", file=sys.stderr)
+    else:
+        print(json.dumps(rollup.report(percentiles, args.top), indent=2))
+
+
+def cmd_serve(args):
+    from scoring_service import serve
+
+    serve(args.repo_root, args.host, args.port, args.poll_interval, args.verbose)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='DRIVE maturity model tools')
+    parser.add_argument('--repo-root', default=str(REPO_ROOT), help='Repository root with checks/ and config/')
+    parser.add_argument('--no-cache', dest='cache', action='store_false',
+                        help='Compile the scoring tables instead of using the predicate cache')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    score = subparsers.add_parser('score', help='Score tenant 1Secure results (JSON Lines in, JSON Lines out)')
+    score.add_argument('input', nargs='?', default='-', help='Input JSONL file (default: stdin)')
+    score.add_argument('-o', '--output', default='-', help='Output JSONL file (default: stdout)')
+    score.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                       help=f'Tenants scored per batch (default: {DEFAULT_BATCH_SIZE})')
+    score.add_argument('--save-bits', metavar='FILE', help='Also save packed level bits (.npz) for drive.py query')
+    score.add_argument('--history', metavar='DIR', help='Append this scan to a history store')
+    score.add_argument('--scanned-at', help='Scan timestamp for --history (default: now, UTC ISO 8601)')
+    score.set_defaults(func=cmd_score)
+
+    ingest = subparsers.add_parser('ingest', help='Score a large 1Secure result export (CSV/NDJSON) in chunks')
+    ingest.add_argument('input', nargs='?', default='-', help='Export file, one result per row, rows grouped by tenant (default: stdin)')
+    ingest.add_argument('-o', '--output', default='-', help='Output JSONL file (default: stdout)')
+    ingest.add_argument('--format', choices=['csv', 'ndjson'], help='Export format (default: from the extension)')
+    ingest.add_argument('--chunk-rows', type=int, default=50000, help='Rows parsed per chunk (default: 50000)')
+    ingest.add_argument('--prefetch', type=int, default=2,
+                        help='Parsed chunks queued ahead of the scorer; 0 parses inline (default: 2)')
+    ingest.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'Most tenants scored per batch (default: {DEFAULT_BATCH_SIZE})')
+    ingest.add_argument('--history', metavar='DIR', help='Append this scan to a history store')
+    ingest.add_argument('--scanned-at', help='Scan timestamp for --history (default: now, UTC ISO 8601)')
+    ingest.set_defaults(func=cmd_ingest)
+
+    query = subparsers.add_parser('query', help='Filter tenants by blocked level using saved level bits')
+    query.add_argument('bits', help='Level bits file from score --save-bits')
+    query.add_argument('--domain', required=True, choices=['data', 'identity'], help='Domain to filter on')
+    query.add_argument('--level', type=int, required=True, choices=range(1, 6), help='Blocked level')
+    query.add_argument('--has-blocker', action='store_true',
+                       help='Match any blocker at the level, not just tenants stopped there')
+    query.set_defaults(func=cmd_query)
+
+    rescore = subparsers.add_parser('rescore', help='Rescore a stream of per-tenant deltas incrementally')
+    rescore.add_argument('input', nargs='?', default='-', help='Input JSONL file (default: stdin)')
+    rescore.add_argument('-o', '--output', default='-', help='Output JSONL file (default: stdout)')
+    rescore.add_argument('--verify', action='store_true', help='Check every update against a full recompute')
+    rescore.set_defaults(func=cmd_rescore)
+
+    whatif = subparsers.add_parser('whatif', help="Simulate fixes against one tenant's results")
+    whatif.add_argument('input', nargs='?', default='-', help='Tenant record JSON file (default: stdin)')
+    whatif.add_argument('--fix', action='append', help='Fix ID(s), comma-separated; repeat to add more')
+    whatif.add_argument('--fix-sets', help='JSONL file with one list of fix IDs per line')
+    whatif.add_argument('--target', type=int, choices=range(1, 6), help='List the blockers to clear for this level')
+    whatif.add_argument('--rank', action='store_true', help='Rank every single blocking fix')
+    whatif.set_defaults(func=cmd_whatif)
+
+    plan = subparsers.add_parser('plan', help='Cheapest remediation plan to reach a target overall level')
+    plan.add_argument('input', nargs='?', default='-', help='Input JSONL file (default: stdin)')
+    plan.add_argument('-o', '--output', default='-', help='Output JSONL file (default: stdout)')
+    plan.add_argument('--target', type=int, required=True, choices=range(1, 6), help='Target overall level')
+    plan.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                      help=f'Tenants planned per batch (default: {DEFAULT_BATCH_SIZE})')
+    plan.add_argument('--exact-limit', type=int, default=DEFAULT_EXACT_LIMIT,
+                      help=f'Solve exactly up to this many candidate fixes (default: {DEFAULT_EXACT_LIMIT})')
+    plan.set_defaults(func=cmd_plan)
+
+    history = subparsers.add_parser('history', help="Query a tenant's level trend or a check's failure history")
+    history.add_argument('store', help='History store directory (score --history)')
+    history.add_argument('--tenant', required=True, help='Tenant ID')
+    history.add_argument('--check', help='Risk or check ID; report when it started failing')
+    history.add_argument('--start', help='First scan date (YYYY-MM-DD)')
+    history.add_argument('--end', help='Last scan date (YYYY-MM-DD)')
+    history.set_defaults(func=cmd_history)
+
+    fleet = subparsers.add_parser('fleet', help='Fleet-wide level percentiles, failing-check and platform breakdowns')
+    fleet.add_argument('input', nargs='*', help='Scored JSONL file(s) from score (default: stdin)')
+    fleet.add_argument('--merge', action='append', metavar='FILE', help='Merge a saved rollup; repeat for shards')
+    fleet.add_argument('--save-rollup', metavar='FILE', help='Write the mergeable rollup instead of a report')
+    fleet.add_argument('--percentiles', default='10,25,50,75,90', help='Comma-separated percentiles to report')
+    fleet.add_argument('--top', type=int, default=10, help='Most commonly failing risks/checks to list (default: 10)')
+    fleet.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                       help=f'Records folded per batch (default: {DEFAULT_BATCH_SIZE})')
+    fleet.set_defaults(func=cmd_fleet)
+
+    serve = subparsers.add_parser('serve', help='Run the local HTTP scoring service with config hot-reload')
+    serve.add_argument('--host', default='127.0.0.1', help='Bind address (default: 127.0.0.1)')
+    serve.add_argument('--port', type=int, default=8765, help='Port (default: 8765)')
+    serve.add_argument('--poll-interval', type=float, default=1.0, help='Seconds between config checks (default: 1)')
+    serve.add_argument('--verbose', action='store_true', help='Log every request')
+    serve.set_defaults(func=cmd_serve)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
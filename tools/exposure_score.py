@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+DRIVE Exposure Score
+Vectorized 0-100 exposure score from scoring/scoring.yaml (requires numpy)
+
+For every (tenant, check) pair with an affected fraction f in [0, 1]:
+    factor    = 1 / (1 + exp(-k * (f - midpoint)))      # exposure_logistic
+    deduction = factor * severity_weight * category weight
+
+Deductions are summed per tenant and scoring category, capped at the
+category's max_points, and the score is 100 minus the capped total.
+
+Inputs are columnar: parallel arrays of tenant index, check column and
+affected fraction, so a fleet of pairs is scored with a handful of array
+operations (np.bincount does the per-category grouping).
+
+A check's scoring category is its 'scoring_category' field when present,
+otherwise derived from its ID (ES = external sharing, DE = data exposure)
+or catalog category; its severity weight is the highest severity among
+its level_thresholds.
+"""
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+import numpy as np
+import yaml
+
+SCORING_FILE = Path(__file__).resolve().parent.parent / 'scoring' / 'scoring.yaml'
+SCORE_MAX = 100.0
+DEFAULT_SCORING_CATEGORY = 'configuration'
+
+# Check ID segment -> scoring category key
+ID_SCORING_CATEGORIES = {
+    'ES': 'external_sharing',
+    'DE': 'sensitive_data_exposure',
+}
+
+# Catalog category -> scoring category key
+CATEGORY_SCORING_CATEGORIES = {
+    'Data Protection': 'sensitive_data_exposure',
+    'Data Discovery & Classification': 'classification',
+    'Access Control': 'access_hygiene',
+    'Identity': 'access_hygiene',
+    'Configuration': 'configuration',
+    'Compliance & Governance': 'configuration',
+}
+
+
+def load_scoring_config(path=SCORING_FILE) -> Dict:
+    """Load scoring/scoring.yaml"""
+    with open(path, 'r') as f:
+        return yaml.safe_load(f) or {}
+
+
+def scoring_category(check: Dict) -> str:
+    """Scoring category key for a catalog check"""
+    if check.get('scoring_category'):
+        return check['scoring_category']
+    for segment in str(check.get('check_id', '')).split('-'):
+        if segment in ID_SCORING_CATEGORIES:
+            return ID_SCORING_CATEGORIES[segment]
+    return CATEGORY_SCORING_CATEGORIES.get(check.get('category'), DEFAULT_SCORING_CATEGORY)
+
+
+def severity_weight(check: Dict, weights: Dict[str, float]) -> float:
+    """Highest severity weight among a check's level thresholds"""
+    severities = [str(t.get('severity', '')).lower() for t in check.get('level_thresholds') or []]
+    return max((weights.get(severity, 0) for severity in severities), default=0)
+
+
+class ExposureModel:
+    """Per-check category codes and deduction weights compiled from scoring.yaml"""
+
+    def __init__(self, ids: List[str], category_codes: np.ndarray, pair_weights: np.ndarray,
+                 category_keys: List[str], max_points: np.ndarray, k: float, midpoint: float):
+        self.ids = ids
+        self.index = {check_id: m for m, check_id in enumerate(ids)}
+        self.category_codes = category_codes
+        self.pair_weights = pair_weights
+        self.category_keys = category_keys
+        self.max_points = max_points
+        self.k = k
+        self.midpoint = midpoint
+
+    @property
+    def size(self) -> int:
+        return len(self.ids)
+
+
+def compile_exposure_model(checks: Iterable[Dict], config: Dict) -> ExposureModel:
+    """Compile catalog checks against scoring.yaml"""
+    categories = config.get('categories') or []
+    category_keys = [category['key'] for category in categories]
+    category_index = {key: c for c, key in enumerate(category_keys)}
+    weights = {str(k).lower(): float(v) for k, v in (config.get('severity_weight') or {}).items()}
+    logistic = config.get('exposure_logistic') or {}
+
+    checks = sorted(checks, key=lambda c: c['check_id'])
+    category_codes = np.zeros(len(checks), dtype=np.intp)
+    pair_weights = np.zeros(len(checks), dtype=np.float64)
+    for m, check in enumerate(checks):
+        key = scoring_category(check)
+        if key not in category_index:
+            raise ValueError(f"{check['check_id']}: unknown scoring category {key!r}")
+        c = category_index[key]
+        category_codes[m] = c
+        pair_weights[m] = severity_weight(check, weights) * float(categories[c].get('weight', 1.0))
+
+    return ExposureModel(
+        [check['check_id'] for check in checks], category_codes, pair_weights, category_keys,
+        np.array([float(category.get('max_points', 0)) for category in categories]),
+        float(logistic.get('k', 18)), float(logistic.get('midpoint', 0.15)),
+    )
+
+
+def exposure_factor(fractions: np.ndarray, k: float, midpoint: float) -> np.ndarray:
+    """Logistic exposure factor for affected fractions (clipped to [0, 1])"""
+    fractions = np.clip(np.asarray(fractions, dtype=np.float64), 0.0, 1.0)
+    return 1.0 / (1.0 + np.exp(-k * (fractions - midpoint)))
+
+
+def score_exposure(model: ExposureModel, tenants: np.ndarray, columns: np.ndarray,
+                   fractions: np.ndarray, tenant_count: int) -> Dict[str, np.ndarray]:
+    """Score (tenant, check column, affected fraction) pairs
+
+    Returns 'score' (tenant_count,) and 'deductions' (tenant_count,
+    categories) after capping at each category's max_points.
+    """
+    tenants = np.asarray(tenants, dtype=np.intp)
+    columns = np.asarray(columns, dtype=np.intp)
+    deductions = exposure_factor(fractions, model.k, model.midpoint) * model.pair_weights[columns]
+
+    category_count = len(model.category_keys)
+    cells = tenants * category_count + model.category_codes[columns]
+    totals = np.bincount(cells, weights=deductions, minlength=tenant_count * category_count)
+    capped = np.minimum(totals.reshape(tenant_count, category_count), model.max_points)
+    return {
+        'score': np.clip(SCORE_MAX - capped.sum(axis=1), 0.0, SCORE_MAX),
+        'deductions': capped,
+    }
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+DRIVE Fleet Analytics
+Streaming, mergeable rollups of scored tenants (requires numpy)
+
+A FleetRollup folds `drive.py score` output into fixed-size sketches:
+    levels      exact 0-5 histograms of overall, data and identity levels
+    exposure    fixed-bin histogram of exposure_score (0-100, 0.1 wide bins)
+    failing     tenants failing each risk/check ID (from "failing")
+    platforms   per catalog platform: tenants failing a check there,
+                failing checks and a histogram of those tenants' overall
+                levels
+
+"failing" lists every failing risk and check of a scored record, not
+just the "blocked_by" columns holding the tenant at its current level.
+
+Every sketch is a set of counters, so two rollups merge by addition and
+the result is identical to rolling up both inputs in one pass. Workers
+roll up their shard with --save-rollup and a final `--merge` combines the
+JSON files; no tenant record is kept in memory. Percentiles are exact for
+levels and within one bin width for the exposure score.
+
+Usage:
+    python3 tools/drive.py fleet scores.jsonl                          # Fleet report
+    python3 tools/drive.py fleet shard-1.jsonl --save-rollup shard-1.json
+    python3 tools/drive.py fleet --merge shard-1.json --merge shard-2.json
+"""
+import json
+from itertools import islice
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from maturity_engine import MAX_LEVEL
+
+ROLLUP_FORMAT = 1
+LEVEL_COLUMNS = ['overall', 'data', 'identity']
+DEFAULT_PERCENTILES = [10, 25, 50, 75, 90]
+EXPOSURE_BINS = 1000
+UNKNOWN_PLATFORM = 'Unknown'
+
+
+class HistogramSketch:
+    """Fixed-range histogram: mergeable counts with bounded quantile error"""
+
+    def __init__(self, lo: float, hi: float, bins: int, counts: Optional[np.ndarray] = None):
+        self.lo = float(lo)
+        self.hi = float(hi)
+        self.bins = int(bins)
+        self.counts = np.zeros(self.bins, dtype=np.int64) if counts is None else np.asarray(counts, dtype=np.int64)
+
+    @classmethod
+    def levels(cls) -> 'HistogramSketch':
+        """One bin per maturity level 0-5"""
+        return cls(0, MAX_LEVEL + 1, MAX_LEVEL + 1)
+
+    @classmethod
+    def exposure(cls) -> 'HistogramSketch':
+        return cls(0, 100, EXPOSURE_BINS)
+
+    @property
+    def width(self) -> float:
+        return (self.hi - self.lo) / self.bins
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+    def add(self, values):
+        """Count values, clipping them into [lo, hi]"""
+        values = np.asarray(values, dtype=np.float64)
+        bins = np.clip(((values - self.lo) / self.width).astype(np.int64), 0, self.bins - 1)
+        self.counts += np.bincount(bins, minlength=self.bins)
+
+    def merge(self, other: 'HistogramSketch') -> 'HistogramSketch':
+        if (self.lo, self.hi, self.bins) != (other.lo, other.hi, other.bins):
+            raise ValueError(f"Cannot merge histograms over [{self.lo}, {self.hi}]/{self.bins} "
+                             f"and [{other.lo}, {other.hi}]/{other.bins}")
+        self.counts += other.counts
+        return self
+
+    def quantiles(self, percentiles: Iterable[float]) -> List[Optional[float]]:
+        """Lower edge of the bin holding each percentile (None when empty)"""
+        percentiles = list(percentiles)
+        total = self.total
+        if not total:
+            return [None] * len(percentiles)
+        cumulative = np.cumsum(self.counts)
+        ranks = np.maximum(np.ceil(np.asarray(percentiles, dtype=np.float64) / 100 * total), 1)
+        bins = np.searchsorted(cumulative, ranks)
+        return [round(self.lo + int(b) * self.width, 6) for b in bins]
+
+    def to_dict(self) -> Dict:
+        return {'lo': self.lo, 'hi': self.hi, 'bins': self.bins, 'counts': self.counts.tolist()}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'HistogramSketch':
+        return cls(data['lo'], data['hi'], data['bins'], data['counts'])
+
+
+class FleetRollup:
+    """Level, exposure, failing-check and per-platform sketches for a set of scored tenants"""
+
+    def __init__(self, platforms: Optional[Dict[str, str]] = None):
+        self.platforms = platforms or {}
+        self.tenants = 0
+        self.errors = 0
+        self.levels = {column: HistogramSketch.levels() for column in LEVEL_COLUMNS}
+        self.exposure = HistogramSketch.exposure()
+        self.failing: Dict[str, int] = {}
+        self.platform_tenants: Dict[str, int] = {}
+        self.platform_failing: Dict[str, int] = {}
+        self.platform_levels: Dict[str, HistogramSketch] = {}
+
+    def platform(self, column_id: str) -> str:
+        return self.platforms.get(column_id, UNKNOWN_PLATFORM)
+
+    def add(self, results: List[Dict]):
+        """Fold a batch of scored records; records with an "error" are only counted"""
+        scored = [result for result in results if 'error' not in result]
+        for result in scored:
+            if not isinstance(result.get('failing'), list):
+                raise ValueError(f"Scored record for {result.get('tenant_id')} has no \"failing\" list "
+                                 f"(re-score it with drive.py score)")
+        self.errors += len(results) - len(scored)
+        if not scored:
+            return
+        self.tenants += len(scored)
+        for column in LEVEL_COLUMNS:
+            self.levels[column].add([result[f'{column}_level'] for result in scored])
+        self.exposure.add([result['exposure_score'] for result in scored if 'exposure_score' in result])
+
+        for result in scored:
+            hits: Dict[str, int] = {}
+            for column_id in set(result['failing']):
+                self.failing[column_id] = self.failing.get(column_id, 0) + 1
+                platform = self.platform(column_id)
+                hits[platform] = hits.get(platform, 0) + 1
+            for platform, count in hits.items():
+                self.platform_tenants[platform] = self.platform_tenants.get(platform, 0) + 1
+                self.platform_failing[platform] = self.platform_failing.get(platform, 0) + count
+                if platform not in self.platform_levels:
+                    self.platform_levels[platform] = HistogramSketch.levels()
+                self.platform_levels[platform].counts[result['overall_level']] += 1
+
+    def merge(self, other: 'FleetRollup') -> 'FleetRollup':
+        self.tenants += other.tenants
+        self.errors += other.errors
+        for column in LEVEL_COLUMNS:
+            self.levels[column].merge(other.levels[column])
+        self.exposure.merge(other.exposure)
+        for mine, theirs in ((self.failing, other.failing),
+                             (self.platform_tenants, other.platform_tenants),
+                             (self.platform_failing, other.platform_failing)):
+            for key, count in theirs.items():
+                mine[key] = mine.get(key, 0) + count
+        for platform, sketch in other.platform_levels.items():
+            if platform in self.platform_levels:
+                self.platform_levels[platform].merge(sketch)
+            else:
+                self.platform_levels[platform] = HistogramSketch.from_dict(sketch.to_dict())
+        return self
+
+    def to_dict(self) -> Dict:
+        return {
+            'format': ROLLUP_FORMAT,
+            'tenants': self.tenants,
+            'errors': self.errors,
+            'levels': {column: sketch.to_dict() for column, sketch in self.levels.items()},
+            'exposure': self.exposure.to_dict(),
+            'failing': self.failing,
+            'platform_tenants': self.platform_tenants,
+            'platform_failing': self.platform_failing,
+            'platform_levels': {platform: sketch.to_dict() for platform, sketch in self.platform_levels.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict, platforms: Optional[Dict[str, str]] = None) -> 'FleetRollup':
+        if data.get('format') != ROLLUP_FORMAT:
+            raise ValueError(f"Unsupported rollup format: {data.get('format')}")
+        rollup = cls(platforms)
+        rollup.tenants = data['tenants']
+        rollup.errors = data['errors']
+        rollup.levels = {column: HistogramSketch.from_dict(data['levels'][column]) for column in LEVEL_COLUMNS}
+        rollup.exposure = HistogramSketch.from_dict(data['exposure'])
+        rollup.failing = dict(data['failing'])
+        rollup.platform_tenants = dict(data['platform_tenants'])
+        rollup.platform_failing = dict(data['platform_failing'])
+        rollup.platform_levels = {platform: HistogramSketch.from_dict(sketch)
+                                  for platform, sketch in data['platform_levels'].items()}
+        return rollup
+
+    def report(self, percentiles: Iterable[float] = DEFAULT_PERCENTILES, top: int = 10) -> Dict:
+        """Fleet summary in the shape of aggregate_checks' by_* counters"""
+        percentiles = list(percentiles)
+
+        def percentile_map(sketch: HistogramSketch) -> Dict[str, Optional[float]]:
+            return {f'p{p:g}': value for p, value in zip(percentiles, sketch.quantiles(percentiles))}
+
+        report = {
+            'total_tenants': self.tenants,
+            'errors': self.errors,
+            'by_level': {
+                column: {f'Level {level}': int(count) for level, count in enumerate(sketch.counts) if count}
+                for column, sketch in self.levels.items()
+            },
+            'percentiles': {f'{column}_level': percentile_map(sketch) for column, sketch in self.levels.items()},
+            'by_platform': {
+                platform: {
+                    'tenants_failing': self.platform_tenants[platform],
+                    'failing_checks': self.platform_failing[platform],
+                    'median_overall_level': self.platform_levels[platform].quantiles([50])[0],
+                }
+                for platform in sorted(self.platform_tenants)
+            },
+            'top_failing': [
+                {'id': column_id, 'platform': self.platform(column_id), 'tenants': count}
+                for column_id, count in sorted(self.failing.items(),
+                                               key=lambda item: (-item[1], item[0]))[:top]
+            ],
+        }
+        if self.exposure.total:
+            report['percentiles']['exposure_score'] = percentile_map(self.exposure)
+        return report
+
+
+def catalog_platforms(checks: Iterable[Dict]) -> Dict[str, str]:
+    """check_id -> platform for every catalog check (1S-* risks share their check's ID)"""
+    return {check['check_id']: check.get('platform') or UNKNOWN_PLATFORM for check in checks if check.get('check_id')}
+
+
+def rollup_stream(records: Iterable[Dict], platforms: Optional[Dict[str, str]] = None,
+                  batch_size: int = 1000) -> FleetRollup:
+    """Roll up scored records, holding at most batch_size of them at a time"""
+    rollup = FleetRollup(platforms)
+    records = iter(records)
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            return rollup
+        rollup.add(batch)
+
+
+def load_rollup(path, platforms: Optional[Dict[str, str]] = None) -> FleetRollup:
+    with open(path, 'r') as f:
+        return FleetRollup.from_dict(json.load(f), platforms)
+
+
+def save_rollup(path, rollup: FleetRollup):
+    with open(path, 'w') as f:
+        json.dump(rollup.to_dict(), f, separators=(',', ':'))
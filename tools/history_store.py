@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+DRIVE History Store
+Append-only columnar store of scan results for trends (requires numpy)
+
+Layout (one directory per scan date, one segment per scan):
+    history/
+      dictionary.json                  tenant and column IDs -> integer codes
+      scans.jsonl                      manifest, one line per committed segment
+      date=2026-10-17/
+        scan-20261017T083000Z/
+          tenant.bin                   uint32 tenant codes, sorted
+          levels.bin                   uint8 overall levels, then data, then identity
+          cell_offset.bin              uint32 (rows + 1) start of each tenant's cells
+          cell_column.bin              uint16 column code (risk_id / check_id)
+          cell_level.bin               uint8 blocked level (> 0)
+
+Only blocking cells are stored (grouped by tenant, sorted by column), so a
+scan costs a few bytes per failing outcome. Columns are raw little-endian
+arrays with the dtypes in COLUMN_DTYPES; the manifest carries the row and
+cell counts, so readers need no per-segment metadata and read a single
+tenant's cells with one offset read.
+
+Segments are written to a temporary directory and renamed into place, then
+listed in scans.jsonl; nothing is rewritten except dictionary.json, which
+only grows. A trend for thousands of tenants over a year of daily scans
+reads two small files per scan.
+
+Usage:
+    python3 tools/drive.py score tenants.jsonl --history history/ > scores.jsonl
+    python3 tools/drive.py history history/ --tenant t-001 [--check AD-001]
+"""
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+DICTIONARY_FILE = 'dictionary.json'
+MANIFEST_FILE = 'scans.jsonl'
+MISSING_LEVEL = 255  # Tenant absent from a scan
+LEVEL_COLUMNS = ['overall', 'data', 'identity']
+COLUMN_DTYPES = {
+    'tenant': np.dtype('<u4'),
+    'levels': np.dtype('u1'),
+    'cell_offset': np.dtype('<u4'),
+    'cell_column': np.dtype('<u2'),
+    'cell_level': np.dtype('u1'),
+}
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _segment_name(scanned_at: str) -> str:
+    return 'scan-' + scanned_at.replace('-', '').replace(':', '')
+
+
+def _read_column(segment: Path, name: str, offset: int = 0, count: int = -1) -> np.ndarray:
+    dtype = COLUMN_DTYPES[name]
+    return np.fromfile(segment / f'{name}.bin', dtype=dtype, offset=offset * dtype.itemsize, count=count)
+
+
+class HistoryStore:
+    """Columnar scan history under one root directory"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self._dictionary = None
+
+    # -- dictionary ---------------------------------------------------------
+
+    def dictionary(self) -> Dict[str, List[str]]:
+        if self._dictionary is None:
+            path = self.root / DICTIONARY_FILE
+            if path.exists():
+                with open(path, 'r') as f:
+                    self._dictionary = json.load(f)
+            else:
+                self._dictionary = {'tenants': [], 'columns': []}
+            self._codes = {kind: {value: code for code, value in enumerate(values)}
+                           for kind, values in self._dictionary.items()}
+        return self._dictionary
+
+    def code(self, kind: str, value, create: bool = False) -> Optional[int]:
+        """Integer code for a tenant or column ID (optionally assigning one)"""
+        self.dictionary()
+        value = str(value)
+        code = self._codes[kind].get(value)
+        if code is None and create:
+            code = self._codes[kind][value] = len(self._dictionary[kind])
+            self._dictionary[kind].append(value)
+        return code
+
+    def _save_dictionary(self):
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix='.dictionary-', suffix='.json')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self._dictionary, f, separators=(',', ':'))
+        os.replace(tmp, self.root / DICTIONARY_FILE)
+
+    # -- writing ------------------------------------------------------------
+
+    def writer(self, column_ids: List[str], scanned_at: Optional[str] = None) -> 'ScanWriter':
+        """Start a scan; column_ids name the columns of the blocked arrays passed to add()"""
+        return ScanWriter(self, column_ids, scanned_at or _utc_now())
+
+    # -- reading ------------------------------------------------------------
+
+    def scans(self, start: Optional[str] = None, end: Optional[str] = None) -> List[Dict]:
+        """Manifest entries in chronological order, optionally within [start, end] dates"""
+        path = self.root / MANIFEST_FILE
+        if not path.exists():
+            return []
+        scans = []
+        with open(path, 'r') as f:
+            for line in f:
+                scan = json.loads(line)
+                date = scan['scanned_at'][:10]
+                if (start and date < start[:10]) or (end and date > end[:10]):
+                    continue
+                scans.append(scan)
+        scans.sort(key=lambda scan: scan['scanned_at'])
+        return scans
+
+    def level_history(self, tenant_ids: Iterable, start: Optional[str] = None,
+                      end: Optional[str] = None) -> Dict:
+        """Levels per scan for many tenants
+
+        Returns 'scanned_at' (S,) and 'overall'/'data'/'identity' (T, S) uint8
+        arrays, MISSING_LEVEL where the tenant was not in a scan.
+        """
+        tenant_ids = [str(t) for t in tenant_ids]
+        codes = [self.code('tenants', t) for t in tenant_ids]
+        known = np.array([code is not None for code in codes], dtype=bool)
+        codes = np.array([code or 0 for code in codes], dtype=COLUMN_DTYPES['tenant'])
+        scans = self.scans(start, end)
+        levels = np.full((len(LEVEL_COLUMNS), len(scans), len(tenant_ids)), MISSING_LEVEL, dtype=np.uint8)
+
+        # Sorted lookups are cache-friendly, and consecutive scans of a stable
+        # fleet usually share the same tenant column, so positions are reused
+        order = np.argsort(codes, kind='stable')
+        codes, known = codes[order], known[order]
+        previous = None
+        for s, scan in enumerate(scans):
+            if not scan['rows']:
+                continue
+            segment = self.root / scan['segment']
+            tenants = _read_column(segment, 'tenant')
+            if previous is None or not np.array_equal(tenants, previous):
+                positions = np.minimum(np.searchsorted(tenants, codes), len(tenants) - 1)
+                found = known & (tenants[positions] == codes)
+                selected, targets = positions[found], order[found]
+                previous = tenants
+            values = _read_column(segment, 'levels').reshape(len(LEVEL_COLUMNS), -1)
+            levels[:, s, targets] = values[:, selected]
+
+        history = {'tenant_ids': tenant_ids, 'scanned_at': [scan['scanned_at'] for scan in scans]}
+        for c, column in enumerate(LEVEL_COLUMNS):
+            history[column] = np.ascontiguousarray(levels[c].T)
+        return history
+
+    def outcome_history(self, tenant_id, column_id, start: Optional[str] = None,
+                        end: Optional[str] = None) -> List[Dict]:
+        """Per scan with the tenant present: the column's blocked level (0 = passing)"""
+        tenant = self.code('tenants', tenant_id)
+        column = self.code('columns', column_id)
+        if tenant is None:
+            return []
+
+        outcomes = []
+        for scan in self.scans(start, end):
+            segment = self.root / scan['segment']
+            tenants = _read_column(segment, 'tenant')
+            row = int(np.searchsorted(tenants, tenant))
+            if row >= len(tenants) or tenants[row] != tenant:
+                continue
+            level = 0
+            if column is not None:
+                lo, hi = (int(x) for x in _read_column(segment, 'cell_offset', row, 2))
+                columns = _read_column(segment, 'cell_column', lo, hi - lo)
+                hit = int(np.searchsorted(columns, column))
+                if hit < len(columns) and columns[hit] == column:
+                    level = int(_read_column(segment, 'cell_level', lo + hit, 1)[0])
+            outcomes.append({'scanned_at': scan['scanned_at'], 'blocked_level': level})
+        return outcomes
+
+    def first_failure(self, tenant_id, column_id, current_streak: bool = True) -> Optional[str]:
+        """When a risk/check started failing for a tenant (see first_failure())"""
+        return first_failure(self.outcome_history(tenant_id, column_id), current_streak)
+
+
+def first_failure(outcomes: List[Dict], current_streak: bool = True) -> Optional[str]:
+    """Scan time a column started failing, from outcome_history() results
+
+    With current_streak, the start of the failing run that includes the
+    latest scan (None if it passes now); otherwise the first failure ever.
+    """
+    if not current_streak:
+        return next((o['scanned_at'] for o in outcomes if o['blocked_level']), None)
+    started = None
+    for outcome in reversed(outcomes):
+        if not outcome['blocked_level']:
+            break
+        started = outcome['scanned_at']
+    return started
+
+
+class ScanWriter:
+    """Collects scored batches for one scan and writes them as a segment"""
+
+    def __init__(self, store: HistoryStore, column_ids: List[str], scanned_at: str):
+        self.store = store
+        self.scanned_at = scanned_at
+        self.target = store.root / f"date={scanned_at[:10]}" / _segment_name(scanned_at)
+        if self.target.exists():
+            raise FileExistsError(f"A scan at {scanned_at} is already stored: {self.target}")
+        self.column_codes = np.array([store.code('columns', c, create=True) for c in column_ids], dtype=np.uint16)
+        self._tenants = []
+        self._levels = []
+        self._cells = {name: [] for name in ('row', 'column', 'level')}
+        self._row_count = 0
+        self._seen: Set[int] = set()
+
+    def add(self, records: List[Dict], blocked: np.ndarray, levels: Dict[str, np.ndarray]):
+        """Append a batch: tenant records, their (N, M) blocked levels and levels
+
+        Raises ValueError, adding nothing, when a tenant is already in this
+        scan, so callers can report that record and keep the rest.
+        """
+        tenants = np.array([self.store.code('tenants', r.get('tenant_id'), create=True) for r in records],
+                           dtype=np.uint32)
+        codes = tenants.tolist()
+        if len(set(codes)) != len(codes) or not self._seen.isdisjoint(codes):
+            duplicate = next(c for n, c in enumerate(codes) if c in self._seen or c in codes[:n])
+            raise ValueError(f"Tenant {self.store.dictionary()['tenants'][duplicate]} appears twice in one scan")
+        self._seen.update(codes)
+        self._tenants.append(tenants)
+        self._levels.append(np.vstack([np.asarray(levels[f'{column}_level'], dtype=np.uint8)
+                                       for column in LEVEL_COLUMNS]))
+        rows, columns = np.nonzero(blocked)
+        self._cells['row'].append(rows + self._row_count)
+        self._cells['column'].append(self.column_codes[columns])
+        self._cells['level'].append(blocked[rows, columns].astype(np.uint8))
+        self._row_count += len(records)
+
+    def close(self) -> Path:
+        """Sort, write the segment atomically, list it in the manifest and return its path"""
+        store = self.store
+        tenants = np.concatenate(self._tenants) if self._tenants else np.zeros(0, dtype=np.uint32)
+        levels = (np.hstack(self._levels) if self._levels
+                  else np.zeros((len(LEVEL_COLUMNS), 0), dtype=np.uint8))
+        cells = {name: np.concatenate(parts) if parts else np.zeros(0, dtype=np.intp)
+                 for name, parts in self._cells.items()}
+
+        order = np.argsort(tenants, kind='stable')
+        sorted_tenants = tenants[order]
+        duplicates = sorted_tenants[1:][sorted_tenants[1:] == sorted_tenants[:-1]]
+        if len(duplicates):
+            raise ValueError(f"Tenant {store.dictionary()['tenants'][duplicates[0]]} appears twice in one scan")
+
+        # Renumber cell rows to sorted tenant order and group cells by row. A
+        # 1S-* check shares its ID (and column code) with the mirrored risk;
+        # keep the lowest blocked level for each ID.
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        cell_rows = rank[cells['row']]
+        cell_order = np.lexsort((cells['level'], cells['column'], cell_rows))
+        cell_rows, cell_columns = cell_rows[cell_order], cells['column'][cell_order]
+        # An all-passing scan has no cells; the mask must stay empty too.
+        first = np.ones(len(cell_rows), dtype=bool)
+        first[1:] = (cell_rows[1:] != cell_rows[:-1]) | (cell_columns[1:] != cell_columns[:-1])
+        cell_order = cell_order[first]
+        columns = {
+            'tenant': sorted_tenants,
+            'levels': levels[:, order],
+            'cell_offset': np.searchsorted(cell_rows[first], np.arange(len(order) + 1)),
+            'cell_column': cell_columns[first],
+            'cell_level': cells['level'][cell_order],
+        }
+
+        partition = self.target.parent
+        partition.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(dir=partition, prefix='.scan-'))
+        for name, values in columns.items():
+            values.astype(COLUMN_DTYPES[name]).tofile(tmp / f'{name}.bin')
+
+        store._save_dictionary()
+        if self.target.exists():
+            shutil.rmtree(tmp)
+            raise FileExistsError(f"A scan at {self.scanned_at} is already stored: {self.target}")
+        os.rename(tmp, self.target)
+        with open(store.root / MANIFEST_FILE, 'a') as f:
+            f.write(json.dumps({
+                'scanned_at': self.scanned_at,
+                'segment': self.target.relative_to(store.root).as_posix(),
+                'rows': int(len(order)),
+                'cells': int(len(cell_order)),
+            }) + '\n')
+        return self.target
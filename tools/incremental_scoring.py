@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+DRIVE Incremental Rescoring
+Keeps per-tenant scoring state so a scan that changes a few 1Secure risks
+(or check results) is rescored in O(changed columns) instead of O(all)
+
+A TenantState holds the blocked level of every column (bytearray, 0 = not
+blocking) and, per domain, a count of columns blocking each level 1-5. A
+delta moves one column between count buckets; the domain level is the
+first non-empty bucket minus one (5 when all are empty), and the overall
+level is MIN(data, identity), exactly as maturity_engine.score_blocked.
+
+With verify=True each state also keeps the merged tenant record, and
+every update is checked against a full recompute from that record.
+"""
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from maturity_engine import DOMAINS, MAX_LEVEL, check_results, is_failing, risk_results, score_blocked
+
+LEVEL_KEYS = {'data_security': 'data_level', 'identity_security': 'identity_level'}
+
+
+class ScoringMismatch(AssertionError):
+    """Incremental levels differ from a full recompute"""
+
+
+class TenantState:
+    """Blocked level per column plus per-domain counters of blocked levels"""
+
+    __slots__ = ('tenant_id', 'blocked', 'counts', 'record')
+
+    def __init__(self, tenant_id, blocked: bytearray, counts: Dict[str, List[int]], record: Optional[Dict] = None):
+        self.tenant_id = tenant_id
+        self.blocked = blocked
+        self.counts = counts
+        self.record = record
+
+    def levels(self) -> Dict[str, int]:
+        return levels_from_counts(self.counts)
+
+
+def levels_from_counts(counts: Dict[str, List[int]]) -> Dict[str, int]:
+    """Domain and overall levels from per-domain counts of blocked levels"""
+    levels = {}
+    for domain in DOMAINS:
+        domain_counts = counts[domain]
+        levels[LEVEL_KEYS[domain]] = next(
+            (level - 1 for level in range(1, MAX_LEVEL + 1) if domain_counts[level]), MAX_LEVEL
+        )
+    levels['overall_level'] = min(levels.values())
+    return levels
+
+
+class IncrementalScorer:
+    """Applies risk/check deltas to TenantStates built from a drive.TenantScorer"""
+
+    def __init__(self, scorer, verify: bool = False):
+        self.scorer = scorer
+        self.verify = verify
+        risk_model = scorer.risk_model
+        check_model = scorer.check_model
+        self.check_offset = risk_model.size
+        # Domains each column belongs to, as plain lists for the hot path
+        self.column_domains = [
+            [domain for domain in DOMAINS if scorer.domain_masks[domain][m]]
+            for m in range(len(scorer.ids))
+        ]
+        self.block_table = risk_model.block_table.tolist()
+        self.check_levels = check_model.min_levels.tolist()
+
+    def new_state(self, record: Dict) -> TenantState:
+        """Full score of a tenant record, kept as incremental state"""
+        blocked = bytearray(self.scorer.blocked_levels([record])[0].tobytes())
+        counts = {domain: [0] * (MAX_LEVEL + 1) for domain in DOMAINS}
+        for m, level in enumerate(blocked):
+            if level:
+                for domain in self.column_domains[m]:
+                    counts[domain][level] += 1
+        state = TenantState(record.get('tenant_id'), blocked, counts)
+        if self.verify:
+            state.record = {'tenant_id': state.tenant_id, 'risks': {}, 'checks': {}}
+            _merge(state.record, record)
+        return state
+
+    def apply_delta(self, state: TenantState, delta: Dict) -> Dict[str, int]:
+        """Apply {"risks": {...}, "checks": {...}} changes and return the new levels
+
+        Every change is resolved before the state is touched, so a delta
+        that raises ValueError leaves the state as it was.
+        """
+        updates = []
+        for risk_id, result in risk_results(delta.get('risks')):
+            m = self.scorer.risk_model.index.get(risk_id)
+            if m is not None:
+                updates.append((m, self.block_table[m][self.scorer.risk_code(risk_id, result)]))
+        for check_id, status in check_results(delta.get('checks')):
+            m = self.scorer.check_model.index.get(check_id)
+            if m is not None:
+                updates.append((self.check_offset + m, self.check_levels[m] if is_failing(status) else 0))
+        for column, level in updates:
+            self._set(state, column, level)
+
+        levels = state.levels()
+        if self.verify:
+            _merge(state.record, delta)
+            self.check(state, levels)
+        return levels
+
+    def _set(self, state: TenantState, column: int, level: int):
+        old = state.blocked[column]
+        if old == level:
+            return
+        for domain in self.column_domains[column]:
+            counts = state.counts[domain]
+            if old:
+                counts[old] -= 1
+            if level:
+                counts[level] += 1
+        state.blocked[column] = level
+
+    def check(self, state: TenantState, levels: Optional[Dict[str, int]] = None):
+        """Raise ScoringMismatch unless the state equals a full recompute
+
+        Compares the blocked levels and domain/overall levels against
+        TenantScorer on the merged record (verify mode) or against
+        score_blocked on the state's own blocked levels.
+        """
+        levels = levels or state.levels()
+        if state.record is not None:
+            blocked = self.scorer.blocked_levels([state.record])
+            if blocked[0].tobytes() != bytes(state.blocked):
+                raise ScoringMismatch(f"{state.tenant_id}: blocked levels differ from a full recompute")
+        else:
+            blocked = np.frombuffer(bytes(state.blocked), dtype=np.uint8).reshape(1, -1)
+        full = {key: int(value[0]) for key, value in score_blocked(blocked, self.scorer.domain_masks).items()}
+        if full != levels:
+            raise ScoringMismatch(f"{state.tenant_id}: incremental {levels} != full recompute {full}")
+
+
+def _merge(record: Dict, delta: Dict):
+    """Fold a delta into a normalized {"risks": {...}, "checks": {...}} record"""
+    record['risks'].update(risk_results(delta.get('risks')))
+    record['checks'].update(check_results(delta.get('checks')))
@@ -3,12 +3,13 @@
 Map 1Secure risks to DRIVE catalog checks and generate integration analysis.
 """
 
-import os
-import yaml
 import csv
 import json
 from collections import defaultdict
 
+from catalog_cache import load_checks
+from pipeline_trace import enable as enable_tracing, span
+
 # 1Secure risk mappings to DRIVE check IDs
 MAPPINGS = {
     # Data Category (SharePoint/OneDrive)
@@ -71,15 +72,8 @@ MAPPINGS = {
 }
 
 def load_drive_checks(checks_dir='checks'):
-    """Load all DRIVE checks from YAML files."""
-    checks = {}
-    for filename in os.listdir(checks_dir):
-        if filename.endswith('.yaml'):
-            filepath = os.path.join(checks_dir, filename)
-            with open(filepath, 'r') as f:
-                check = yaml.safe_load(f)
-                checks[check['check_id']] = check
-    return checks
+    """Load all DRIVE checks from the compiled catalog snapshot."""
+    return load_checks(checks_dir)
 
 def load_1secure_risks(csv_path='analysis/1secure_risks.csv'):
     """Load 1Secure risks from CSV."""
@@ -235,26 +229,39 @@ def generate_integration_data(mappings, drive_checks):
     return integration_data
 
 def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Map 1Secure risks to DRIVE checks')
+    parser.add_argument('--trace', metavar='FILE',
+                        help='Write a Chrome trace of per-stage timings (plus a .summary.json)')
+    args = parser.parse_args()
+
+    if args.trace:
+        enable_tracing(args.trace)
+
     print("Loading DRIVE checks...")
     drive_checks = load_drive_checks()
     print(f"Loaded {len(drive_checks)} DRIVE checks")
 
     print("\nLoading 1Secure risks...")
-    secure_risks = load_1secure_risks()
+    with span('load_1secure_risks'):
+        secure_risks = load_1secure_risks()
     print(f"Loaded {len(secure_risks)} 1Secure risks")
 
     print("\nGenerating mapping report...")
-    report = generate_mapping_report(MAPPINGS, drive_checks, secure_risks)
+    with span('mapping_report'):
+        report = generate_mapping_report(MAPPINGS, drive_checks, secure_risks)
 
-    with open('analysis/1secure_mapping_report.md', 'w') as f:
-        f.write(report)
+        with open('analysis/1secure_mapping_report.md', 'w') as f:
+            f.write(report)
     print("Report saved to: analysis/1secure_mapping_report.md")
 
     print("\nGenerating integration data...")
-    integration_data = generate_integration_data(MAPPINGS, drive_checks)
+    with span('integration_json'):
+        integration_data = generate_integration_data(MAPPINGS, drive_checks)
 
-    with open('analysis/1secure_integration.json', 'w') as f:
-        json.dump(integration_data, f, indent=2)
+        with open('analysis/1secure_integration.json', 'w') as f:
+            json.dump(integration_data, f, indent=2)
     print("Integration data saved to: analysis/1secure_integration.json")
 
     # Print summary
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+DRIVE Maturity Scoring Engine
+Vectorized binary-advancement scoring for many tenants at once (requires numpy)
+
+Implements calculate_drive_maturity / calculate_domain_level from
+docs/1SECURE_INTEGRATION_PRD.md over whole fleets:
+
+- Every tenant x column (1Secure risk or DRIVE check) is reduced to the
+  maturity level it blocks (0 = not blocking), giving an (N, M) uint8 array.
+- A domain's level is one below the lowest blocked level among its columns,
+  or 5 when nothing blocks.
+- The overall level is MIN(data_security, identity_security).
+
+Blocked levels are reduced to a 5-bit mask per domain (bit L-1 set when
+some column blocks level L), packed into one uint16 per tenant (data in
+bits 0-4, identity in bits 5-9). A domain's level is the index of its
+lowest set bit (a 32-entry lookup table), and fleet queries such as "all
+tenants blocked at Level 2 by Identity" are bitwise filters on the packed
+array, which save_level_bits/load_level_bits persist.
+
+Risk models come from config/1secure_maturity_mapping.yaml (maturity_blocks
+per 1Secure severity, domains by category). Check models come from the
+catalog (a failing check blocks its lowest level_thresholds level, domains
+by DRIVE pillar).
+"""
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import yaml
+
+from threshold_bands import compile_config_classifiers
+
+MAX_LEVEL = 5
+NOT_BLOCKED = MAX_LEVEL + 1  # Sentinel for "no blocked level" in reductions
+
+# 1Secure severity bands; the code is the index (0 = passing, no band hit)
+SEVERITIES = ['Passing', 'Low', 'Medium', 'High']
+SEVERITY_CODES = {name.lower(): code for code, name in enumerate(SEVERITIES)}
+SEVERITY_CODES.update({'none': 0, 'pass': 0, 'no risk': 0, '': 0})
+FAILING_STATUSES = {'fail', 'failed', 'failing', 'false', '0', 'no'}
+
+DOMAINS = ['data_security', 'identity_security']
+
+# Bit for each blocked level (index 0 = not blocking)
+LEVEL_BITS = np.array([0] + [1 << (level - 1) for level in range(1, MAX_LEVEL + 1)], dtype=np.uint8)
+# Domain level for each 5-bit mask: index of the lowest set bit, or 5 when empty
+DOMAIN_LEVEL_BY_BITS = np.array(
+    [MAX_LEVEL] + [(bits & -bits).bit_length() - 1 for bits in range(1, 1 << MAX_LEVEL)], dtype=np.uint8
+)
+DOMAIN_BIT_OFFSETS = {'data_security': 0, 'identity_security': MAX_LEVEL}
+DOMAIN_BITS = (1 << MAX_LEVEL) - 1
+RISK_SECTIONS = ['data_risks', 'identity_risks', 'infrastructure_risks']
+MATURITY_MAPPING_FILE = Path(__file__).resolve().parent.parent / 'config' / '1secure_maturity_mapping.yaml'
+
+
+def load_maturity_config(path=MATURITY_MAPPING_FILE) -> Dict:
+    """Load config/1secure_maturity_mapping.yaml"""
+    with open(path, 'r') as f:
+        return yaml.safe_load(f) or {}
+
+
+class BlockerModel:
+    """Columns that can block maturity levels, with their domain membership"""
+
+    def __init__(self, ids: List[str], domain_masks: Dict[str, np.ndarray]):
+        self.ids = list(ids)
+        self.index = {column_id: i for i, column_id in enumerate(self.ids)}
+        self.domain_masks = domain_masks
+
+    @property
+    def size(self) -> int:
+        return len(self.ids)
+
+
+class RiskModel(BlockerModel):
+    """1Secure risks compiled from maturity_blocks
+
+    block_table[m, severity_code] is the level risk m blocks at that
+    severity (0 = does not block). classifiers maps risk_id to the compiled
+    1secure_thresholds bands for classifying raw measured values.
+    """
+
+    def __init__(self, ids, domain_masks, block_table: np.ndarray, risks: List[Dict],
+                 classifiers: Optional[Dict] = None):
+        super().__init__(ids, domain_masks)
+        self.block_table = block_table
+        self.risks = risks
+        self.classifiers = classifiers or {}
+        self._columns = np.arange(len(ids))
+
+    def blocked_levels(self, severity_codes: np.ndarray) -> np.ndarray:
+        """(N, M) severity codes -> (N, M) blocked levels"""
+        return self.block_table[self._columns, severity_codes]
+
+
+class CheckModel(BlockerModel):
+    """DRIVE checks; a failing check blocks its lowest threshold level"""
+
+    def __init__(self, ids, domain_masks, min_levels: np.ndarray, checks: List[Dict]):
+        super().__init__(ids, domain_masks)
+        self.min_levels = min_levels
+        self.checks = checks
+
+    def blocked_levels(self, failing: np.ndarray) -> np.ndarray:
+        """(N, M) bool fail matrix -> (N, M) blocked levels"""
+        return np.where(failing, self.min_levels, 0).astype(np.uint8)
+
+
+def _domain_definitions(config: Dict) -> Dict[str, Dict]:
+    domains = (config.get('scoring') or {}).get('domains') or {}
+    return {domain: domains.get(domain) or {} for domain in DOMAINS}
+
+
+def compile_risk_model(config: Dict) -> RiskModel:
+    """Compile the 1Secure maturity mapping into lookup arrays"""
+    definitions = _domain_definitions(config)
+    risks = [risk for section in RISK_SECTIONS for risk in config.get(section) or []]
+
+    block_table = np.zeros((len(risks), len(SEVERITIES)), dtype=np.uint8)
+    masks = {domain: np.zeros(len(risks), dtype=bool) for domain in DOMAINS}
+    for m, risk in enumerate(risks):
+        blocks = risk.get('maturity_blocks') or {}
+        for severity, code in (('low', 1), ('medium', 2), ('high', 3)):
+            level = blocks.get(severity)
+            if level is not None:
+                if not 1 <= int(level) <= MAX_LEVEL:
+                    raise ValueError(f"{risk['risk_id']}: maturity_blocks.{severity} must be 1-{MAX_LEVEL}, got {level}")
+                block_table[m, code] = int(level)
+        for domain in DOMAINS:
+            masks[domain][m] = risk.get('category') in (definitions[domain].get('categories') or [])
+
+    return RiskModel([risk['risk_id'] for risk in risks], masks, block_table, risks,
+                     compile_config_classifiers(config))
+
+
+def compile_check_model(checks: Iterable[Dict], config: Dict) -> CheckModel:
+    """Compile catalog checks (e.g. catalog_cache.load_checks().values())"""
+    definitions = _domain_definitions(config)
+    checks = sorted((c for c in checks if c.get('level_thresholds')), key=lambda c: c['check_id'])
+
+    min_levels = np.zeros(len(checks), dtype=np.uint8)
+    masks = {domain: np.zeros(len(checks), dtype=bool) for domain in DOMAINS}
+    for m, check in enumerate(checks):
+        levels = [t.get('level') for t in check['level_thresholds'] if isinstance(t.get('level'), int)]
+        min_levels[m] = min(levels) if levels else 0
+        pillars = set(check.get('drive_pillars') or [])
+        for domain in DOMAINS:
+            masks[domain][m] = bool(pillars & set(definitions[domain].get('pillars') or []))
+
+    return CheckModel([c['check_id'] for c in checks], masks, min_levels, checks)
+
+
+def encode_severities(model: RiskModel, tenants: Iterable[Dict[str, str]]) -> np.ndarray:
+    """Per-tenant {risk_id: severity} dicts -> (N, M) uint8 severity codes
+
+    Risks missing from a tenant's results count as passing; unknown risk IDs
+    are ignored.
+    """
+    tenants = list(tenants)
+    codes = np.zeros((len(tenants), model.size), dtype=np.uint8)
+    for n, results in enumerate(tenants):
+        for risk_id, severity in results.items():
+            m = model.index.get(risk_id)
+            if m is not None:
+                codes[n, m] = severity_code(severity)
+    return codes
+
+
+def severity_code(severity) -> int:
+    """Map a 1Secure severity name (or None) to its code"""
+    if severity is None:
+        return 0
+    try:
+        return SEVERITY_CODES[str(severity).strip().lower()]
+    except KeyError:
+        raise ValueError(f"Unknown 1Secure severity: {severity!r}") from None
+
+
+def risk_results(risks) -> Iterator[Tuple[str, object]]:
+    """(risk_id, severity or result object) pairs from a dict or list of risks"""
+    if isinstance(risks, dict):
+        yield from risks.items()
+    elif isinstance(risks, list):
+        for risk in risks:
+            if not isinstance(risk, dict):
+                raise ValueError(f"Risk results must be objects with a risk_id, not {risk!r}")
+            yield risk.get('risk_id'), risk
+    elif risks is not None:
+        raise ValueError(f"\"risks\" must be an object or a list, not {type(risks).__name__}")
+
+
+def check_results(checks) -> Iterator[Tuple[str, object]]:
+    """(check_id, status) pairs from a dict or list of check results"""
+    if isinstance(checks, dict):
+        yield from checks.items()
+    elif isinstance(checks, list):
+        for check in checks:
+            if not isinstance(check, dict):
+                raise ValueError(f"Check results must be objects with a check_id, not {check!r}")
+            yield check.get('check_id'), check.get('status')
+    elif checks is not None:
+        raise ValueError(f"\"checks\" must be an object or a list, not {type(checks).__name__}")
+
+
+def is_failing(status) -> bool:
+    """True for fail-like statuses (or False booleans)"""
+    if isinstance(status, bool):
+        return not status
+    return str(status).strip().lower() in FAILING_STATUSES
+
+
+def domain_bitmask(blocked: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """(N,) uint8 mask of the levels a domain's columns block (bit L-1 = level L)"""
+    return np.bitwise_or.reduce(LEVEL_BITS[blocked[:, mask]], axis=1).astype(np.uint8)
+
+
+def domain_levels(blocked: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Level of one domain for every tenant: (lowest blocked level) - 1, or 5"""
+    return DOMAIN_LEVEL_BY_BITS[domain_bitmask(blocked, mask)]
+
+
+def pack_level_bits(blocked: np.ndarray, domain_masks: Dict[str, np.ndarray]) -> np.ndarray:
+    """(N,) uint16 packed per-domain blocked-level masks"""
+    packed = np.zeros(blocked.shape[0], dtype=np.uint16)
+    for domain in DOMAINS:
+        packed |= domain_bitmask(blocked, domain_masks[domain]).astype(np.uint16) << DOMAIN_BIT_OFFSETS[domain]
+    return packed
+
+
+def domain_bits(packed: np.ndarray, domain: str) -> np.ndarray:
+    """A domain's 5-bit masks out of packed level bits"""
+    return ((packed >> DOMAIN_BIT_OFFSETS[domain]) & DOMAIN_BITS).astype(np.uint8)
+
+
+def levels_from_bits(packed: np.ndarray) -> Dict[str, np.ndarray]:
+    """Domain and overall levels from packed level bits"""
+    data_level = DOMAIN_LEVEL_BY_BITS[domain_bits(packed, 'data_security')]
+    identity_level = DOMAIN_LEVEL_BY_BITS[domain_bits(packed, 'identity_security')]
+    return {
+        'data_level': data_level,
+        'identity_level': identity_level,
+        'overall_level': np.minimum(data_level, identity_level),
+    }
+
+
+def score_blocked(blocked: np.ndarray, domain_masks: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Domain and overall levels from an (N, M) blocked-level array"""
+    return levels_from_bits(pack_level_bits(blocked, domain_masks))
+
+
+def has_blocker(packed: np.ndarray, domain: str, level: int) -> np.ndarray:
+    """Tenants with at least one column blocking level in domain"""
+    return (packed & (1 << (DOMAIN_BIT_OFFSETS[domain] + level - 1))) != 0
+
+
+def blocked_at(packed: np.ndarray, domain: str, level: int) -> np.ndarray:
+    """Tenants whose domain stops below level (lowest blocked level == level)"""
+    low_bits = ((1 << level) - 1) << DOMAIN_BIT_OFFSETS[domain]
+    return (packed & low_bits) == (1 << (DOMAIN_BIT_OFFSETS[domain] + level - 1))
+
+
+def save_level_bits(path, tenant_ids: List, packed: np.ndarray):
+    """Persist packed level bits with their tenant IDs (.npz)"""
+    np.savez(path, tenant_ids=np.array([str(t) for t in tenant_ids]), packed=packed.astype(np.uint16))
+
+
+def load_level_bits(path):
+    """Load (tenant_ids, packed) written by save_level_bits"""
+    with np.load(path) as data:
+        return data['tenant_ids'], data['packed']
+
+
+def score_severities(model: RiskModel, severity_codes: np.ndarray) -> Dict[str, np.ndarray]:
+    """Score N tenants from their (N, M) 1Secure severity codes"""
+    return score_blocked(model.blocked_levels(severity_codes), model.domain_masks)
+
+
+def score_checks(model: CheckModel, failing: np.ndarray) -> Dict[str, np.ndarray]:
+    """Score N tenants from an (N, M) bool matrix of failing checks"""
+    return score_blocked(model.blocked_levels(failing), model.domain_masks)
+
+
+def blocking_columns(model: BlockerModel, blocked_row: np.ndarray, level: int,
+                     domain: Optional[str] = None) -> List[str]:
+    """IDs of the columns blocking a given level for one tenant"""
+    hits = blocked_row == level
+    if domain is not None:
+        hits &= model.domain_masks[domain]
+    return [model.ids[m] for m in np.flatnonzero(hits)]
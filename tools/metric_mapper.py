@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+1Secure Metric Auto-Mapper
+Proposes ranked DRIVE check candidates for each 1Secure metric from an
+inverted index over the catalog
+
+Each check becomes a weighted bag of features from its title, short and
+detailed descriptions and MITRE ATT&CK tags:
+    w:<word>     search_index tokens, lightly stemmed, stopwords dropped
+    g:<trigram>  character trigrams of each word ("#kerb", ...) for fuzzy
+                 matches such as "Kerberoasting" vs "Kerberoastable"
+Features carry an IDF weight; postings map a feature to (check, weight).
+
+A metric is scored by walking only the postings of its own features
+(features found in more than --max-df of the catalog are skipped as
+uninformative), so a lookup costs the length of a few short postings
+lists rather than a pass over every check. Scores are cosine-normalised
+and the top candidates are kept with a heap.
+
+1S-* checks mirror the 1Secure metrics themselves and are excluded unless
+--include-1secure is given. The report also flags MAPPINGS targets that
+do not exist in checks/ and how often the hand mapping appears among the
+candidates.
+
+Usage:
+    python3 tools/metric_mapper.py                       # Top 3 candidates per metric
+    python3 tools/metric_mapper.py --top 5 --json analysis/1secure_candidates.json
+    python3 tools/metric_mapper.py --metric "Stale Guest Accounts"
+"""
+import csv
+import heapq
+import json
+import math
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from catalog_cache import load_checks
+from search_index import tokenize
+
+RISKS_CSV_FILE = Path(__file__).resolve().parent.parent / 'analysis' / '1secure_risks.csv'
+CHECKS_DIR = Path(__file__).resolve().parent.parent / 'checks'
+DEFAULT_TOP = 3
+DEFAULT_MAX_DF = 0.25
+TRIGRAM_WEIGHT = 0.3
+
+# Field -> weight of its words in a check's feature vector
+FIELD_WEIGHTS = {
+    'title': 3.0,
+    'short_description': 2.0,
+    'detailed_description': 1.0,
+    'mitre': 1.0,
+}
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have', 'in', 'is', 'it',
+    'not', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'used', 'via', 'with', 'without',
+}
+
+
+def stem(word: str) -> str:
+    """Strip plural endings so "permissions"/"permission" share a feature"""
+    if len(word) > 4 and word.endswith('ies'):
+        return word[:-3] + 'y'
+    if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+        return word[:-1]
+    return word
+
+
+def features(text: str) -> Dict[str, float]:
+    """Word and trigram feature counts for a piece of text"""
+    counts: Dict[str, float] = {}
+    for token in tokenize(text):
+        if token in STOPWORDS or not any(c.isalpha() for c in token):
+            continue
+        word = stem(token)
+        counts[f'w:{word}'] = counts.get(f'w:{word}', 0.0) + 1.0
+        padded = f'#{word}#'
+        for i in range(len(padded) - 2):
+            gram = f'g:{padded[i:i + 3]}'
+            counts[gram] = counts.get(gram, 0.0) + TRIGRAM_WEIGHT
+    return counts
+
+
+def check_text(check: Dict) -> Dict[str, str]:
+    """Searchable text per field (MITRE tags from framework_mappings and thresholds)"""
+    mitre = []
+    attack = (check.get('framework_mappings') or {}).get('mitre_attack') or {}
+    if isinstance(attack, dict):
+        for key in ('tactics', 'techniques'):
+            mitre.extend(str(tag) for tag in attack.get(key) or [])
+    for threshold in check.get('level_thresholds') or []:
+        if isinstance(threshold, dict):
+            mitre.extend(str(tag) for tag in threshold.get('mitre_attack') or [])
+    return {
+        'title': str(check.get('title') or ''),
+        'short_description': str(check.get('short_description') or ''),
+        'detailed_description': str(check.get('detailed_description') or ''),
+        'mitre': ' '.join(mitre),
+    }
+
+
+class MetricIndex:
+    """Inverted feature index over catalog checks"""
+
+    def __init__(self, checks: Iterable[Dict], max_df: float = DEFAULT_MAX_DF):
+        self.checks = [check for check in checks if check.get('check_id')]
+        self.ids = [check['check_id'] for check in self.checks]
+        self.by_id = {check['check_id']: check for check in self.checks}
+        vectors = []
+        for check in self.checks:
+            vector: Dict[str, float] = {}
+            for field, text in check_text(check).items():
+                weight = FIELD_WEIGHTS[field]
+                for feature, count in features(text).items():
+                    vector[feature] = vector.get(feature, 0.0) + weight * count
+            vectors.append(vector)
+
+        document_frequency: Dict[str, int] = {}
+        for vector in vectors:
+            for feature in vector:
+                document_frequency[feature] = document_frequency.get(feature, 0) + 1
+        count = len(vectors)
+        max_postings = max(1, int(max_df * count))
+        self.idf = {feature: math.log(1 + count / df) for feature, df in document_frequency.items()
+                    if df <= max_postings}
+
+        self.postings: Dict[str, List[Tuple[int, float]]] = {}
+        self.norms = []
+        for doc, vector in enumerate(vectors):
+            norm = 0.0
+            for feature, weight in vector.items():
+                idf = self.idf.get(feature)
+                if idf is None:
+                    continue
+                value = (1 + math.log(weight)) * idf if weight >= 1 else weight * idf
+                self.postings.setdefault(feature, []).append((doc, value))
+                norm += value * value
+            self.norms.append(math.sqrt(norm) or 1.0)
+
+    def candidates(self, text: str, top: int = DEFAULT_TOP) -> List[Tuple[str, float]]:
+        """Ranked (check_id, score) candidates for a metric name or description"""
+        scores: Dict[int, float] = {}
+        query_norm = 0.0
+        for feature, weight in features(text).items():
+            postings = self.postings.get(feature)
+            if not postings:
+                continue
+            value = (1 + math.log(weight)) * self.idf[feature] if weight >= 1 else weight * self.idf[feature]
+            query_norm += value * value
+            for doc, doc_value in postings:
+                scores[doc] = scores.get(doc, 0.0) + value * doc_value
+        if not scores:
+            return []
+        query_norm = math.sqrt(query_norm)
+        best = heapq.nlargest(top, scores.items(), key=lambda item: item[1] / self.norms[item[0]])
+        return [(self.ids[doc], round(score / (self.norms[doc] * query_norm), 4)) for doc, score in best]
+
+
+def load_metrics(csv_path=RISKS_CSV_FILE) -> List[Dict]:
+    with open(csv_path, 'r', newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def propose_mappings(index: MetricIndex, metrics: List[Dict], top: int = DEFAULT_TOP,
+                     min_score: float = 0.0, mappings: Optional[Dict[str, List[str]]] = None) -> List[Dict]:
+    """Candidates for every metric, alongside its current hand mapping"""
+    proposals = []
+    for metric in metrics:
+        name = metric['Metric']
+        candidates = [
+            {'check_id': check_id, 'title': index.by_id[check_id].get('title'), 'score': score}
+            for check_id, score in index.candidates(name, top)
+            if score >= min_score
+        ]
+        current = list((mappings or {}).get(name, []))
+        proposals.append({
+            '1secure_metric': name,
+            'category': metric.get('Category'),
+            'candidates': candidates,
+            'mapped': current,
+            'missing_targets': [check_id for check_id in current if check_id not in index.by_id],
+        })
+    return proposals
+
+
+def main():
+    import argparse
+
+    from map_1secure_to_drive import MAPPINGS
+
+    parser = argparse.ArgumentParser(description='Propose DRIVE checks for 1Secure metrics')
+    parser.add_argument('--checks-dir', default=str(CHECKS_DIR), help='Checks directory (default: checks/)')
+    parser.add_argument('--risks', default=str(RISKS_CSV_FILE), help='1Secure risks CSV')
+    parser.add_argument('--metric', action='append', help='Only propose for this metric (repeatable)')
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP, help=f'Candidates per metric (default: {DEFAULT_TOP})')
+    parser.add_argument('--min-score', type=float, default=0.0, help='Drop candidates scoring below this (0-1)')
+    parser.add_argument('--max-df', type=float, default=DEFAULT_MAX_DF,
+                        help=f'Ignore features in more than this fraction of checks (default: {DEFAULT_MAX_DF})')
+    parser.add_argument('--include-1secure', action='store_true', help='Also propose 1S-* checks')
+    parser.add_argument('--json', metavar='FILE', help='Write proposals as JSON')
+    args = parser.parse_args()
+
+    checks_dir = Path(args.checks_dir)
+    if not checks_dir.exists():
+        print(f"❌ Checks directory not found: {checks_dir}")
+        sys.exit(1)
+    checks = [check for check_id, check in load_checks(checks_dir).items()
+              if args.include_1secure or not check_id.startswith('1S-')]
+    index = MetricIndex(checks, args.max_df)
+
+    metrics = load_metrics(args.risks)
+    if args.metric:
+        metrics = [metric for metric in metrics if metric['Metric'] in set(args.metric)]
+    proposals = propose_mappings(index, metrics, args.top, args.min_score, MAPPINGS)
+
+    agreed = mapped = 0
+    for proposal in proposals:
+        print(f"\n{proposal['1secure_metric']}")
+        for candidate in proposal['candidates']:
+            marker = '✓' if candidate['check_id'] in proposal['mapped'] else ' '
+            print(f"  {marker} {candidate['check_id']:<20} {candidate['score']:.3f}  {candidate['title']}")
+        if not proposal['candidates']:
+            print("    (no candidates)")
+        if proposal['missing_targets']:
+            print(f"  ⚠️  MAPPINGS targets not in catalog: {', '.join(proposal['missing_targets'])}")
+        existing = [c for c in proposal['mapped'] if c not in proposal['missing_targets']]
+        if existing:
+            mapped += 1
+            agreed += any(c['check_id'] in existing for c in proposal['candidates'])
+
+    missing = sum(len(proposal['missing_targets']) for proposal in proposals)
+    print(f"\n✅ Proposed candidates for {len(proposals)} metrics from {len(index.ids)} checks "
+          f"({len(index.postings)} indexed features)")
+    if mapped:
+        print(f"   Hand mapping in top {args.top}: {agreed}/{mapped} metrics")
+    if missing:
+        print(f"   ⚠️  {missing} MAPPINGS targets do not exist in {checks_dir}")
+
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, 'w') as f:
+            json.dump(proposals, f, indent=2)
+        print(f"💾 Wrote proposals to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+DRIVE Pipeline Tracing
+Per-stage and per-file spans for the catalog tools, exported as a Chrome
+trace (chrome://tracing, Perfetto) and a JSON timing summary
+
+Tracing is off unless a tool is run with --trace FILE or DRIVE_TRACE=FILE
+is set; span() is then a shared no-op context. When on, each span records:
+    wall_ms       perf_counter time
+    cpu_ms        process CPU time (user + system)
+    alloc_blocks  net change in CPython allocated memory blocks
+
+Stage spans ('stage' category) cover load, hash, parse, validate,
+cross_file, simplify, stats, mapping_report, integration_json and output
+writes; 'file' spans cover one check file within a stage. Files parsed or
+validated in --jobs worker processes are covered by their stage span only.
+
+FILE gets the Chrome trace and FILE with a .summary.json suffix gets the
+summary: totals per (category, name) and the slowest file spans.
+
+Usage:
+    python3 tools/validate_checks.py --trace build/validate.trace.json
+    DRIVE_TRACE=build/aggregate.trace.json python3 tools/aggregate_checks.py
+"""
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Dict, List, Optional
+
+TRACE_ENV = 'DRIVE_TRACE'
+SLOWEST_FILES = 20
+
+_NULL_SPAN = nullcontext()
+_tracer: Optional['Tracer'] = None
+
+
+class Tracer:
+    """Collects completed spans for one process"""
+
+    def __init__(self):
+        self.origin_ns = time.perf_counter_ns()
+        self.pid = os.getpid()
+        self.spans: List[Dict] = []
+
+    @contextmanager
+    def span(self, name: str, category: str = 'stage', **args):
+        wall = time.perf_counter_ns()
+        cpu = time.process_time_ns()
+        blocks = sys.getallocatedblocks()
+        try:
+            yield
+        finally:
+            self.spans.append({
+                'name': name,
+                'category': category,
+                'start_us': (wall - self.origin_ns) / 1000,
+                'wall_ms': (time.perf_counter_ns() - wall) / 1e6,
+                'cpu_ms': (time.process_time_ns() - cpu) / 1e6,
+                'alloc_blocks': sys.getallocatedblocks() - blocks,
+                'tid': threading.get_ident(),
+                'args': args,
+            })
+
+    def chrome_trace(self) -> Dict:
+        """Trace Event Format document of complete ('X') events"""
+        return {
+            'displayTimeUnit': 'ms',
+            'traceEvents': [
+                {
+                    'name': span['name'] if span['category'] == 'stage' else span['args'].get('file', span['name']),
+                    'cat': span['category'] if span['category'] == 'stage' else f"file,{span['name']}",
+                    'ph': 'X',
+                    'ts': round(span['start_us'], 3),
+                    'dur': round(span['wall_ms'] * 1000, 3),
+                    'pid': self.pid,
+                    'tid': span['tid'],
+                    'args': {**span['args'], 'cpu_ms': round(span['cpu_ms'], 3),
+                             'alloc_blocks': span['alloc_blocks']},
+                }
+                for span in self.spans
+            ],
+        }
+
+    def summary(self, slowest: int = SLOWEST_FILES) -> Dict:
+        """Totals per (category, name) plus the slowest file spans"""
+        stages: Dict[str, Dict] = {}
+        for span in self.spans:
+            key = f"{span['category']}/{span['name']}"
+            totals = stages.setdefault(key, {'count': 0, 'wall_ms': 0.0, 'cpu_ms': 0.0, 'alloc_blocks': 0})
+            totals['count'] += 1
+            totals['wall_ms'] += span['wall_ms']
+            totals['cpu_ms'] += span['cpu_ms']
+            totals['alloc_blocks'] += span['alloc_blocks']
+        for totals in stages.values():
+            totals['wall_ms'] = round(totals['wall_ms'], 3)
+            totals['cpu_ms'] = round(totals['cpu_ms'], 3)
+
+        files = sorted((span for span in self.spans if span['category'] == 'file'),
+                       key=lambda span: span['wall_ms'], reverse=True)[:slowest]
+        return {
+            'stages': dict(sorted(stages.items(), key=lambda item: item[1]['wall_ms'], reverse=True)),
+            'slowest_files': [
+                {'stage': span['name'], 'file': span['args'].get('file'), 'wall_ms': round(span['wall_ms'], 3),
+                 'cpu_ms': round(span['cpu_ms'], 3), 'alloc_blocks': span['alloc_blocks']}
+                for span in files
+            ],
+        }
+
+    def export(self, path) -> Path:
+        """Write the Chrome trace to path and the summary next to it; returns the summary path"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.chrome_trace(), f, separators=(',', ':'))
+        summary_path = summary_path_for(path)
+        with open(summary_path, 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+        return summary_path
+
+
+def summary_path_for(path) -> Path:
+    path = Path(path)
+    stem = path.name[:-len('.json')] if path.name.endswith('.json') else path.name
+    return path.with_name(f"{stem}.summary.json")
+
+
+def enable(path=None) -> Tracer:
+    """Start tracing this process; with a path, export there at exit"""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer()
+        if path:
+            atexit.register(_export_at_exit, _tracer, path)
+    return _tracer
+
+
+def _export_at_exit(tracer: Tracer, path):
+    try:
+        summary = tracer.export(path)
+        print(f"⏱️  Wrote trace to {path} and summary to {summary}", file=sys.stderr)
+    except OSError as e:
+        print(f"⚠️  Could not write trace {path}: {e}", file=sys.stderr)
+
+
+def tracer() -> Optional[Tracer]:
+    return _tracer
+
+
+def span(name: str, category: str = 'stage', **args):
+    """Context manager timing a stage (or, with category='file', one file)"""
+    if _tracer is None:
+        return _NULL_SPAN
+    return _tracer.span(name, category, **args)
+
+
+if os.environ.get(TRACE_ENV):
+    enable(os.environ[TRACE_ENV])
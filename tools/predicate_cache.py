@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+DRIVE Compiled Predicate Cache
+Keeps the scorer's compiled tables on disk, one entry per catalog version,
+so short-lived scoring processes skip YAML parsing and compilation
+(requires numpy)
+
+An entry is keyed by a hash of checks/ (names and bytes of every file),
+config/1secure_maturity_mapping.yaml, scoring/scoring.yaml and the
+compiler sources, so editing any of them selects a new entry. Entries
+live next to the catalog snapshots (.drive_cache/ or DRIVE_CACHE_DIR):
+    predicates-<digest>/
+      meta.json                  IDs, risk names, 1Secure bands, exposure params
+      risk_block_table.npy       (risks, severities) blocked level
+      risk_mask_<domain>.npy     domain membership per risk
+      check_min_levels.npy       blocked level of a failing check
+      check_mask_<domain>.npy    domain membership per check
+      exposure_*.npy             category codes, pair weights, max points
+
+Arrays are opened with np.load(mmap_mode='r'), so a worker maps the pages
+it touches instead of reading and compiling the inputs. Cached models
+carry trimmed risk/check records (IDs, names, categories) rather than the
+full YAML.
+
+Usage:
+    python3 tools/predicate_cache.py    # Build the entry for the current inputs
+"""
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from catalog_cache import catalog_digest, default_cache_dir, hash_files, list_check_files
+from exposure_score import ExposureModel
+from maturity_engine import DOMAINS, CheckModel, RiskModel
+from threshold_bands import Band, BandClassifier
+
+PREDICATE_CACHE_FORMAT = 1
+ENTRIES_TO_KEEP = 3
+MAPPING_PATH = Path('config') / '1secure_maturity_mapping.yaml'
+SCORING_PATH = Path('scoring') / 'scoring.yaml'
+COMPILER_SOURCES = [Path(__file__).parent / name for name in
+                    ('predicate_cache.py', 'maturity_engine.py', 'threshold_bands.py', 'exposure_score.py')]
+RISK_FIELDS = ['risk_id', 'name', 'category', 'measure_type']
+
+
+def inputs_digest(repo_root) -> str:
+    """Hash of every input the compiled tables depend on"""
+    repo_root = Path(repo_root)
+    digest = hashlib.sha256(f"format={PREDICATE_CACHE_FORMAT}\n".encode('ascii'))
+    digest.update(catalog_digest(hash_files(list_check_files(repo_root / 'checks'))).encode('ascii'))
+    for path in [repo_root / MAPPING_PATH, repo_root / SCORING_PATH] + COMPILER_SOURCES:
+        digest.update(b'\n' + path.name.encode('utf-8') + b'\0')
+        digest.update(hashlib.sha256(path.read_bytes()).digest() if path.exists() else b'missing')
+    return digest.hexdigest()
+
+
+def cache_dir_for(repo_root) -> Path:
+    return default_cache_dir(Path(repo_root) / 'checks')
+
+
+def _entry_path(cache_dir: Path, digest: str) -> Path:
+    return cache_dir / f"predicates-{digest[:32]}"
+
+
+# -- writing ------------------------------------------------------------------
+
+def _classifier_dict(classifier: BandClassifier) -> Dict:
+    return {'kind': classifier.kind, 'bands': [list(band) for band in classifier.bands]}
+
+
+def save_models(repo_root, digest: str, risk_model: RiskModel, check_model: CheckModel,
+                exposure_model: Optional[ExposureModel], cache_dir=None) -> Path:
+    """Write one cache entry atomically and prune old ones"""
+    cache_dir = Path(cache_dir) if cache_dir else cache_dir_for(repo_root)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    target = _entry_path(cache_dir, digest)
+
+    meta = {
+        'format': PREDICATE_CACHE_FORMAT,
+        'digest': digest,
+        'risks': [{field: risk.get(field) for field in RISK_FIELDS} for risk in risk_model.risks],
+        'classifiers': {risk_id: _classifier_dict(classifier)
+                        for risk_id, classifier in risk_model.classifiers.items()},
+        'check_ids': check_model.ids,
+        'exposure': None,
+    }
+    arrays = {'risk_block_table': risk_model.block_table, 'check_min_levels': check_model.min_levels}
+    for domain in DOMAINS:
+        arrays[f'risk_mask_{domain}'] = risk_model.domain_masks[domain]
+        arrays[f'check_mask_{domain}'] = check_model.domain_masks[domain]
+    if exposure_model is not None:
+        meta['exposure'] = {'ids': exposure_model.ids, 'category_keys': exposure_model.category_keys,
+                            'k': exposure_model.k, 'midpoint': exposure_model.midpoint}
+        arrays['exposure_category_codes'] = exposure_model.category_codes
+        arrays['exposure_pair_weights'] = exposure_model.pair_weights
+        arrays['exposure_max_points'] = exposure_model.max_points
+
+    tmp = Path(tempfile.mkdtemp(dir=cache_dir, prefix='.predicates-'))
+    for name, values in arrays.items():
+        np.save(tmp / f'{name}.npy', np.ascontiguousarray(values))
+    with open(tmp / 'meta.json', 'w') as f:
+        json.dump(meta, f, separators=(',', ':'))
+    try:
+        os.rename(tmp, target)
+    except OSError:
+        # Another process stored the same entry first
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    entries = sorted(cache_dir.glob('predicates-*'), key=lambda p: p.stat().st_mtime, reverse=True)
+    for stale in entries[ENTRIES_TO_KEEP:]:
+        shutil.rmtree(stale, ignore_errors=True)
+    return target
+
+
+# -- reading ------------------------------------------------------------------
+
+def load_models(repo_root, digest: Optional[str] = None, cache_dir=None
+                ) -> Optional[Tuple[RiskModel, CheckModel, Optional[ExposureModel]]]:
+    """Memory-mapped models for the current inputs, or None on a cache miss"""
+    digest = digest or inputs_digest(repo_root)
+    entry = _entry_path(Path(cache_dir) if cache_dir else cache_dir_for(repo_root), digest)
+    try:
+        with open(entry / 'meta.json', 'r') as f:
+            meta = json.load(f)
+        if meta.get('format') != PREDICATE_CACHE_FORMAT or meta.get('digest') != digest:
+            return None
+
+        def array(name):
+            return np.load(entry / f'{name}.npy', mmap_mode='r')
+
+        bands = {}
+        classifiers = {}
+        for risk_id, classifier in meta['classifiers'].items():
+            # Risks with equal bands share one classifier, as compile_classifier does
+            key = json.dumps(classifier)
+            if key not in bands:
+                bands[key] = BandClassifier(classifier['kind'], [Band(*band) for band in classifier['bands']])
+            classifiers[risk_id] = bands[key]
+
+        risks = meta['risks']
+        risk_model = RiskModel([risk['risk_id'] for risk in risks],
+                               {domain: array(f'risk_mask_{domain}') for domain in DOMAINS},
+                               array('risk_block_table'), risks, classifiers)
+        check_model = CheckModel(meta['check_ids'],
+                                 {domain: array(f'check_mask_{domain}') for domain in DOMAINS},
+                                 array('check_min_levels'), [{'check_id': c} for c in meta['check_ids']])
+        exposure = meta['exposure']
+        exposure_model = None
+        if exposure is not None:
+            exposure_model = ExposureModel(exposure['ids'], array('exposure_category_codes'),
+                                           array('exposure_pair_weights'), exposure['category_keys'],
+                                           array('exposure_max_points'), exposure['k'], exposure['midpoint'])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return risk_model, check_model, exposure_model
+
+
+def main():
+    from drive import REPO_ROOT, load_scorer
+
+    repo_root = Path(sys.argv[1]) if len(sys.argv) > 1 else REPO_ROOT
+    digest = inputs_digest(repo_root)
+    start = time.perf_counter()
+    hit = load_models(repo_root, digest) is not None
+    if not hit:
+        load_scorer(repo_root)
+    elapsed = time.perf_counter() - start
+    print(f"✅ Predicate cache {'hit' if hit else 'built'} for {digest[:12]} in {elapsed * 1000:.1f}ms "
+          f"({_entry_path(cache_dir_for(repo_root), digest)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+DRIVE Remediation Planner
+Cheapest set of fixes that lifts a tenant to a target overall level
+
+The overall level is MIN(data, identity), so reaching level L means
+clearing every column (1Secure risk or check) that blocks a level <= L in
+either domain. Each candidate fix covers the columns it clears (see
+what_if.cleared_columns) at the cost of its catalog remediation:
+estimated_time_minutes, with fix_complexity as the tie-break. Picking the
+cheapest cover is a weighted set cover:
+
+- up to exact_limit candidate fixes: exact branch and bound, seeded with
+  the greedy plan as the upper bound
+- above that: greedy by cost per newly covered column, then a pass that
+  drops fixes made redundant by later picks
+
+Fleet runs score tenants in vectorized batches and memoize plans by
+(blocking columns to clear, target level).
+"""
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from maturity_engine import score_blocked
+from what_if import build_fix_index, cleared_columns
+
+COMPLEXITY_RANK = {'low': 1, 'medium': 2, 'high': 3}
+DEFAULT_EXACT_LIMIT = 24
+
+
+class FixOption(NamedTuple):
+    """A fix (or group of check fixes) and the required columns it clears"""
+    fixes: Tuple[str, ...]
+    columns: FrozenSet[int]
+    cost: Tuple[int, int]
+
+
+def fix_costs(checks) -> Dict[str, Tuple[int, int]]:
+    """check_id -> (estimated_time_minutes, fix_complexity rank) from the catalog"""
+    costs = {}
+    for check in checks:
+        remediation = check.get('remediation') or {}
+        minutes = remediation.get('estimated_time_minutes')
+        if isinstance(minutes, (int, float)):
+            complexity = COMPLEXITY_RANK.get(str(remediation.get('fix_complexity', '')).lower(), 2)
+            costs[check['check_id']] = (int(minutes), complexity)
+    return costs
+
+
+def _add(cost: Tuple[int, int], other: Tuple[int, int]) -> Tuple[int, int]:
+    return (cost[0] + other[0], cost[1] + other[1])
+
+
+def candidate_options(ids: List[str], fix_index: Dict, required: FrozenSet[int],
+                      costs: Dict[str, Tuple[int, int]]) -> List[FixOption]:
+    """Costed fixes that clear at least one required column"""
+    options = []
+    seen = set()
+    for column in sorted(required):
+        fix = ids[column]
+        if fix in costs and fix not in seen:
+            seen.add(fix)
+            options.append(FixOption((fix,), frozenset(cleared_columns(fix_index, [fix])) & required, costs[fix]))
+
+    for check_ids, m in fix_index['check_groups']:
+        if m in required and all(check_id in costs for check_id in check_ids):
+            fixes = tuple(sorted(check_ids))
+            cost = (0, 0)
+            for check_id in fixes:
+                cost = _add(cost, costs[check_id])
+            options.append(FixOption(fixes, frozenset(cleared_columns(fix_index, fixes)) & required, cost))
+    return options
+
+
+def solve_greedy(required: FrozenSet[int], options: List[FixOption]) -> Optional[List[int]]:
+    """Greedy weighted set cover; None when some column cannot be covered"""
+    uncovered = set(required)
+    chosen = []
+    while uncovered:
+        best = None
+        best_ratio = None
+        for i, option in enumerate(options):
+            gain = len(option.columns & uncovered)
+            if gain:
+                ratio = (option.cost[0] / gain, option.cost[1] / gain, i)
+                if best_ratio is None or ratio < best_ratio:
+                    best, best_ratio = i, ratio
+        if best is None:
+            return None
+        chosen.append(best)
+        uncovered -= options[best].columns
+
+    # Drop picks whose columns are all covered by the other picks
+    for i in sorted(chosen, key=lambda i: options[i].cost, reverse=True):
+        others = set().union(*(options[j].columns for j in chosen if j != i))
+        if options[i].columns <= others:
+            chosen.remove(i)
+    return chosen
+
+
+def solve_exact(required: FrozenSet[int], options: List[FixOption]) -> Optional[List[int]]:
+    """Branch and bound minimum-cost cover; None when infeasible"""
+    covering = {column: sorted((i for i, o in enumerate(options) if column in o.columns),
+                               key=lambda i: options[i].cost)
+                for column in required}
+    if any(not indices for indices in covering.values()):
+        return None
+
+    best = {'plan': solve_greedy(required, options)}
+    best['cost'] = _plan_cost(best['plan'], options)
+
+    def search(uncovered: FrozenSet[int], chosen: List[int], cost: Tuple[int, int]):
+        if cost >= best['cost']:
+            return
+        if not uncovered:
+            best['plan'], best['cost'] = list(chosen), cost
+            return
+        # Branch on the column with the fewest ways to clear it
+        column = min(uncovered, key=lambda c: len(covering[c]))
+        for i in covering[column]:
+            chosen.append(i)
+            search(uncovered - options[i].columns, chosen, _add(cost, options[i].cost))
+            chosen.pop()
+
+    search(frozenset(required), [], (0, 0))
+    return best['plan']
+
+
+def _plan_cost(plan: List[int], options: List[FixOption]) -> Tuple[int, int]:
+    cost = (0, 0)
+    for i in plan:
+        cost = _add(cost, options[i].cost)
+    return cost
+
+
+class RemediationPlanner:
+    """Plans remediation for many tenants, sharing one scorer, cost table and plan cache"""
+
+    def __init__(self, scorer, checks, exact_limit: int = DEFAULT_EXACT_LIMIT):
+        self.scorer = scorer
+        self.costs = fix_costs(checks)
+        self.exact_limit = exact_limit
+        self.fix_index = build_fix_index(scorer)
+        self._plans = {}
+
+    def plan(self, record: Dict, target_level: int) -> Dict:
+        """Cheapest fixes lifting one tenant to target_level overall"""
+        return self.plan_batch([record], target_level)[0]
+
+    def plan_batch(self, records: List[Dict], target_level: int) -> List[Dict]:
+        """Plan a batch of tenants; scoring before and after is vectorized"""
+        blocked = self.scorer.blocked_levels(records)
+        baseline = score_blocked(blocked, self.scorer.domain_masks)
+        required_rows = (blocked > 0) & (blocked <= target_level)
+
+        plans = []
+        after = blocked.copy()
+        for n, row in enumerate(required_rows):
+            key = (row.tobytes(), target_level)
+            plan = self._plans.get(key)
+            if plan is None:
+                plan = self._plans[key] = self._solve(frozenset(np.flatnonzero(row).tolist()))
+            plans.append(plan)
+            if plan['reachable']:
+                after[n, plan['cleared']] = 0
+        result_levels = score_blocked(after, self.scorer.domain_masks)
+
+        results = []
+        for n, (record, plan) in enumerate(zip(records, plans)):
+            result = {
+                'tenant_id': record.get('tenant_id'),
+                'target_level': target_level,
+                'baseline': _row_levels(baseline, n),
+                **{key: value for key, value in plan.items() if key != 'cleared'},
+            }
+            if plan['reachable']:
+                result['result'] = _row_levels(result_levels, n)
+            results.append(result)
+        return results
+
+    def _solve(self, required: FrozenSet[int]) -> Dict:
+        options = candidate_options(self.scorer.ids, self.fix_index, required, self.costs)
+        covered = frozenset().union(*(option.columns for option in options))
+        uncoverable = sorted({self.scorer.ids[column] for column in required - covered})
+        if uncoverable:
+            return {'reachable': False, 'fixes': [], 'estimated_minutes': 0, 'method': None,
+                    'uncoverable': uncoverable}
+
+        method = 'exact' if len(options) <= self.exact_limit else 'greedy'
+        solver = solve_exact if method == 'exact' else solve_greedy
+        chosen = solver(required, options)
+        fixes = sorted({fix for i in chosen for fix in options[i].fixes})
+        return {
+            'reachable': True,
+            'fixes': fixes,
+            'estimated_minutes': _plan_cost(chosen, options)[0],
+            'method': method,
+            'cleared': sorted(cleared_columns(self.fix_index, fixes)),
+        }
+
+
+def _row_levels(levels: Dict, n: int) -> Dict[str, int]:
+    return {key: int(values[n]) for key, values in levels.items()}
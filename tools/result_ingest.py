@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+DRIVE 1Secure Result Export Ingest
+Streams large per-tenant 1Secure result exports (CSV or NDJSON) into the
+scorer in fixed-size chunks (requires numpy)
+
+Exports are long format, one result per row, grouped by tenant:
+    tenant_id,metric,category,severity,value,status
+    t-001,High Risk Permissions on Documents,Data,,12.5,
+    t-001,1S-IDENTITY-001,Identity,High,,
+    t-001,AD-001,,,,fail
+NDJSON rows are objects with the same keys. A row names its subject by
+"risk_id", "check_id" or "metric" (risk/check ID or 1Secure metric name,
+any case); other columns such as "category" are ignored. Risk rows give a
+"severity" or a raw "value" classified with the risk's 1secure_thresholds
+bands, check rows a pass/fail "status". When a tenant has several rows for
+one risk the worst severity wins.
+
+The reader pulls --chunk-rows rows at a time and converts them to typed
+columns: tenant run index (int32), risk/check column (int32), severity
+code (uint8), value (float64) and failing flag (bool). Subject strings
+resolve through one table of catalog IDs and metric names, so repeated
+metric names are never held per row; tenant IDs are kept once per run of
+rows. Raw values are classified per risk with one np.searchsorted over the
+risk's band cuts. Each chunk is folded into (tenants, risks) severity
+codes and (tenants, checks) failing flags, which TenantScorer scores
+directly.
+
+Parsing runs in a background thread feeding a queue of at most
+--prefetch chunks; when the scorer falls behind the reader blocks, so
+memory holds a few chunks and one batch however large the export is
+(plus the set of tenant IDs already scored). A tenant split across two
+chunks is merged before it is scored; rows for a tenant that turn up
+after its run has ended are rejected as bad rows, since it was already
+scored.
+
+Usage:
+    python3 tools/drive.py ingest export.csv -o scores.jsonl
+    python3 tools/drive.py ingest export.ndjson --chunk-rows 100000 --prefetch 4 --history history/
+    gunzip -c export.csv.gz | python3 tools/drive.py ingest - --format csv > scores.jsonl
+"""
+import csv
+import json
+import math
+import queue
+import threading
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+
+from drive import DEFAULT_BATCH_SIZE
+from maturity_engine import SEVERITY_CODES, is_failing, severity_code
+from threshold_bands import parse_measurement
+
+EXPORT_FORMATS = ['csv', 'ndjson']
+DEFAULT_CHUNK_ROWS = 50000
+DEFAULT_PREFETCH = 2
+MAX_REPORTED = 20
+CLASSIFY = 255  # Severity code placeholder for rows carrying a raw value
+
+FIELD_ALIASES = {
+    'tenant': 'tenant_id',
+    'metric_name': 'metric',
+    'risk': 'risk_id',
+    'check': 'check_id',
+    'risk_level': 'severity',
+    'result': 'status',
+}
+ROW_FIELDS = ['tenant_id', 'risk_id', 'check_id', 'metric', 'severity', 'value', 'status']
+_ROW_FIELD_SET = frozenset(ROW_FIELDS)
+
+
+class ResultChunk(NamedTuple):
+    """Typed columns for one chunk of export rows"""
+    tenant_ids: List[str]     # One entry per run of rows for a tenant
+    row_tenant: np.ndarray    # int32 index into tenant_ids
+    risk: np.ndarray          # int32 risk column (-1 for check rows)
+    check: np.ndarray         # int32 check column (-1 for risk rows)
+    code: np.ndarray          # uint8 severity code
+    value: np.ndarray         # float64 raw value (NaN when a severity was given)
+    failing: np.ndarray       # bool, check rows only
+
+
+class IngestBatch(NamedTuple):
+    """Complete tenants ready for TenantScorer.score_encoded"""
+    tenant_ids: List[str]
+    codes: np.ndarray         # (N, risks) uint8 severity codes
+    failing: np.ndarray       # (N, checks) bool
+
+
+def normalize_field(name) -> str:
+    field = str(name or '').strip().lower().replace(' ', '_').replace('-', '_')
+    return FIELD_ALIASES.get(field, field)
+
+
+def detect_format(path: str) -> str:
+    """'csv' for .csv paths, otherwise 'ndjson'"""
+    return 'csv' if str(path).lower().endswith('.csv') else 'ndjson'
+
+
+def parse_value(raw) -> float:
+    """Raw measurement -> float ('12.5', '12.5%', 'Risk', true); NaN when empty"""
+    if raw is None or raw == '':
+        return math.nan
+    if isinstance(raw, bool):
+        return 1.0 if raw else 0.0
+    if isinstance(raw, (int, float)):
+        return float(raw)
+    return parse_measurement(str(raw))
+
+
+class ExportReader:
+    """Chunked reader of 1Secure result exports for one compiled scorer"""
+
+    def __init__(self, scorer, export_format: str = 'csv', chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {export_format!r}")
+        if chunk_rows < 1:
+            raise ValueError("chunk_rows must be at least 1")
+        self.scorer = scorer
+        self.format = export_format
+        self.chunk_rows = chunk_rows
+        self.stats = {'rows': 0, 'tenants': 0, 'unknown': 0, 'errors': 0}
+        self.unknown_subjects: List[str] = []
+        self.error_messages: List[str] = []
+
+        # Subject tables shared by every row: risk IDs and metric names, check IDs
+        self.risk_subjects: Dict[str, int] = {column_id.lower(): m for column_id, m in scorer.risk_model.index.items()}
+        for m, risk in enumerate(scorer.risk_model.risks):
+            if risk.get('name'):
+                self.risk_subjects[str(risk['name']).strip().lower()] = m
+        self.check_subjects: Dict[str, int] = {column_id.lower(): m
+                                               for column_id, m in scorer.check_model.index.items()}
+        self._resolved: Dict[Tuple[str, str], Tuple[str, int]] = {}
+        # Tenants whose run of rows has ended; IDs only, one per tenant
+        self._current_tenant: Optional[str] = None
+        self._finished_tenants: Set[str] = set()
+        self._value_bands: Dict[int, Optional[Tuple[np.ndarray, np.ndarray]]] = {}
+
+    # -- parsing ------------------------------------------------------------
+
+    def rows(self, source) -> Iterator[Tuple]:
+        """(tenant_id, risk_id, check_id, metric, severity, value, status) per export row"""
+        if self.format == 'csv':
+            reader = csv.reader(source)
+            header = next(reader, None)
+            if header is None:
+                return
+            fields = [normalize_field(name) for name in header]
+            if 'tenant_id' not in fields:
+                raise ValueError(f"Export header has no tenant_id column: {header}")
+            positions = [fields.index(field) if field in fields else None for field in ROW_FIELDS]
+            width = len(fields)
+            for row in reader:
+                if not row:
+                    continue
+                if len(row) < width:
+                    row = row + [''] * (width - len(row))
+                yield tuple(row[p] if p is not None else None for p in positions)
+        else:
+            for line in source:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                    if not isinstance(record, dict):
+                        raise ValueError("expected a JSON object")
+                except ValueError as e:
+                    yield ValueError(str(e))
+                    continue
+                if not _ROW_FIELD_SET.issuperset(record):
+                    record = {normalize_field(key): value for key, value in record.items()}
+                yield tuple(record.get(field) for field in ROW_FIELDS)
+
+    def chunks(self, source) -> Iterator[ResultChunk]:
+        """Typed column chunks of at most chunk_rows rows"""
+        rows = self.rows(source)
+        first_row = 1
+        while True:
+            block = list(islice(rows, self.chunk_rows))
+            if not block:
+                return
+            yield self._parse_chunk(block, first_row)
+            first_row += len(block)
+
+    def _subject(self, field: str, text) -> Optional[Tuple[str, int]]:
+        """('risk' | 'check', column) for a subject named in field
+
+        1S-* IDs are both risks and checks: "risk_id" and "check_id" pick
+        their table, and a "metric" is a risk unless the row is a check
+        result (field 'metric_check').
+        """
+        key = (field, text)
+        target = self._resolved.get(key)
+        if target is None:
+            normalized = str(text).strip().lower()
+            order = {'risk_id': ('risk',), 'check_id': ('check',), 'metric': ('risk', 'check'),
+                     'metric_check': ('check', 'risk')}[field]
+            for kind in order:
+                m = (self.risk_subjects if kind == 'risk' else self.check_subjects).get(normalized)
+                if m is not None:
+                    target = (kind, m)
+                    # Only catalog spellings are remembered, so the table stays bounded
+                    self._resolved[key] = target
+                    break
+        return target
+
+    def _error(self, row_number: int, message: str):
+        self.stats['errors'] += 1
+        if len(self.error_messages) < MAX_REPORTED:
+            self.error_messages.append(f"row {row_number}: {message}")
+
+    def _parse_chunk(self, block: List, first_row: int) -> ResultChunk:
+        count = len(block)
+        row_tenant = np.empty(count, dtype=np.int32)
+        risk = np.full(count, -1, dtype=np.int32)
+        check = np.full(count, -1, dtype=np.int32)
+        code = np.zeros(count, dtype=np.uint8)
+        value = np.full(count, np.nan, dtype=np.float64)
+        failing = np.zeros(count, dtype=bool)
+        tenant_ids: List[str] = []
+        kept = 0
+
+        for row_number, row in enumerate(block, first_row):
+            if isinstance(row, ValueError):
+                self._error(row_number, str(row))
+                continue
+            tenant, risk_id, check_id, metric, severity, raw_value, status = row
+            if tenant is None or tenant == '':
+                self._error(row_number, "missing tenant_id")
+                continue
+            if not isinstance(tenant, (str, int)) or isinstance(tenant, bool):
+                self._error(row_number, f"tenant_id must be a string, not {type(tenant).__name__}")
+                continue
+            bad = next((name for name, text in (('risk_id', risk_id), ('check_id', check_id), ('metric', metric))
+                        if text not in (None, '') and not isinstance(text, str)), None)
+            if bad:
+                self._error(row_number, f"{bad} must be a string")
+                continue
+            if risk_id:
+                field, subject = 'risk_id', risk_id
+            elif check_id:
+                field, subject = 'check_id', check_id
+            else:
+                is_check = status not in (None, '') and severity in (None, '') and raw_value in (None, '')
+                field, subject = ('metric_check' if is_check else 'metric'), metric
+            tenant = str(tenant)
+            if tenant != self._current_tenant:
+                if tenant in self._finished_tenants:
+                    self._error(row_number, f"tenant {tenant} reappears after its rows ended "
+                                            f"(exports must be grouped by tenant)")
+                    continue
+                if self._current_tenant is not None:
+                    self._finished_tenants.add(self._current_tenant)
+                self._current_tenant = tenant
+                tenant_ids.append(tenant)
+            elif not tenant_ids:
+                # The tenant carried over from the previous chunk
+                tenant_ids.append(tenant)
+            target = self._subject(field, subject) if subject else None
+            if target is None:
+                self.stats['unknown'] += 1
+                if subject and len(self.unknown_subjects) < MAX_REPORTED and subject not in self.unknown_subjects:
+                    self.unknown_subjects.append(str(subject))
+                continue
+
+            kind, m = target
+            try:
+                if kind == 'risk':
+                    if severity not in (None, ''):
+                        text = str(severity).strip().lower()
+                        row_code = SEVERITY_CODES[text] if text in SEVERITY_CODES else severity_code(severity)
+                        row_value = math.nan
+                    else:
+                        row_value = parse_value(raw_value)
+                        row_code = 0 if math.isnan(row_value) else CLASSIFY
+                    risk[kept], code[kept], value[kept] = m, row_code, row_value
+                else:
+                    check[kept] = m
+                    failing[kept] = is_failing(status if status not in (None, '') else severity)
+            except ValueError as e:
+                self._error(row_number, str(e))
+                continue
+            row_tenant[kept] = len(tenant_ids) - 1
+            kept += 1
+
+        self.stats['rows'] += count
+        chunk = ResultChunk(tenant_ids, row_tenant[:kept], risk[:kept], check[:kept], code[:kept],
+                            value[:kept], failing[:kept])
+        self._classify(chunk)
+        return chunk
+
+    def _bands(self, m: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """(cuts, severity codes) for risk column m, as BandClassifier.classify"""
+        if m not in self._value_bands:
+            classifier = self.scorer.risk_model.classifiers.get(self.scorer.risk_model.ids[m])
+            if classifier is None or not classifier.bands:
+                self._value_bands[m] = None
+            else:
+                self._value_bands[m] = (np.asarray(classifier.cuts, dtype=np.float64),
+                                        np.array([severity_code(s) for s in classifier.severities], dtype=np.uint8))
+        return self._value_bands[m]
+
+    def _classify(self, chunk: ResultChunk):
+        """Replace CLASSIFY codes with the band each raw value falls in, one risk at a time"""
+        pending = chunk.code == CLASSIFY
+        if not pending.any():
+            return
+        columns = chunk.risk[pending]
+        rows = np.flatnonzero(pending)
+        for m in np.unique(columns):
+            selected = rows[columns == m]
+            bands = self._bands(int(m))
+            if bands is None:
+                chunk.code[selected] = 0
+            else:
+                cuts, codes = bands
+                chunk.code[selected] = codes[np.searchsorted(cuts, chunk.value[selected], side='right')]
+
+    # -- folding into tenants -----------------------------------------------
+
+    def fold(self, chunk: ResultChunk) -> IngestBatch:
+        """One row per tenant run: worst severity per risk, any failure per check"""
+        tenants = len(chunk.tenant_ids)
+        codes = np.zeros((tenants, self.scorer.risk_model.size), dtype=np.uint8)
+        failing = np.zeros((tenants, self.scorer.check_model.size), dtype=bool)
+        risk_rows = chunk.risk >= 0
+        np.maximum.at(codes, (chunk.row_tenant[risk_rows], chunk.risk[risk_rows]), chunk.code[risk_rows])
+        failed = (chunk.check >= 0) & chunk.failing
+        failing[chunk.row_tenant[failed], chunk.check[failed]] = True
+        return IngestBatch(chunk.tenant_ids, codes, failing)
+
+    def batches(self, source, batch_size: int = DEFAULT_BATCH_SIZE,
+                prefetch: int = DEFAULT_PREFETCH) -> Iterator[IngestBatch]:
+        """Complete tenants in batches of at most batch_size
+
+        The last tenant of each chunk is held back until the next chunk
+        shows whether its rows continue there.
+        """
+        carry: Optional[IngestBatch] = None
+        for chunk in bounded_prefetch(self.chunks(source), prefetch):
+            folded = self.fold(chunk)
+            if not folded.tenant_ids:
+                continue
+            if carry is not None:
+                if folded.tenant_ids[0] == carry.tenant_ids[0]:
+                    np.maximum(folded.codes[0], carry.codes[0], out=folded.codes[0])
+                    folded.failing[0] |= carry.failing[0]
+                else:
+                    folded = IngestBatch(carry.tenant_ids + folded.tenant_ids,
+                                         np.vstack([carry.codes, folded.codes]),
+                                         np.vstack([carry.failing, folded.failing]))
+            complete = len(folded.tenant_ids) - 1
+            carry = IngestBatch(folded.tenant_ids[complete:], folded.codes[complete:], folded.failing[complete:])
+            yield from self._split(folded, complete, batch_size)
+        if carry is not None:
+            yield from self._split(carry, 1, batch_size)
+
+    def _split(self, folded: IngestBatch, count: int, batch_size: int) -> Iterator[IngestBatch]:
+        for start in range(0, count, batch_size):
+            end = min(start + batch_size, count)
+            self.stats['tenants'] += end - start
+            yield IngestBatch(folded.tenant_ids[start:end], folded.codes[start:end], folded.failing[start:end])
+
+
+class _Failure(NamedTuple):
+    error: BaseException
+
+
+_DONE = object()
+
+
+def bounded_prefetch(items: Iterable, depth: int = DEFAULT_PREFETCH) -> Iterator:
+    """Produce items in a background thread, at most depth ahead of the consumer
+
+    depth < 1 produces them inline. The producer stops when the consumer
+    stops iterating; its exceptions are re-raised in the consumer.
+    """
+    if depth < 1:
+        yield from items
+        return
+
+    slots: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                slots.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put(item):
+                    return
+            put(_DONE)
+        except BaseException as e:
+            put(_Failure(e))
+
+    thread = threading.Thread(target=produce, name='result-ingest', daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = slots.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        # A producer blocked on put() sees this within 0.1s and exits
+        stop.set()
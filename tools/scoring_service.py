@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+DRIVE Scoring Service
+Long-running local HTTP service that scores tenants against a precompiled
+catalog and maturity mapping
+
+All YAML is parsed once into an immutable snapshot at startup. A watcher
+thread polls config/1secure_maturity_mapping.yaml, levels/levels.yaml,
+scoring/scoring.yaml and checks/; when any of them changes it compiles a new
+snapshot in the background and swaps the reference in one assignment.
+Each request reads the snapshot reference once, so in-flight requests keep
+the snapshot they started with and never see a half-loaded config. A
+failed recompile keeps serving the previous snapshot.
+
+Endpoints:
+    GET  /health    snapshot version, load time and sizes
+    POST /score     a tenant record or a list of records (drive.py score format)
+    POST /whatif    {"record": {...}, "fixes": [...], "target": 3}
+
+Usage:
+    python3 tools/drive.py serve --port 8765
+"""
+import json
+import sys
+import threading
+import time
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Tuple, Union
+
+import yaml
+
+from catalog_cache import list_check_files, load_checks
+from exposure_score import load_scoring_config
+from incremental_scoring import IncrementalScorer
+from maturity_engine import load_maturity_config
+from what_if import WhatIfSimulator, build_fix_index
+
+WATCHED_FILES = [
+    Path('config') / '1secure_maturity_mapping.yaml',
+    Path('levels') / 'levels.yaml',
+    Path('scoring') / 'scoring.yaml',
+]
+WATCHED_DIRS = [Path('checks')]
+DEFAULT_POLL_INTERVAL = 1.0
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+
+class ScoringSnapshot(NamedTuple):
+    """Everything a request needs, compiled once and never mutated"""
+    version: int
+    fingerprint: Tuple
+    loaded_at: float
+    scorer: object
+    incremental: IncrementalScorer
+    fix_index: Dict
+    level_names: Dict[int, str]
+
+
+def watched_fingerprint(repo_root) -> Tuple:
+    """(path, mtime_ns, size) for every watched file; changes on any edit"""
+    repo_root = Path(repo_root)
+    paths = [repo_root / path for path in WATCHED_FILES]
+    for directory in WATCHED_DIRS:
+        if (repo_root / directory).exists():
+            paths.extend(list_check_files(repo_root / directory))
+
+    fingerprint = []
+    for path in paths:
+        try:
+            stat = path.stat()
+            fingerprint.append((str(path), stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            fingerprint.append((str(path), None, None))
+    return tuple(fingerprint)
+
+
+def compile_snapshot(repo_root, version: int) -> ScoringSnapshot:
+    """Parse and compile every input; the only place YAML is read"""
+    from drive import TenantScorer
+
+    repo_root = Path(repo_root)
+    fingerprint = watched_fingerprint(repo_root)
+    config = load_maturity_config(repo_root / 'config' / '1secure_maturity_mapping.yaml')
+    scoring_path = repo_root / 'scoring' / 'scoring.yaml'
+    scoring_config = load_scoring_config(scoring_path) if scoring_path.exists() else None
+    scorer = TenantScorer(config, load_checks(repo_root / 'checks').values(), scoring_config)
+
+    level_names = {}
+    levels_path = repo_root / 'levels' / 'levels.yaml'
+    if levels_path.exists():
+        with open(levels_path, 'r') as f:
+            for level in (yaml.safe_load(f) or {}).get('levels') or []:
+                level_names[level.get('id')] = level.get('name')
+
+    return ScoringSnapshot(
+        version=version,
+        fingerprint=fingerprint,
+        loaded_at=time.time(),
+        scorer=scorer,
+        incremental=IncrementalScorer(scorer),
+        fix_index=build_fix_index(scorer),
+        level_names=level_names,
+    )
+
+
+class ScoringService:
+    """Holds the current snapshot and recompiles it when watched files change"""
+
+    def __init__(self, repo_root, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self.repo_root = Path(repo_root)
+        self.poll_interval = poll_interval
+        self.snapshot = compile_snapshot(self.repo_root, version=1)
+        self._stop = threading.Event()
+        self._failed_fingerprint = None
+        self._watcher = None
+
+    def start_watcher(self):
+        self._watcher = threading.Thread(target=self._watch, name='drive-config-watcher', daemon=True)
+        self._watcher.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            fingerprint = watched_fingerprint(self.repo_root)
+            if fingerprint in (self.snapshot.fingerprint, self._failed_fingerprint):
+                continue
+            self.reload()
+
+    def reload(self) -> bool:
+        """Compile a new snapshot and swap it in; keep the old one on failure"""
+        start = time.perf_counter()
+        try:
+            snapshot = compile_snapshot(self.repo_root, self.snapshot.version + 1)
+        except Exception as e:  # Any bad edit must not take the service down
+            self._failed_fingerprint = watched_fingerprint(self.repo_root)
+            print(f"❌ Reload failed, still serving v{self.snapshot.version}: {e}", file=sys.stderr)
+            return False
+        self.snapshot = snapshot
+        self._failed_fingerprint = None
+        print(f"♻️  Reloaded scoring snapshot v{snapshot.version} in {time.perf_counter() - start:.2f}s",
+              file=sys.stderr)
+        return True
+
+    def health(self, snapshot: ScoringSnapshot) -> Dict:
+        return {
+            'status': 'ok',
+            'version': snapshot.version,
+            'loaded_at': snapshot.loaded_at,
+            'risks': snapshot.scorer.risk_model.size,
+            'checks': snapshot.scorer.check_model.size,
+        }
+
+    def score(self, snapshot: ScoringSnapshot, body) -> Union[Dict, List[Dict]]:
+        records = body if isinstance(body, list) else [body]
+        if not all(isinstance(record, dict) for record in records):
+            raise ValueError("expected a tenant record or a list of records")
+        results = snapshot.scorer.score(records)
+        for result in results:
+            result['overall_level_name'] = snapshot.level_names.get(result['overall_level'])
+        return results if isinstance(body, list) else results[0]
+
+    def whatif(self, snapshot: ScoringSnapshot, body) -> Dict:
+        if not isinstance(body, dict) or not isinstance(body.get('record'), dict):
+            raise ValueError('expected {"record": {...}, "fixes": [...]}')
+        fixes = body.get('fixes')
+        if fixes is None:
+            fixes = []
+        if not isinstance(fixes, list) or not all(isinstance(fix, str) for fix in fixes):
+            raise ValueError('"fixes" must be a list of risk/check IDs')
+        simulator = WhatIfSimulator(snapshot.scorer, body['record'], snapshot.fix_index, snapshot.incremental)
+        result = {'baseline': simulator.baseline, 'result': simulator.simulate(fixes),
+                  'unknown': simulator.unknown(fixes)}
+        if body.get('target') is not None:
+            result['required'] = simulator.blockers(int(body['target']))
+        return result
+
+
+class ScoringRequestHandler(BaseHTTPRequestHandler):
+    """JSON over HTTP; the server carries the ScoringService"""
+
+    protocol_version = 'HTTP/1.1'
+    verbose = False
+
+    def do_GET(self):
+        snapshot = self.server.service.snapshot
+        if self.path == '/health':
+            self._send(200, self.server.service.health(snapshot))
+        else:
+            self._send(404, {'error': f"unknown path {self.path}"})
+
+    def do_POST(self):
+        snapshot = self.server.service.snapshot
+        routes = {'/score': self.server.service.score, '/whatif': self.server.service.whatif}
+        handler = routes.get(self.path)
+        if handler is None:
+            self._send(404, {'error': f"unknown path {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._send(400, {'error': 'invalid Content-Length'})
+            return
+        if length > MAX_BODY_BYTES:
+            self._send(413, {'error': 'request body too large'})
+            return
+        try:
+            body = json.loads(self.rfile.read(length) or b'null')
+            result = handler(snapshot, body)
+        except (ValueError, TypeError) as e:
+            self._send(400, {'error': str(e)})
+            return
+        except Exception as e:
+            # Always answer: a dropped connection tells the client nothing
+            traceback.print_exc(file=sys.stderr)
+            self._send(500, {'error': f"internal error: {type(e).__name__}: {e}"})
+            return
+        self._send(200, result, snapshot.version)
+
+    def _send(self, status: int, payload, version: int = None):
+        data = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        if version is not None:
+            self.send_header('X-Drive-Snapshot', str(version))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.verbose:
+            super().log_message(format, *args)
+
+
+def serve(repo_root, host: str, port: int, poll_interval: float = DEFAULT_POLL_INTERVAL, verbose: bool = False):
+    """Run the scoring service until interrupted"""
+    start = time.perf_counter()
+    service = ScoringService(repo_root, poll_interval)
+    service.start_watcher()
+
+    ScoringRequestHandler.verbose = verbose
+    server = ThreadingHTTPServer((host, port), ScoringRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    print(f"✅ Compiled scoring snapshot in {time.perf_counter() - start:.2f}s; "
+          f"serving on http://{host}:{server.server_address[1]} (watching every {poll_interval:g}s)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+        server.server_close()
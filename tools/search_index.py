@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+DRIVE Catalog Search Index
+Builds the prebuilt inverted index the catalog site uses for filtering
+
+Documents are the simplified web entries in index.json order, so a
+document number is a row in the card index. The output has:
+- tokens:   sorted vocabulary (lowercase words, IDs and their parts)
+- postings: delta-encoded document numbers per token, aligned with tokens
+- facets:   32-bit word bitmaps per platform/severity/level/pillar value
+
+The site answers a query by OR-ing postings for each query token's prefix
+range, AND-ing across tokens and selected facets, and reading set bits.
+"""
+import re
+from typing import Dict, List
+
+SEARCH_INDEX_VERSION = 1
+
+# Fields searched by the text box (MITRE techniques are in 'tags')
+TEXT_FIELDS = [
+    'check_id', 'title', 'short_description', 'description',
+    'nist_csf_id', 'cis_v8_control', 'cis_m365_benchmark', 'iso_27001_annex', 'tags'
+]
+
+# Facet name -> simplified entry field
+FACET_FIELDS = {
+    'platform': 'platform',
+    'severity': 'severity',
+    'level': 'drive_maturity_min',
+    'pillar': 'drive_pillar',
+}
+
+# Compound tokens keep IDs such as "ad-001", "pr.ac-7" or "t1078.001" whole
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[.\-][a-z0-9]+)*")
+PART_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase tokens plus the parts of compound IDs (kept in sync with main.js)"""
+    tokens = []
+    for token in TOKEN_PATTERN.findall(str(text).lower()):
+        tokens.append(token)
+        if '.' in token or '-' in token:
+            tokens.extend(PART_PATTERN.findall(token))
+    return tokens
+
+
+def _bitmap(doc_ids: List[int], doc_count: int) -> List[int]:
+    """Encode document numbers as a list of 32-bit words"""
+    words = [0] * ((doc_count + 31) // 32)
+    for doc_id in doc_ids:
+        words[doc_id >> 5] |= 1 << (doc_id & 31)
+    return words
+
+
+def build_search_index(aggregated: List[Dict]) -> Dict:
+    """Build the inverted index and facet bitmaps for simplified web entries"""
+    postings = {}
+    facets = {name: {} for name in FACET_FIELDS}
+
+    for doc_id, check in enumerate(aggregated):
+        seen = set()
+        for field in TEXT_FIELDS:
+            value = check.get(field)
+            if not value:
+                continue
+            for token in tokenize(value):
+                if token not in seen:
+                    seen.add(token)
+                    postings.setdefault(token, []).append(doc_id)
+
+        for name, field in FACET_FIELDS.items():
+            value = check.get(field)
+            if value is None or value == '':
+                continue
+            facets[name].setdefault(str(value), []).append(doc_id)
+
+    tokens = sorted(postings)
+    encoded = []
+    for token in tokens:
+        previous = 0
+        deltas = []
+        for doc_id in postings[token]:
+            deltas.append(doc_id - previous)
+            previous = doc_id
+        encoded.append(deltas)
+
+    doc_count = len(aggregated)
+    return {
+        'version': SEARCH_INDEX_VERSION,
+        'count': doc_count,
+        'tokens': tokens,
+        'postings': encoded,
+        'facets': {
+            name: {value: _bitmap(doc_ids, doc_count) for value, doc_ids in sorted(values.items())}
+            for name, values in facets.items()
+        },
+    }
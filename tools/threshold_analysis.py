@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+DRIVE Threshold Band Analysis
+Finds overlapping, gapped and non-monotonic bands across the catalog
+
+Every check's level_thresholds conditions ("≥15 and above for ...",
+"5 to 15 for ...") and every mapping risk's 1secure_thresholds bands are
+compiled with threshold_bands into intervals, each tagged with the level
+it blocks (the threshold's level, or maturity_blocks for the band's
+severity). All intervals are sorted once by (source, subject, lower
+bound) and a single sweep reports, per check or risk:
+
+    overlap         a value falls in two bands (ambiguous level)    error
+    non_monotonic   levels do not move one way as values increase   error
+    gap             a value between two bands falls in neither      warning
+    unparsed        a condition starts like a band but won't parse  warning
+
+so the pass is O(n log n) in the number of bands. A condition's leading
+band ("<1% of ...", "5 to 15 for ...", "2-3 Global Administrators") is
+compiled; count and percentage bands of one check are swept separately.
+Conditions that are not band expressions ("Any ESC1 ...", "Condition to
+be defined") are skipped. validate_checks runs it with the cross-file
+checks (as warnings unless --strict-thresholds).
+
+Usage:
+    python3 tools/threshold_analysis.py            # Report for checks/ and the mapping config
+    python3 tools/threshold_analysis.py --strict   # Exit non-zero on gaps too
+"""
+import math
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import yaml
+
+from threshold_bands import BAND_SEVERITIES, RISK_SECTIONS, Band, compile_band, normalize_measure_type
+
+MATURITY_MAPPING_FILE = Path('config') / '1secure_maturity_mapping.yaml'
+ERROR_KINDS = {'overlap', 'non_monotonic'}
+
+# A band expression leading a condition, then what it counts: "5 to 15 for High Risk
+# Permissions", "<1% of sensitive files shared", "≥3 and above ...", "2-3 Global Administrators"
+_NUMBER = r"-?\d+(?:\.\d+)?\s*%?"
+_CONDITION = re.compile(
+    rf"^(?P<band>(?:below\s+|[<>≤≥]=?\s*)?{_NUMBER}(?:\s*(?:to|-)\s*{_NUMBER})?(?:\s+and\s+above)?)"
+    rf"(?:\s+\S.*)?$", re.IGNORECASE | re.DOTALL)
+_HYPHEN_RANGE = re.compile(r"^(-?\d+(?:\.\d+)?)\s*%?\s*-\s*(-?\d+(?:\.\d+)?)\s*%?$")
+# Conditions starting like a band; anything else ("Any ESC1 ...") is not one
+_LOOKS_LIKE_BAND = re.compile(r"^(?:below\b|[<>≤≥]|-?\d)", re.IGNORECASE)
+
+
+class Interval(NamedTuple):
+    """A band of one check or risk, with the level it blocks"""
+    source: str
+    subject: str
+    label: str
+    level: Optional[int]
+    band: Band
+
+
+class ThresholdFinding(NamedTuple):
+    kind: str
+    subject: str
+    source: str
+    message: str
+
+    @property
+    def is_error(self) -> bool:
+        return self.kind in ERROR_KINDS
+
+
+def condition_band(condition, level) -> Optional[Band]:
+    """Compile a level_thresholds condition, or None when it is not a band expression
+
+    Raises ValueError for a condition that starts like a band but does not parse.
+    """
+    if not isinstance(condition, str):
+        return None
+    condition = condition.strip()
+    if condition.lower() in ('risk', 'no risk'):
+        return compile_band(condition, 'binary', f"L{level}")
+    if not _LOOKS_LIKE_BAND.match(condition):
+        return None
+    match = _CONDITION.match(condition)
+    if not match:
+        raise ValueError(f"Unrecognised band condition: {condition!r}")
+    text = match.group('band').strip()
+    kind = 'percentage' if '%' in text else 'numeric'
+    hyphen = _HYPHEN_RANGE.match(text)
+    if hyphen:
+        # "2-3 Global Administrators" counts both ends
+        return Band(f"L{level}", kind, float(hyphen.group(1)), float(hyphen.group(2)), True, True, text)
+    return compile_band(text, kind, f"L{level}")
+
+
+def check_intervals(entries: Iterable[Dict], findings: Optional[List[ThresholdFinding]] = None) -> List[Interval]:
+    """Intervals for every check's band conditions
+
+    Conditions that look like bands but do not parse are appended to
+    findings (as 'unparsed') when a list is given.
+    """
+    intervals = []
+    for entry in entries:
+        check = entry.get('check')
+        if not isinstance(check, dict) or not isinstance(check.get('level_thresholds'), list):
+            continue
+        source = Path(entry.get('path', '')).name
+        for threshold in check['level_thresholds']:
+            if not isinstance(threshold, dict):
+                continue
+            level = threshold.get('level')
+            try:
+                band = condition_band(threshold.get('threshold_condition'), level)
+            except ValueError as e:
+                if findings is not None:
+                    findings.append(ThresholdFinding('unparsed', str(check.get('check_id')), source,
+                                                     f"Level {level}: {e}"))
+                continue
+            if band is not None:
+                intervals.append(Interval(source, str(check.get('check_id')),
+                                          threshold.get('threshold_id') or f"Level {level}",
+                                          level if isinstance(level, int) else None, band))
+    return intervals
+
+
+def mapping_intervals(config: Dict, source: str = str(MATURITY_MAPPING_FILE)) -> List[Interval]:
+    """Intervals for every risk's 1secure_thresholds, tagged with maturity_blocks levels"""
+    intervals = []
+    for section in RISK_SECTIONS:
+        for risk in config.get(section) or []:
+            try:
+                kind = normalize_measure_type(risk.get('measure_type', 'Numeric'))
+            except ValueError:
+                continue
+            bands = risk.get('1secure_thresholds') or {}
+            blocks = risk.get('maturity_blocks') or {}
+            for severity in BAND_SEVERITIES:
+                try:
+                    band = compile_band(bands.get(severity.lower()), kind, severity)
+                except ValueError:
+                    band = None
+                if band is not None:
+                    level = blocks.get(severity.lower())
+                    intervals.append(Interval(source, str(risk.get('risk_id')), severity,
+                                              int(level) if level is not None else None, band))
+    return intervals
+
+
+def _overlaps(earlier: Band, later: Band) -> bool:
+    """later.lower >= earlier.lower; True when the two bands share a value"""
+    if later.lower < earlier.upper:
+        return True
+    return later.lower == earlier.upper and earlier.upper_inclusive and later.lower_inclusive
+
+
+def _gap(earlier: Band, later: Band) -> bool:
+    """True when some value lies strictly between the two bands
+
+    Numeric (count) bands only leave a gap if an integer falls in it.
+    """
+    if earlier.kind == 'binary' or later.kind == 'binary':
+        return False
+    if earlier.kind == 'numeric' and later.kind == 'numeric':
+        first = math.floor(earlier.upper) + 1 if earlier.upper_inclusive else math.ceil(earlier.upper)
+        last = math.ceil(later.lower) - 1 if later.lower_inclusive else math.floor(later.lower)
+        return first <= last
+    if later.lower > earlier.upper:
+        return True
+    return later.lower == earlier.upper and not earlier.upper_inclusive and not later.lower_inclusive
+
+
+def _describe(interval: Interval) -> str:
+    level = f"L{interval.level}" if interval.level is not None else "no level"
+    return f"{interval.label} '{interval.band.text}' ({level})"
+
+
+def analyze(intervals: List[Interval]) -> List[ThresholdFinding]:
+    """Sweep intervals sorted by (source, subject, kind, lower bound) and report conflicts
+
+    Count and percentage bands of one subject measure different things, so
+    each kind is swept on its own axis.
+    """
+    ordered = sorted(intervals, key=lambda i: (i.source, i.subject, i.band.kind, i.band.lower,
+                                               not i.band.lower_inclusive, i.band.upper))
+    findings = []
+    start = 0
+    while start < len(ordered):
+        end = start
+        group = (ordered[start].source, ordered[start].subject, ordered[start].band.kind)
+        while end < len(ordered) and (ordered[end].source, ordered[end].subject, ordered[end].band.kind) == group:
+            end += 1
+        findings.extend(_sweep_subject(ordered[start:end]))
+        start = end
+    return findings
+
+
+def _sweep_subject(intervals: List[Interval]) -> List[ThresholdFinding]:
+    subject, source = intervals[0].subject, intervals[0].source
+    findings = []
+    reach = intervals[0]  # Interval reaching furthest right so far
+    direction = 0
+    previous_level = intervals[0].level
+    for interval in intervals[1:]:
+        if _overlaps(reach.band, interval.band):
+            if reach.level != interval.level:
+                findings.append(ThresholdFinding('overlap', subject, source,
+                                                 f"{_describe(reach)} overlaps {_describe(interval)}"))
+        elif _gap(reach.band, interval.band):
+            findings.append(ThresholdFinding('gap', subject, source,
+                                             f"Values between {_describe(reach)} and {_describe(interval)} "
+                                             f"match no band"))
+        if interval.band.upper > reach.band.upper or (
+                interval.band.upper == reach.band.upper and interval.band.upper_inclusive):
+            reach = interval
+
+        if interval.level is not None and previous_level is not None and interval.level != previous_level:
+            step = 1 if interval.level > previous_level else -1
+            if direction and step != direction:
+                findings.append(ThresholdFinding('non_monotonic', subject, source,
+                                                 f"Levels change direction at {_describe(interval)}: "
+                                                 f"{', '.join(_describe(i) for i in intervals)}"))
+                break
+            direction = step
+        if interval.level is not None:
+            previous_level = interval.level
+    return findings
+
+
+def threshold_findings(entries: Iterable[Dict], config: Optional[Dict] = None) -> Tuple[List[str], List[str]]:
+    """(errors, warnings) message lists, as catalog_index.index_findings"""
+    unparsed: List[ThresholdFinding] = []
+    intervals = check_intervals(entries, unparsed)
+    if config:
+        intervals.extend(mapping_intervals(config))
+    errors, warnings = [], []
+    for finding in unparsed + analyze(intervals):
+        message = f"{finding.subject} ({finding.source}): {finding.kind.replace('_', '-')} bands: {finding.message}"
+        (errors if finding.is_error else warnings).append(message)
+    return errors, warnings
+
+
+def load_mapping_config(repo_root) -> Optional[Dict]:
+    path = Path(repo_root) / MATURITY_MAPPING_FILE
+    if not path.exists():
+        return None
+    with open(path, 'r') as f:
+        return yaml.safe_load(f) or {}
+
+
+def main():
+    import argparse
+
+    from catalog_cache import load_snapshot
+
+    parser = argparse.ArgumentParser(description='Report overlapping, gapped and non-monotonic threshold bands')
+    parser.add_argument('checks_dir', nargs='?', help='Checks directory (default: checks/)')
+    parser.add_argument('--strict', action='store_true', help='Exit non-zero on gaps too')
+    args = parser.parse_args()
+
+    checks_dir = Path(args.checks_dir or os.path.join(os.path.dirname(__file__), '..', 'checks'))
+    if not checks_dir.exists():
+        print(f"❌ Checks directory not found: {checks_dir}")
+        sys.exit(1)
+
+    entries = list(load_snapshot(checks_dir)['files'].values())
+    config = load_mapping_config(checks_dir.resolve().parent)
+    intervals = check_intervals(entries) + (mapping_intervals(config) if config else [])
+    errors, warnings = threshold_findings(entries, config)
+
+    print(f"\n📏 Analyzed {len(intervals)} bands across {len({i.subject for i in intervals})} checks and risks\n")
+    for error in errors:
+        print(f"   ERROR: {error}")
+    for warning in warnings:
+        print(f"   WARNING: {warning}")
+    print(f"\n{'✅' if not errors else '❌'} {len(errors)} errors, {len(warnings)} warnings")
+    sys.exit(1 if errors or (args.strict and warnings) else 0)
+
+
+if __name__ == "__main__":
+    main()
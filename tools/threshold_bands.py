@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+1Secure Threshold Band Compiler
+Turns free-text severity bands ("5 to 15", "15% and above", "Below 0.01",
+"No risk", "-") into typed interval predicates once, and classifies
+measured values by bisecting the compiled cut points.
+
+Band semantics:
+    "Below X"        [-inf, X)      ("<X" is accepted as a synonym)
+    "≤X"             [-inf, X]      (or "<=X")
+    "X to Y"         [X, Y)
+    "X and above"    [X, +inf)      ("≥X" and ">=X" are accepted as synonyms)
+    ">X"             (X, +inf)
+    "X"              [X, X]
+    "No risk"/"Risk" binary 0 / 1
+    "-" or empty     band not applicable
+
+Percentages are compared in percent units (5% -> 5.0).
+
+Usage:
+    python3 tools/threshold_bands.py    # Compile every band in the mapping config and CSV
+"""
+import csv
+import math
+import re
+import sys
+from bisect import bisect_right
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+import yaml
+
+BAND_SEVERITIES = ['Low', 'Medium', 'High']
+NOT_APPLICABLE = {'', '-'}
+RISK_SECTIONS = ['data_risks', 'identity_risks', 'infrastructure_risks']
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+MATURITY_MAPPING_FILE = REPO_ROOT / 'config' / '1secure_maturity_mapping.yaml'
+RISKS_CSV_FILE = REPO_ROOT / 'analysis' / '1secure_risks.csv'
+
+# Measure type spellings in the mapping config and in the risk catalog CSV
+MEASURE_TYPES = {
+    'binary': 'binary',
+    'numeric': 'numeric',
+    'num': 'numeric',
+    'percentage': 'percentage',
+    '%': 'percentage',
+}
+
+# Measured values spelled as words (binary risks), shared with result_ingest
+BINARY_VALUES = {'risk': 1.0, 'true': 1.0, 'yes': 1.0, 'no risk': 0.0, 'false': 0.0, 'no': 0.0}
+
+_NUMBER = r"(-?\d+(?:\.\d+)?)\s*%?"
+_BELOW = re.compile(rf"^(?:below\s+|<\s*){_NUMBER}$")
+_AT_MOST = re.compile(rf"^(?:≤|<=)\s*{_NUMBER}$")
+_RANGE = re.compile(rf"^{_NUMBER}\s+to\s+{_NUMBER}$")
+_ABOVE = re.compile(rf"^(?:(?:≥|>=)\s*{_NUMBER}(?:\s+and\s+above)?|{_NUMBER}\s+and\s+above)$")
+_MORE = re.compile(rf"^>\s*{_NUMBER}$")
+_EXACT = re.compile(rf"^{_NUMBER}$")
+
+
+class Band(NamedTuple):
+    """A compiled severity band: lower <= value < upper (bounds per flags)"""
+    severity: str
+    kind: str
+    lower: float
+    upper: float
+    lower_inclusive: bool
+    upper_inclusive: bool
+    text: str
+
+    def contains(self, value: float) -> bool:
+        if value < self.lower or (value == self.lower and not self.lower_inclusive):
+            return False
+        if value > self.upper or (value == self.upper and not self.upper_inclusive):
+            return False
+        return True
+
+
+def normalize_measure_type(measure_type: str) -> str:
+    """Map 'Percentage'/'%'/'Numeric'/'Num'/'Binary' to a band kind"""
+    try:
+        return MEASURE_TYPES[str(measure_type).strip().lower()]
+    except KeyError:
+        raise ValueError(f"Unknown 1Secure measure type: {measure_type!r}") from None
+
+
+def parse_measurement(text: str) -> float:
+    """Measured value text -> float ('12.5', '12.5%', 'Risk', 'no')"""
+    text = text.strip().lower()
+    if text in BINARY_VALUES:
+        return BINARY_VALUES[text]
+    number = text.rstrip('%').strip()
+    try:
+        value = float(number) if number else math.nan
+    except ValueError:
+        value = math.nan
+    if not math.isfinite(value):
+        raise ValueError(f"Not a measured value: {text!r}")
+    return value
+
+
+@lru_cache(maxsize=None)
+def compile_band(text: Optional[str], kind: str, severity: str) -> Optional[Band]:
+    """Compile one band string; None when the band does not apply"""
+    raw = '' if text is None else str(text).strip()
+    normalized = raw.lower()
+    if normalized in NOT_APPLICABLE:
+        return None
+
+    if kind == 'binary':
+        if normalized == 'no risk':
+            return Band(severity, kind, 0.0, 0.0, True, True, raw)
+        if normalized == 'risk':
+            return Band(severity, kind, 1.0, 1.0, True, True, raw)
+        raise ValueError(f"Unrecognised binary band: {raw!r}")
+
+    match = _BELOW.match(normalized)
+    if match:
+        return Band(severity, kind, -math.inf, float(match.group(1)), False, False, raw)
+
+    match = _AT_MOST.match(normalized)
+    if match:
+        return Band(severity, kind, -math.inf, float(match.group(1)), False, True, raw)
+
+    match = _MORE.match(normalized)
+    if match:
+        return Band(severity, kind, float(match.group(1)), math.inf, False, False, raw)
+
+    match = _RANGE.match(normalized)
+    if match:
+        lower, upper = float(match.group(1)), float(match.group(2))
+        return Band(severity, kind, lower, upper, True, False, raw)
+
+    match = _ABOVE.match(normalized)
+    if match:
+        lower = float(next(group for group in match.groups() if group is not None))
+        return Band(severity, kind, lower, math.inf, True, False, raw)
+
+    match = _EXACT.match(normalized)
+    if match:
+        value = float(match.group(1))
+        return Band(severity, kind, value, value, True, True, raw)
+
+    raise ValueError(f"Unrecognised 1Secure band: {raw!r}")
+
+
+class BandClassifier:
+    """Classifies a measured value to Low/Medium/High
+
+    Cut points between consecutive applicable bands are the upper band's
+    lower bound (or, for "Below X" upper bands, the lower band's upper
+    bound); a value equal to a cut belongs to the upper band. Values in a
+    gap between bands fall to the lower band.
+    """
+
+    def __init__(self, kind: str, bands: List[Band]):
+        self.kind = kind
+        self.bands = bands
+        self.severities = [band.severity for band in bands]
+        self.cuts = []
+        for below, above in zip(bands, bands[1:]):
+            cut = above.lower if math.isfinite(above.lower) else below.upper
+            if self.cuts and cut < self.cuts[-1]:
+                raise ValueError(f"Bands are not increasing: {[band.text for band in bands]}")
+            self.cuts.append(cut)
+
+    def classify(self, value) -> Optional[str]:
+        """Severity band for a measured value (None if no band applies)"""
+        if not self.bands or value is None:
+            return None
+        if isinstance(value, str):
+            value = parse_measurement(value)
+        return self.severities[bisect_right(self.cuts, float(value))]
+
+
+@lru_cache(maxsize=None)
+def compile_classifier(measure_type: str, low: Optional[str], medium: Optional[str],
+                       high: Optional[str]) -> BandClassifier:
+    """Compile a risk's three band strings (shared across risks with equal bands)"""
+    kind = normalize_measure_type(measure_type)
+    if kind == 'binary' and (high is None or str(high).strip() in NOT_APPLICABLE):
+        # The risk catalog CSV leaves the binary "Risk" band empty
+        high = 'Risk'
+    bands = [
+        band for band in (
+            compile_band(text, kind, severity)
+            for text, severity in zip((low, medium, high), BAND_SEVERITIES)
+        )
+        if band is not None
+    ]
+    return BandClassifier(kind, bands)
+
+
+def compile_config_classifiers(config: Dict) -> Dict[str, BandClassifier]:
+    """risk_id -> classifier for every risk in the maturity mapping config"""
+    classifiers = {}
+    for section in RISK_SECTIONS:
+        for risk in config.get(section) or []:
+            bands = risk.get('1secure_thresholds') or {}
+            classifiers[risk['risk_id']] = compile_classifier(
+                risk.get('measure_type', 'Numeric'), bands.get('low'), bands.get('medium'), bands.get('high')
+            )
+    return classifiers
+
+
+def compile_csv_classifiers(csv_path=RISKS_CSV_FILE) -> Dict[str, BandClassifier]:
+    """metric name -> classifier for every row of analysis/1secure_risks.csv"""
+    classifiers = {}
+    with open(csv_path, 'r', newline='') as f:
+        for row in csv.DictReader(f):
+            classifiers[row['Metric']] = compile_classifier(
+                row['Measure In'], row.get('Low'), row.get('Medium'), row.get('High')
+            )
+    return classifiers
+
+
+def main():
+    with open(MATURITY_MAPPING_FILE, 'r') as f:
+        config = yaml.safe_load(f) or {}
+
+    failed = 0
+    for label, loader in (('mapping config', lambda: compile_config_classifiers(config)),
+                          ('risk catalog CSV', compile_csv_classifiers)):
+        try:
+            classifiers = loader()
+        except ValueError as e:
+            print(f"❌ {label}: {e}")
+            failed += 1
+            continue
+        print(f"✅ {label}: compiled {len(classifiers)} risks "
+              f"({len({id(c) for c in classifiers.values()})} distinct band sets)")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
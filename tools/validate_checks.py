@@ -6,10 +6,18 @@ Validates YAML check definitions against schema requirements
 import yaml
 import sys
 import os
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, NamedTuple, Optional, Tuple
 from datetime import datetime
 
+from catalog_cache import load_snapshot, default_cache_dir
+from catalog_index import build_reference_index, index_findings, load_external_references
+from pipeline_trace import enable as enable_tracing, span
+from threshold_analysis import load_mapping_config, threshold_findings
+
 # Schema requirements
 REQUIRED_ROOT_FIELDS = [
     'check_id', 'title', 'short_description', 'detailed_description',
@@ -36,6 +44,22 @@ VALID_STATUSES = ['active', 'draft', 'deprecated', 'archived']
 VALID_POWERPOINT_PRIORITIES = ['1-PrimaryFocus', '2-SecondaryFocus', '3-AdditionalFinding', '4-Exclude']
 VALID_CHART_VISUALIZATIONS = ['trend', 'gauge', 'bar', 'heatmap', 'table', 'none']
 
+# Incremental validation cache (see --incremental)
+VALIDATION_CACHE_FILE = 'validation.json'
+VALIDATION_CACHE_FORMAT = 1
+# Modules whose rules affect results; editing any of them invalidates the cache
+VALIDATOR_SOURCES = [Path(__file__), Path(__file__).parent / 'catalog_index.py',
+                     Path(__file__).parent / 'threshold_analysis.py', Path(__file__).parent / 'threshold_bands.py']
+
+class ValidationResult(NamedTuple):
+    """Immutable outcome of validating one check file"""
+    path: str
+    passed: bool
+    errors: Tuple[str, ...]
+    warnings: Tuple[str, ...]
+    info: Tuple[str, ...]
+
+
 class CheckValidator:
     def __init__(self):
         self.errors = []
@@ -58,6 +82,14 @@ class CheckValidator:
             self.errors.append(f"File not found: {file_path}")
             return False
 
+        return self.validate_check(check)
+
+    def validate_check(self, check: Dict) -> bool:
+        """Validate an already-parsed check definition"""
+        self.errors = []
+        self.warnings = []
+        self.info = []
+
         # Validate structure
         self._validate_required_fields(check)
         self._validate_check_id(check)
@@ -306,53 +338,217 @@ class CheckValidator:
             except ValueError:
                 self.warnings.append(f"Invalid date format for next_review_due: {next_review}")
 
+    def result(self, file_path: str) -> ValidationResult:
+        """Freeze the current validation state into an immutable record"""
+        return ValidationResult(
+            path=file_path,
+            passed=len(self.errors) == 0,
+            errors=tuple(self.errors),
+            warnings=tuple(self.warnings),
+            info=tuple(self.info),
+        )
+
     def print_results(self, file_path: str):
         """Print validation results"""
-        if len(self.errors) == 0 and len(self.warnings) == 0:
-            print(f"✅ {file_path}: PASSED")
-            return True
+        return print_result(self.result(file_path))
+
+
+def print_result(result: ValidationResult) -> bool:
+    """Print a validation result record"""
+    file_path = result.path
+    if len(result.errors) == 0 and len(result.warnings) == 0:
+        print(f"✅ {file_path}: PASSED")
+        return True
+    else:
+        if len(result.errors) > 0:
+            print(f"❌ {file_path}: FAILED")
+            for error in result.errors:
+                print(f"   ERROR: {error}")
         else:
-            if len(self.errors) > 0:
-                print(f"❌ {file_path}: FAILED")
-                for error in self.errors:
-                    print(f"   ERROR: {error}")
-            else:
-                print(f"⚠️  {file_path}: PASSED with warnings")
+            print(f"⚠️  {file_path}: PASSED with warnings")
 
-            if len(self.warnings) > 0:
-                for warning in self.warnings:
-                    print(f"   WARNING: {warning}")
+        if len(result.warnings) > 0:
+            for warning in result.warnings:
+                print(f"   WARNING: {warning}")
 
-            return len(self.errors) == 0
+        return result.passed
 
 
-def validate_all_checks(checks_dir: str) -> tuple[int, int, int]:
-    """Validate all YAML files in checks directory"""
+def validate_entry(entry: Dict) -> ValidationResult:
+    """Validate one catalog snapshot entry (runs in worker processes)"""
+    if entry['error']:
+        return ValidationResult(entry['path'], False, (entry['error'],), (), ())
+    validator = CheckValidator()
+    validator.validate_check(entry['check'])
+    return validator.result(entry['path'])
+
+
+def validate_entries(entries: List[Dict], jobs: int = 1) -> List[ValidationResult]:
+    """Validate snapshot entries, in a process pool when jobs > 1
+
+    Results are returned in the same order as entries regardless of which
+    worker finished first.
+    """
+    with span('validate', files=len(entries), jobs=jobs):
+        if jobs <= 1 or len(entries) < 2:
+            results = []
+            for entry in entries:
+                with span('validate', 'file', file=Path(entry['path']).name):
+                    results.append(validate_entry(entry))
+            return results
+
+        chunksize = max(1, len(entries) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            return list(pool.map(validate_entry, entries, chunksize=chunksize))
+
+
+def cross_file_signature(entries: List[Dict], references: List[Dict], config: Optional[Dict] = None,
+                         strict_thresholds: bool = False) -> str:
+    """Hash of everything the cross-file checks look at (IDs, thresholds, bands, references)"""
+    signature = []
+    for entry in entries:
+        check = entry['check'] if isinstance(entry['check'], dict) else {}
+        thresholds = check.get('level_thresholds')
+        if not isinstance(thresholds, list):
+            thresholds = []
+        signature.append([
+            Path(entry['path']).name,
+            check.get('check_id'),
+            [[t.get('threshold_id'), t.get('level'), t.get('threshold_condition')]
+             for t in thresholds if isinstance(t, dict)],
+        ])
+    signature.append(references)
+    signature.append([config, strict_thresholds])
+    return hashlib.sha256(json.dumps(signature, default=str).encode('utf-8')).hexdigest()
+
+
+def validate_cross_file(entries: List[Dict], references: List[Dict], config: Optional[Dict] = None,
+                        strict_thresholds: bool = False) -> Tuple[List[str], List[str]]:
+    """Catalog-wide checks that no single file can detect on its own
+
+    Band findings (threshold_analysis) are warnings unless strict_thresholds,
+    which makes overlapping and non-monotonic bands errors.
+    """
+    index = build_reference_index(entries, references)
+    errors, warnings = index_findings(index)
+    band_errors, band_warnings = threshold_findings(entries, config)
+    if strict_thresholds:
+        errors.extend(band_errors)
+    else:
+        warnings.extend(band_errors)
+    warnings.extend(band_warnings)
+    return errors, warnings
+
+
+def _validator_fingerprint() -> str:
+    """Hash of the validation rules so cached results expire with them"""
+    digest = hashlib.sha256()
+    for source in VALIDATOR_SOURCES:
+        digest.update(Path(source).read_bytes())
+    return digest.hexdigest()
+
+
+def load_validation_cache(cache_path: Path) -> Dict:
+    """Load cached per-file results, or an empty cache if missing or stale"""
+    empty = {'format': VALIDATION_CACHE_FORMAT, 'validator': _validator_fingerprint(),
+             'files': {}, 'cross_file': None}
+    try:
+        with open(cache_path, 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return empty
+    if cache.get('format') != VALIDATION_CACHE_FORMAT or cache.get('validator') != empty['validator']:
+        return empty
+    return cache
+
+
+def save_validation_cache(cache_path: Path, cache: Dict):
+    """Write the validation cache atomically"""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, cache_path)
+
+
+def validate_all_checks(checks_dir: str, jobs: int = 1, incremental: bool = False,
+                        strict_thresholds: bool = False) -> tuple[int, int, int]:
+    """Validate all YAML files in checks directory
+
+    With incremental=True, per-file results are cached by content hash and
+    only files whose bytes changed are revalidated; the cross-file checks
+    rerun only when check or threshold IDs moved.
+    """
     checks_path = Path(checks_dir)
 
     if not checks_path.exists():
         print(f"❌ Checks directory not found: {checks_dir}")
         return 0, 0, 0
 
-    yaml_files = list(checks_path.glob("*.yaml")) + list(checks_path.glob("*.yml"))
+    snapshot = load_snapshot(checks_path, jobs=jobs)
+    yaml_files = list(snapshot['files'].values())
 
     if len(yaml_files) == 0:
         print(f"⚠️  No YAML files found in {checks_dir}")
         return 0, 0, 0
 
+    cache_path = default_cache_dir(checks_path) / VALIDATION_CACHE_FILE
+    cache = load_validation_cache(cache_path) if incremental else None
+
+    # Split into cached and changed files
+    results = {}
+    changed = []
+    for entry in yaml_files:
+        cached = cache['files'].get(Path(entry['path']).name) if cache else None
+        if cached and cached['sha256'] == entry['sha256']:
+            passed_flag, errors, warnings, info = cached['result']
+            results[entry['path']] = ValidationResult(entry['path'], passed_flag, tuple(errors),
+                                                      tuple(warnings), tuple(info))
+        else:
+            changed.append(entry)
+
+    for result in validate_entries(changed, jobs=jobs):
+        results[result.path] = result
+
+    references = load_external_references(checks_path.resolve().parent)
+    config = load_mapping_config(checks_path.resolve().parent)
+    signature = cross_file_signature(yaml_files, references, config, strict_thresholds)
+    cached_cross = cache['cross_file'] if cache else None
+    if cached_cross and cached_cross['signature'] == signature:
+        cross_errors, cross_warnings = cached_cross['errors'], cached_cross['warnings']
+    else:
+        with span('cross_file'):
+            cross_errors, cross_warnings = validate_cross_file(yaml_files, references, config, strict_thresholds)
+
+    if incremental:
+        print(f"\n♻️  Incremental: {len(changed)} changed, {len(yaml_files) - len(changed)} cached"
+              f"{'' if cached_cross and cached_cross['signature'] == signature else ', cross-file checks rerun'}")
+        cache['files'] = {
+            Path(entry['path']).name: {
+                'sha256': entry['sha256'],
+                'result': [results[entry['path']].passed, list(results[entry['path']].errors),
+                           list(results[entry['path']].warnings), list(results[entry['path']].info)],
+            }
+            for entry in yaml_files
+        }
+        cache['cross_file'] = {'signature': signature, 'errors': cross_errors, 'warnings': cross_warnings}
+        try:
+            save_validation_cache(cache_path, cache)
+        except OSError as e:
+            print(f"⚠️  Could not write validation cache {cache_path}: {e}")
+
     print(f"\n🔍 Validating {len(yaml_files)} check files...\n")
 
-    validator = CheckValidator()
     passed = 0
     failed = 0
     warnings_count = 0
 
-    for yaml_file in sorted(yaml_files):
-        result = validator.validate_check_file(str(yaml_file))
-        validator.print_results(str(yaml_file))
+    for entry in yaml_files:
+        result = results[entry['path']]
+        print_result(result)
 
-        if result:
-            if len(validator.warnings) > 0:
+        if result.passed:
+            if len(result.warnings) > 0:
                 warnings_count += 1
             else:
                 passed += 1
@@ -361,29 +557,72 @@ def validate_all_checks(checks_dir: str) -> tuple[int, int, int]:
 
         print()  # Blank line between checks
 
+    # Cross-file results
+    print_result(ValidationResult("Cross-file checks", len(cross_errors) == 0,
+                                  tuple(cross_errors), tuple(cross_warnings), ()))
+    print()
+
     # Summary
     print("=" * 70)
     print(f"📊 Validation Summary:")
     print(f"   ✅ Passed: {passed}")
     print(f"   ⚠️  Passed with warnings: {warnings_count}")
     print(f"   ❌ Failed: {failed}")
+    print(f"   🔗 Cross-file errors: {len(cross_errors)}")
     print(f"   📁 Total: {len(yaml_files)}")
     print("=" * 70)
 
-    return passed, warnings_count, failed
+    return passed, warnings_count, failed + len(cross_errors)
 
 
 def main():
-    if len(sys.argv) > 1:
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Validate DRIVE check YAML definitions')
+    parser.add_argument(
+        'target',
+        nargs='?',
+        help='Check file or directory to validate (default: checks/)'
+    )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        help='Parse and validate files in N worker processes (0 = one per CPU)'
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Reuse cached results for files whose content has not changed'
+    )
+    parser.add_argument(
+        '--strict-thresholds',
+        action='store_true',
+        help='Fail on overlapping or non-monotonic threshold bands (warnings by default)'
+    )
+    parser.add_argument(
+        '--trace',
+        metavar='FILE',
+        help='Write a Chrome trace of per-stage and per-file timings (plus a .summary.json)'
+    )
+    args = parser.parse_args()
+
+    if args.trace:
+        enable_tracing(args.trace)
+
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
+    if args.target:
         # Validate specific file or directory
-        target = sys.argv[1]
+        target = args.target
         if os.path.isfile(target):
             validator = CheckValidator()
             result = validator.validate_check_file(target)
             validator.print_results(target)
             sys.exit(0 if result else 1)
         elif os.path.isdir(target):
-            passed, warnings, failed = validate_all_checks(target)
+            passed, warnings, failed = validate_all_checks(target, jobs=jobs, incremental=args.incremental,
+                                                           strict_thresholds=args.strict_thresholds)
             sys.exit(0 if failed == 0 else 1)
         else:
             print(f"❌ Invalid path: {target}")
@@ -391,7 +630,8 @@ def main():
     else:
         # Default: validate checks directory
         checks_dir = os.path.join(os.path.dirname(__file__), '..', 'checks')
-        passed, warnings, failed = validate_all_checks(checks_dir)
+        passed, warnings, failed = validate_all_checks(checks_dir, jobs=jobs, incremental=args.incremental,
+                                                           strict_thresholds=args.strict_thresholds)
         sys.exit(0 if failed == 0 else 1)
 
 
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+DRIVE What-If Remediation Simulator
+Answers "which fixes get this tenant to Level N?" for one tenant's results
+
+A fix is a 1Secure risk_id or a check_id:
+- a risk_id clears that risk, and a catalog check with the same ID
+  (1S-* checks mirror the 1Secure risks)
+- a check_id clears that check; a 1Secure risk is also cleared once every
+  DRIVE check mapped to its metric in map_1secure_to_drive.MAPPINGS is fixed
+
+Clearing a column removes its blocked level (maturity_blocks for risks,
+lowest level_thresholds level for checks). The tenant's blocked levels and
+per-domain counters are computed once; each fix set only subtracts the
+cleared columns from the counters, and results are memoized by the set of
+blocking columns it clears, so hundreds of candidate sets stay interactive.
+"""
+from typing import Dict, FrozenSet, Iterable, List, Set
+
+from incremental_scoring import IncrementalScorer, levels_from_counts
+from maturity_engine import DOMAINS
+
+
+def build_fix_index(scorer) -> Dict:
+    """Fix ID -> columns it clears directly, plus risk columns cleared by check groups"""
+    from map_1secure_to_drive import MAPPINGS
+
+    direct = {}
+    for column, column_id in enumerate(scorer.ids):
+        direct.setdefault(column_id, []).append(column)
+
+    risk_by_name = {risk.get('name'): m for m, risk in enumerate(scorer.risk_model.risks)}
+    check_groups = []
+    for metric, check_ids in MAPPINGS.items():
+        m = risk_by_name.get(metric)
+        if m is not None and check_ids:
+            check_groups.append((frozenset(check_ids), m))
+            for check_id in check_ids:
+                direct.setdefault(check_id, [])
+
+    return {'direct': direct, 'check_groups': check_groups}
+
+
+def cleared_columns(fix_index: Dict, fixes: Iterable[str]) -> Set[int]:
+    """Every column a set of fix IDs clears, blocking or not"""
+    fixes = set(fixes)
+    direct = fix_index['direct']
+    columns = set()
+    for fix in fixes:
+        columns.update(direct.get(fix, ()))
+    for check_ids, m in fix_index['check_groups']:
+        if check_ids <= fixes:
+            columns.add(m)
+    return columns
+
+
+class WhatIfSimulator:
+    """Simulate fix sets against one tenant's current results"""
+
+    def __init__(self, scorer, record: Dict, fix_index: Dict = None, incremental: IncrementalScorer = None):
+        self.scorer = scorer
+        self.incremental = incremental or IncrementalScorer(scorer)
+        self.fix_index = fix_index or build_fix_index(scorer)
+        self.state = self.incremental.new_state(record)
+        self.baseline = self.state.levels()
+        self._cache = {}
+
+    def resolve(self, fixes: Iterable[str]) -> FrozenSet[int]:
+        """Columns cleared by a set of fix IDs (only those currently blocking)"""
+        columns = cleared_columns(self.fix_index, fixes)
+        return frozenset(column for column in columns if self.state.blocked[column])
+
+    def unknown(self, fixes: Iterable[str]) -> List[str]:
+        """Fix IDs that match no risk or check"""
+        return sorted(fix for fix in set(fixes) if fix not in self.fix_index['direct'])
+
+    def simulate(self, fixes: Iterable[str]) -> Dict[str, int]:
+        """Domain and overall levels after applying the fixes"""
+        columns = self.resolve(fixes)
+        levels = self._cache.get(columns)
+        if levels is None:
+            levels = self._cache[columns] = self._levels_without(columns)
+        return dict(levels)
+
+    def _levels_without(self, columns: FrozenSet[int]) -> Dict[str, int]:
+        if not columns:
+            return self.baseline
+        counts = {domain: list(self.state.counts[domain]) for domain in DOMAINS}
+        for column in columns:
+            level = self.state.blocked[column]
+            for domain in self.incremental.column_domains[column]:
+                counts[domain][level] -= 1
+        return levels_from_counts(counts)
+
+    def blockers(self, target_level: int) -> Dict[str, List[str]]:
+        """Per domain, IDs of the columns that must be cleared to reach target_level"""
+        result = {domain: [] for domain in DOMAINS}
+        for column, level in enumerate(self.state.blocked):
+            if level and level <= target_level:
+                for domain in self.incremental.column_domains[column]:
+                    column_id = self.scorer.ids[column]
+                    if column_id not in result[domain]:
+                        result[domain].append(column_id)
+        return result
+
+    def rank_single_fixes(self) -> List[Dict]:
+        """Every currently blocking ID with the levels reached by fixing it alone"""
+        candidates = sorted({self.scorer.ids[c] for c, level in enumerate(self.state.blocked) if level})
+        ranked = [{'fix': fix, **self.simulate([fix])} for fix in candidates]
+        ranked.sort(key=lambda r: (-r['overall_level'], -r['data_level'] - r['identity_level'], r['fix']))
+        return ranked